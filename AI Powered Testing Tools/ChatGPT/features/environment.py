@@ -0,0 +1,75 @@
+# features/environment.py
+"""Behave hooks for the login suite.
+
+Runtime options are passed as behave userdata (-D name=value):
+    worker_id          - Index of this parallel worker (default 0)
+    worker_count       - Number of parallel workers sharing the credential pool (default 1)
+    credential_pool    - JSON file of pre-provisioned accounts [{"username": ..., "password": ...}]
+    credential_lease   - Lease an account per scenario or per worker (scenario/worker)
+    lockout_reset_url  - Endpoint that clears lockouts of {"usernames": [...]} in bulk
+    backend            - How the login page is driven: http (default), playwright or selenium
+    browser            - Browser for the playwright/selenium backends
+    headless           - Run the browser without a visible UI (default true)
+    base_url           - Application under test (default http://localhost:3000)
+    mock_server        - Serve the application from the in-process mock (overrides base_url)
+"""
+
+from support.backends import create_backend
+from support.credential_pool import (
+    DEFAULT_ACCOUNTS, CredentialPool, end_scenario, generate_accounts, http_lockout_resetter, load_accounts,
+)
+from support.mock_server import start_mock_server
+
+
+def before_all(context):
+    userdata = context.config.userdata
+    context.worker_id = userdata.getint("worker_id", 0)
+    worker_count = userdata.getint("worker_count", 1)
+    pool_file = userdata.get("credential_pool")
+    reset_url = userdata.get("lockout_reset_url")
+    use_mock = userdata.getbool("mock_server", False)
+
+    # The mock provisions a generated pool, so every worker gets accounts of its own
+    if pool_file:
+        accounts = load_accounts(pool_file)
+    elif use_mock:
+        accounts = list(DEFAULT_ACCOUNTS) + generate_accounts(4 * worker_count)
+    else:
+        accounts = DEFAULT_ACCOUNTS
+
+    context.mock_server = start_mock_server(userdata, accounts) if use_mock else None
+    context.base_url = context.mock_server.url if use_mock else userdata.get("base_url", "http://localhost:3000")
+    if context.mock_server:
+        resetter = context.mock_server.unlock
+    else:
+        resetter = http_lockout_resetter(reset_url) if reset_url else None
+    context.credential_pool = CredentialPool(
+        accounts,
+        worker_id=context.worker_id,
+        worker_count=worker_count,
+        mode=userdata.get("credential_lease", "scenario"),
+        resetter=resetter,
+    )
+    context.login_backend = create_backend(
+        userdata.get("backend", "http"),
+        browser=userdata.get("browser"),
+        headless=userdata.getbool("headless", True),
+    )
+
+
+def before_scenario(context, scenario):
+    # Fresh cookies and page state; the browser itself is reused
+    context.login_backend.reset()
+
+
+def after_scenario(context, scenario):
+    # Leased accounts are parked until the next bulk lockout reset
+    end_scenario(context)
+
+
+def after_all(context):
+    context.credential_pool.release_all()
+    context.credential_pool.reset_lockouts()
+    context.login_backend.close()
+    if context.mock_server:
+        context.mock_server.stop()
@@ -0,0 +1,569 @@
+"""Pluggable drivers behind the LoginPage page object.
+
+LoginPage (steps/login_steps.py) only talks to a LoginBackend, which offers
+a handful of primitives - open a URL, fill a named element, submit the form,
+read the state of a named element, move the focus - implemented three ways:
+
+    http        - no browser at all: urllib fetches the page, html.parser
+                  builds a light DOM, and the form is submitted the way a
+                  browser would (hidden fields, cookies, redirects). Element
+                  state is derived from the markup (hidden attributes, inline
+                  styles, disabled, DOM tab order). Logic-only scenarios run
+                  orders of magnitude faster than in a browser.
+    playwright  - Playwright (sync API); imported only when selected
+    selenium    - Selenium WebDriver (Chrome, Firefox or Edge); imported only
+                  when selected
+
+Named elements are located with LOGIN_SELECTORS, which stick to plain CSS
+(type, #id, .class and [attribute] selectors, comma-separated alternatives)
+so that all three backends resolve them identically.
+"""
+
+import http.cookiejar
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+
+LOGIN_SELECTORS = {
+    "form": "form#login-form, form",
+    "username": "input#username, input[name='username']",
+    "password": "input#password, input[name='password'], input[type='password']",
+    "login_button": "button#login-btn, button[type='submit'], input[type='submit']",
+    "error": ".error-message, .error, .alert-danger, [role='alert']",
+    "user_menu": "#user-menu, .user-profile, [data-testid='user-menu']",
+    "username_label": "label[for='username']",
+    "password_label": "label[for='password']",
+}
+
+# State of the first element matching a selector, for the browser backends
+ELEMENT_STATE_SCRIPT = """
+(selector) => {
+    const el = document.querySelector(selector);
+    if (!el) return null;
+    const style = getComputedStyle(el);
+    const box = el.getBoundingClientRect();
+    return {
+        tag: el.tagName.toLowerCase(),
+        attributes: Object.fromEntries(Array.from(el.attributes, (a) => [a.name, a.value])),
+        text: (el.innerText || el.textContent || "").trim(),
+        value: "value" in el ? String(el.value) : null,
+        visible: box.width > 0 && box.height > 0 && style.visibility !== "hidden" && style.display !== "none",
+        enabled: !el.disabled,
+        focused: el === document.activeElement,
+    };
+}
+"""
+
+# True when the page is wider than the viewport (horizontal scrolling)
+OVERFLOW_SCRIPT = "() => document.documentElement.scrollWidth > window.innerWidth + 1"
+
+
+@dataclass
+class ElementState:
+    """Everything LoginPage asks about one element, read in one go."""
+
+    tag: str
+    attributes: Dict[str, str]
+    text: str
+    value: Optional[str]
+    visible: bool
+    enabled: bool
+    focused: bool
+
+
+class LoginBackend(ABC):
+    """Driver primitives LoginPage is built on."""
+
+    name = "unknown"
+
+    def __init__(self):
+        self.status = 0  # HTTP status of the current document, 0 when the driver cannot tell
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Start a clean session (cookies, storage, focus) for the next scenario."""
+
+    @abstractmethod
+    def open(self, url: str) -> None:
+        """Load a URL."""
+
+    @property
+    @abstractmethod
+    def url(self) -> str:
+        """URL of the current document."""
+
+    @abstractmethod
+    def fill(self, element: str, value: str) -> None:
+        """Replace the value of a named input."""
+
+    @abstractmethod
+    def submit(self) -> None:
+        """Click the Login button and wait for the resulting document (if any)."""
+
+    @abstractmethod
+    def state(self, element: str) -> Optional[ElementState]:
+        """State of a named element, or None if it is not on the page."""
+
+    @abstractmethod
+    def state_of(self, selector: str) -> Optional[ElementState]:
+        """State of the first element matching a CSS selector."""
+
+    @abstractmethod
+    def focus(self, element: str) -> None:
+        """Give a named element the keyboard focus."""
+
+    @abstractmethod
+    def press_tab(self) -> None:
+        """Move the focus to the next element in tab order."""
+
+    @abstractmethod
+    def page_text(self) -> str:
+        """Visible text of the whole document."""
+
+    @abstractmethod
+    def overflows(self) -> bool:
+        """True if the page does not fit the viewport horizontally."""
+
+    def close(self) -> None:
+        """Release the driver."""
+
+
+# ---------------------------
+# HTTP + html.parser backend
+# ---------------------------
+
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+TEXTLESS_ELEMENTS = {"script", "style", "template", "head", "title"}
+COMPOUND_SELECTOR = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:#[\w-]+|\.[\w-]+|\[[\w-]+(?:=(?:'[^']*'|\"[^\"]*\"|[\w-]+))?\])*)$")
+SELECTOR_PART = re.compile(r"#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)|\[(?P<attr>[\w-]+)(?:=(?P<value>'[^']*'|\"[^\"]*\"|[\w-]+))?\]")
+INLINE_HIDDEN = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+
+
+@dataclass
+class HtmlElement:
+    """One element of a parsed document."""
+
+    tag: str
+    attributes: Dict[str, str]
+    parent: Optional["HtmlElement"]
+    text_parts: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return " ".join("".join(self.text_parts).split())
+
+    @property
+    def hidden(self) -> bool:
+        node = self
+        while node is not None:
+            if "hidden" in node.attributes or INLINE_HIDDEN.search(node.attributes.get("style", "")):
+                return True
+            node = node.parent
+        return self.tag == "input" and self.attributes.get("type", "").lower() == "hidden"
+
+    @property
+    def disabled(self) -> bool:
+        return "disabled" in self.attributes
+
+
+class HtmlDocument(HTMLParser):
+    """Light DOM: elements in document order with attributes and text."""
+
+    def __init__(self, markup: str):
+        super().__init__(convert_charrefs=True)
+        self.elements: List[HtmlElement] = []
+        self._open: List[HtmlElement] = []
+        self.feed(markup)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        element = HtmlElement(tag, {name: value if value is not None else "" for name, value in attrs},
+                              self._open[-1] if self._open else None)
+        self.elements.append(element)
+        if tag not in VOID_ELEMENTS:
+            self._open.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self._open.pop()
+
+    def handle_endtag(self, tag):
+        # Close up to the matching element; tolerates unclosed children such as <p> or <li>
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index].tag == tag:
+                del self._open[index:]
+                return
+
+    def handle_data(self, data):
+        if any(element.tag in TEXTLESS_ELEMENTS for element in self._open):
+            return
+        for element in self._open:
+            element.text_parts.append(data)
+
+    def select(self, selector: str) -> Optional[HtmlElement]:
+        """First element in document order matching any comma-separated alternative."""
+        alternatives = [_parse_compound(part.strip()) for part in selector.split(",")]
+        for element in self.elements:
+            if any(_matches(element, compound) for compound in alternatives):
+                return element
+        return None
+
+
+def _parse_compound(selector: str) -> Tuple[Optional[str], List[Tuple[str, str, Optional[str]]]]:
+    match = COMPOUND_SELECTOR.match(selector)
+    if not match:
+        raise ValueError(f"Selector '{selector}' is not supported by the http backend "
+                         "(use type, #id, .class and [attribute] selectors without combinators)")
+    parts = []
+    for part in SELECTOR_PART.finditer(match.group("rest")):
+        if part.group("id"):
+            parts.append(("id", part.group("id"), None))
+        elif part.group("cls"):
+            parts.append(("class", part.group("cls"), None))
+        else:
+            value = part.group("value")
+            parts.append(("attr", part.group("attr"), value.strip("'\"") if value is not None else None))
+    tag = match.group("tag")
+    return (None if tag in (None, "*") else tag.lower()), parts
+
+
+def _matches(element: HtmlElement, compound) -> bool:
+    tag, parts = compound
+    if tag and element.tag != tag:
+        return False
+    for kind, name, value in parts:
+        if kind == "id" and element.attributes.get("id") != name:
+            return False
+        if kind == "class" and name not in element.attributes.get("class", "").split():
+            return False
+        if kind == "attr" and (name not in element.attributes
+                               or (value is not None and element.attributes[name] != value)):
+            return False
+    return True
+
+
+class HttpBackend(LoginBackend):
+    """Browserless backend: submits the form over HTTP and reads the returned markup."""
+
+    name = "http"
+
+    def __init__(self, timeout: float = 10.0, user_agent: str = "login-suite-http-backend"):
+        super().__init__()
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.document = HtmlDocument("")
+        self._url = ""
+        self._focused: Optional[HtmlElement] = None
+        self._opener: Optional[urllib.request.OpenerDirector] = None
+        self.reset()
+
+    def reset(self) -> None:
+        # Redirects are followed like a browser does: 301/302/303 after a POST continue as GET
+        self._opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        self.document = HtmlDocument("")
+        self._url = ""
+        self._focused = None
+        self.status = 0
+
+    def _load(self, request: urllib.request.Request) -> None:
+        request.add_header("User-Agent", self.user_agent)
+        request.add_header("Accept", "text/html")
+        try:
+            with self._opener.open(request, timeout=self.timeout) as response:
+                self.status, self._url, body = response.status, response.url, response.read()
+                charset = response.headers.get_content_charset() or "utf-8"
+        except urllib.error.HTTPError as error:
+            # Error statuses still come with a page (e.g. the login form with a message)
+            self.status, self._url, body = error.code, error.url, error.read()
+            charset = error.headers.get_content_charset() or "utf-8"
+        self.document = HtmlDocument(body.decode(charset, errors="replace"))
+        self._focused = None
+
+    def open(self, url: str) -> None:
+        self._load(urllib.request.Request(url))
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    def _element(self, element: str) -> HtmlElement:
+        found = self.document.select(LOGIN_SELECTORS[element])
+        if found is None:
+            raise LookupError(f"No {element} element on {self._url or 'the page'}")
+        return found
+
+    def fill(self, element: str, value: str) -> None:
+        self._element(element).attributes["value"] = value
+
+    def submit(self) -> None:
+        button = self._element("login_button")
+        form = button.parent
+        while form is not None and form.tag != "form":
+            form = form.parent
+        if form is None:
+            form = self._element("form")
+        fields = []
+        for element in self.document.elements:
+            if not _inside(element, form) or element.disabled or not element.attributes.get("name"):
+                continue
+            kind = element.attributes.get("type", "text").lower()
+            if element.tag == "input" and kind not in ("submit", "button", "reset", "image"):
+                if kind in ("checkbox", "radio") and "checked" not in element.attributes:
+                    continue
+                fields.append((element.attributes["name"], element.attributes.get("value", "on" if kind in (
+                    "checkbox", "radio") else "")))
+            elif element.tag == "textarea":
+                fields.append((element.attributes["name"], element.attributes.get("value", element.text)))
+            elif element.tag == "select":
+                fields.append((element.attributes["name"], _selected_option(self.document, element)))
+        if button.attributes.get("name"):
+            fields.append((button.attributes["name"], button.attributes.get("value", "")))
+        action = urllib.parse.urljoin(self._url, form.attributes.get("action") or self._url)
+        data = urllib.parse.urlencode(fields)
+        if form.attributes.get("method", "get").lower() == "post":
+            request = urllib.request.Request(action, data=data.encode(), method="POST",
+                                             headers={"Content-Type": "application/x-www-form-urlencoded"})
+        else:
+            request = urllib.request.Request(f"{action.split('?')[0]}?{data}")
+        self._load(request)
+
+    def state(self, element: str) -> Optional[ElementState]:
+        return self.state_of(LOGIN_SELECTORS[element])
+
+    def state_of(self, selector: str) -> Optional[ElementState]:
+        found = self.document.select(selector)
+        if found is None:
+            return None
+        value = found.attributes.get("value") if found.tag in ("input", "textarea", "button") else None
+        return ElementState(tag=found.tag, attributes=dict(found.attributes), text=found.text, value=value,
+                            visible=not found.hidden, enabled=not found.disabled, focused=found is self._focused)
+
+    def focus(self, element: str) -> None:
+        self._focused = self._element(element)
+
+    def press_tab(self) -> None:
+        # Sequential navigation order: positive tabindex ascending, then document order
+        tabbable = [element for element in self.document.elements if _tabbable(element)]
+        order = sorted((element for element in tabbable if _tabindex(element) > 0), key=_tabindex)
+        order += [element for element in tabbable if _tabindex(element) == 0]
+        if not order:
+            return
+        position = order.index(self._focused) if self._focused in order else -1
+        self._focused = order[(position + 1) % len(order)]
+
+    def page_text(self) -> str:
+        body = next((element for element in self.document.elements if element.tag == "body"), None)
+        return body.text if body else ""
+
+    def overflows(self) -> bool:
+        return False  # Nothing is rendered; structural checks only
+
+
+def _inside(element: HtmlElement, ancestor: HtmlElement) -> bool:
+    node = element.parent
+    while node is not None:
+        if node is ancestor:
+            return True
+        node = node.parent
+    return False
+
+
+def _selected_option(document: HtmlDocument, select: HtmlElement) -> str:
+    options = [element for element in document.elements if element.tag == "option" and element.parent is select]
+    chosen = next((option for option in options if "selected" in option.attributes), options[0] if options else None)
+    if chosen is None:
+        return ""
+    return chosen.attributes.get("value", chosen.text)
+
+
+def _tabindex(element: HtmlElement) -> int:
+    try:
+        return int(element.attributes.get("tabindex", "0"))
+    except ValueError:
+        return 0
+
+
+def _tabbable(element: HtmlElement) -> bool:
+    if element.hidden or element.disabled or _tabindex(element) < 0:
+        return False
+    if element.tag in ("button", "select", "textarea", "input"):
+        return True
+    return (element.tag == "a" and "href" in element.attributes) or "tabindex" in element.attributes
+
+
+# ---------------------------
+# Browser backends
+# ---------------------------
+
+class PlaywrightBackend(LoginBackend):
+    """Playwright (sync API) backend; one browser per run, one context per scenario."""
+
+    def __init__(self, browser: str = "chromium", headless: bool = True, timeout_ms: int = 5000):
+        super().__init__()
+        from playwright.sync_api import sync_playwright
+        self.name = f"playwright-{browser}"
+        self.timeout_ms = timeout_ms
+        self._playwright = sync_playwright().start()
+        self._browser = getattr(self._playwright, browser).launch(headless=headless)
+        self._context = None
+        self.page = None
+        self.reset()
+
+    def reset(self) -> None:
+        if self._context is not None:
+            self._context.close()
+        self._context = self._browser.new_context()
+        self.page = self._context.new_page()
+        self.page.set_default_timeout(self.timeout_ms)
+        self.status = 0
+
+    def open(self, url: str) -> None:
+        response = self.page.goto(url)
+        self.status = response.status if response else 0
+
+    @property
+    def url(self) -> str:
+        return self.page.url
+
+    def fill(self, element: str, value: str) -> None:
+        self.page.locator(LOGIN_SELECTORS[element]).first.fill(value)
+
+    def submit(self) -> None:
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        try:
+            with self.page.expect_navigation(timeout=self.timeout_ms) as navigation:
+                self.page.locator(LOGIN_SELECTORS["login_button"]).first.click()
+            response = navigation.value
+            self.status = response.status if response else 0
+        except PlaywrightTimeoutError:
+            pass  # Rejected client-side: no new document
+
+    def state(self, element: str) -> Optional[ElementState]:
+        return self.state_of(LOGIN_SELECTORS[element])
+
+    def state_of(self, selector: str) -> Optional[ElementState]:
+        found = self.page.evaluate(ELEMENT_STATE_SCRIPT, selector)
+        return ElementState(**found) if found else None
+
+    def focus(self, element: str) -> None:
+        self.page.locator(LOGIN_SELECTORS[element]).first.focus()
+
+    def press_tab(self) -> None:
+        self.page.keyboard.press("Tab")
+
+    def page_text(self) -> str:
+        return self.page.inner_text("body")
+
+    def overflows(self) -> bool:
+        return self.page.evaluate(OVERFLOW_SCRIPT)
+
+    def close(self) -> None:
+        self._browser.close()
+        self._playwright.stop()
+
+
+class SeleniumBackend(LoginBackend):
+    """Selenium WebDriver backend; cookies and storage are cleared between scenarios."""
+
+    def __init__(self, browser: str = "chrome", headless: bool = True, timeout: float = 5.0):
+        super().__init__()
+        from selenium import webdriver
+        self.name = f"selenium-{browser}"
+        self.timeout = timeout
+        options = {"chrome": webdriver.ChromeOptions, "firefox": webdriver.FirefoxOptions,
+                   "edge": webdriver.EdgeOptions}[browser]()
+        if headless:
+            options.add_argument("--headless")
+        self.driver = {"chrome": webdriver.Chrome, "firefox": webdriver.Firefox, "edge": webdriver.Edge}[browser](
+            options=options)
+
+    def reset(self) -> None:
+        self.driver.delete_all_cookies()
+        if self.driver.current_url.startswith("http"):
+            self.driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        self.status = 0  # WebDriver does not expose response statuses
+
+    def open(self, url: str) -> None:
+        self.driver.get(url)
+
+    @property
+    def url(self) -> str:
+        return self.driver.current_url
+
+    def _find(self, element: str):
+        from selenium.webdriver.common.by import By
+        return self.driver.find_element(By.CSS_SELECTOR, LOGIN_SELECTORS[element])
+
+    def fill(self, element: str, value: str) -> None:
+        field_element = self._find(element)
+        field_element.clear()
+        field_element.send_keys(value)
+
+    def submit(self) -> None:
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support import expected_conditions
+        from selenium.webdriver.support.ui import WebDriverWait
+        button = self._find("login_button")
+        button.click()
+        try:
+            WebDriverWait(self.driver, self.timeout).until(expected_conditions.staleness_of(button))
+        except TimeoutException:
+            pass  # Rejected client-side: no new document
+
+    def state(self, element: str) -> Optional[ElementState]:
+        return self.state_of(LOGIN_SELECTORS[element])
+
+    def state_of(self, selector: str) -> Optional[ElementState]:
+        found = self.driver.execute_script(f"return ({ELEMENT_STATE_SCRIPT})(arguments[0]);", selector)
+        return ElementState(**found) if found else None
+
+    def focus(self, element: str) -> None:
+        self.driver.execute_script("arguments[0].focus();", self._find(element))
+
+    def press_tab(self) -> None:
+        from selenium.webdriver.common.keys import Keys
+        self.driver.switch_to.active_element.send_keys(Keys.TAB)
+
+    def page_text(self) -> str:
+        return self.driver.execute_script("return document.body ? document.body.innerText : '';")
+
+    def overflows(self) -> bool:
+        return self.driver.execute_script(f"return ({OVERFLOW_SCRIPT})();")
+
+    def close(self) -> None:
+        self.driver.quit()
+
+
+BACKENDS = ("http", "playwright", "selenium")
+
+
+def create_backend(name: str, browser: Optional[str] = None, headless: bool = True) -> LoginBackend:
+    """Create the backend selected with -D backend=<name>.
+
+    Args:
+        name: One of BACKENDS
+        browser: Browser for the browser backends (default chromium for
+            Playwright, chrome for Selenium); ignored by the http backend
+        headless: Run browsers without a visible UI
+
+    Returns:
+        Ready backend; call close() when done
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name == "http":
+        return HttpBackend()
+    if name == "playwright":
+        return PlaywrightBackend(browser or "chromium", headless=headless)
+    if name == "selenium":
+        return SeleniumBackend(browser or "chrome", headless=headless)
+    raise ValueError(f"Unknown backend '{name}'. Supported: {', '.join(BACKENDS)}")
@@ -0,0 +1,293 @@
+# features/support/credential_pool.py
+"""
+Worker-partitioned credential pool.
+
+Steps ask for credentials by token ('valid_user', 'valid_password', ...).
+Tokens naming the scenario's own account resolve to an account leased from a
+pre-provisioned pool; every other token maps to fixed test data.
+
+Parallel workers lease from disjoint slices of the pool (account i belongs to
+worker i % worker_count), so failed attempts and lockouts in one worker never
+reach another worker's accounts. Within a worker an account is leased either
+per scenario or once for the whole worker. Returned accounts are parked until
+their lockout state is reset, which happens in one bulk call whenever the
+free accounts run out and once more at teardown.
+"""
+
+import json
+import logging
+import urllib.request
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+
+# Test data that does not belong to a pooled account
+STATIC_CREDENTIALS = {
+    "unknown_user": "unknown.user@example.com",
+    "any_password": "somePassword123",
+    "sql_injection_text": "' OR '1'='1",
+    "script_tag_text": "<script>alert('x')</script>",
+    "minimal_length_user": "u1",        # adjust in real project
+    "minimal_length_pass": "p1",        # adjust in real project
+    "overlong_username": "u" * 300,
+    "overlong_password": "p" * 300,
+}
+
+# Tokens answered from the leased account
+LEASED_TOKENS = ("valid_user", "valid_password", "password_with_typo")
+
+LEASE_MODES = ("scenario", "worker")
+
+
+@dataclass(frozen=True)
+class Credential:
+    """A pre-provisioned account."""
+
+    username: str
+    password: str
+
+
+# Pool used when neither a pool file nor the mock server provides accounts
+DEFAULT_ACCOUNTS = (Credential("valid.user@example.com", "CorrectHorseBatteryStaple123!"),)
+
+
+@dataclass
+class Lease:
+    """An account handed to one scenario (or one worker)."""
+
+    credential: Credential
+    owner: str
+    tainted: bool = False
+
+    def resolve(self, token: str) -> Optional[str]:
+        """
+        Resolve a token naming this lease's account.
+
+        Args:
+            token: Credential token
+
+        Returns:
+            Value for the token, or None if the token is not account-specific
+        """
+        if token == "valid_user":
+            return self.credential.username
+        if token == "valid_password":
+            return self.credential.password
+        if token == "password_with_typo":
+            return self.credential.password[:-1]
+        return None
+
+
+def generate_accounts(count: int, prefix: str = "pool.user") -> List[Credential]:
+    """
+    Deterministic account list for a pool the harness provisions itself (the mock server).
+
+    Args:
+        count: Number of accounts
+        prefix: Local part prefix of the generated usernames
+
+    Returns:
+        Accounts pool.user.000@example.com, pool.user.001@example.com, ...
+    """
+    return [Credential(f"{prefix}.{index:03d}@example.com", f"PoolPass-{index:03d}!") for index in range(count)]
+
+
+def load_accounts(path: str) -> List[Credential]:
+    """
+    Read a pool file: a JSON list of {"username": ..., "password": ...} objects.
+
+    Args:
+        path: Pool file path
+
+    Returns:
+        Accounts in file order
+    """
+    with open(path) as pool_file:
+        return [Credential(entry["username"], entry["password"]) for entry in json.load(pool_file)]
+
+
+def http_lockout_resetter(url: str, timeout: float = 10.0) -> Callable[[Sequence[str]], None]:
+    """
+    Resetter that POSTs {"usernames": [...]} to a test-support endpoint of the application.
+
+    Args:
+        url: Absolute URL of the reset endpoint
+        timeout: Request timeout in seconds
+
+    Returns:
+        Callable taking the usernames to reset
+    """
+    def reset(usernames: Sequence[str]) -> None:
+        request = urllib.request.Request(
+            url,
+            data=json.dumps({"usernames": list(usernames)}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+    return reset
+
+
+class CredentialPool:
+    """
+    Leases accounts from this worker's slice of the pool.
+    """
+
+    def __init__(self, accounts: Sequence[Credential], worker_id: int = 0, worker_count: int = 1,
+                 mode: str = "scenario", resetter: Optional[Callable[[Sequence[str]], None]] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            accounts: Every account of the pool, identical in all workers
+            worker_id: Index of this worker
+            worker_count: Number of workers sharing the pool
+            mode: 'scenario' to lease per scenario, 'worker' to keep one lease for the whole run
+            resetter: Clears failed attempts and lockouts of the given usernames in bulk;
+                without one, returned accounts are reused as they are
+        """
+        if mode not in LEASE_MODES:
+            raise ValueError(f"Unknown credential lease mode '{mode}'. Supported: {', '.join(LEASE_MODES)}")
+        accounts = list(accounts)
+        partition = accounts[worker_id::max(1, worker_count)]
+        if not partition:
+            logger.warning("Credential pool of %d account(s) has none for worker %d of %d; sharing the whole pool",
+                           len(accounts), worker_id, worker_count)
+            partition = accounts
+        self.mode = mode
+        self.resetter = resetter
+        self.free: Deque[Credential] = deque(partition)
+        self.parked: List[Credential] = []
+        self.leases: Dict[str, Lease] = {}
+        self.worker_lease: Optional[Lease] = None
+        self.leased = 0
+        self.resets = 0
+
+    def lease(self, owner: str) -> Lease:
+        """
+        Lease an account, resetting parked accounts first if none is free.
+
+        Args:
+            owner: Description of the holder, e.g. the scenario name
+
+        Returns:
+            The new lease
+
+        Raises:
+            RuntimeError: If every account of this worker is leased
+        """
+        if not self.free:
+            self.reset_lockouts()
+        if not self.free:
+            raise RuntimeError(f"Credential pool exhausted: {len(self.leases)} account(s) leased")
+        credential = self.free.popleft()
+        lease = Lease(credential, owner)
+        self.leases[credential.username] = lease
+        self.leased += 1
+        return lease
+
+    def release(self, lease: Lease) -> None:
+        """
+        Return a leased account; it is parked until the next bulk reset.
+
+        Args:
+            lease: Lease returned by lease()
+        """
+        if self.leases.pop(lease.credential.username, None) is None:
+            return
+        if self.resetter:
+            self.parked.append(lease.credential)
+        else:
+            self.free.append(lease.credential)
+
+    def release_all(self) -> None:
+        """Return every outstanding lease."""
+        for lease in list(self.leases.values()):
+            self.release(lease)
+        self.worker_lease = None
+
+    def reset_lockouts(self) -> None:
+        """Clear lockout state of all parked accounts in one call and make them free again."""
+        if not self.parked:
+            return
+        usernames = [credential.username for credential in self.parked]
+        try:
+            self.resetter(usernames)
+        except Exception as error:
+            logger.warning("Lockout reset of %d account(s) failed: %s", len(usernames), error)
+            return
+        self.free.extend(self.parked)
+        self.parked = []
+        self.resets += 1
+
+
+def lease_for(context) -> Optional[Lease]:
+    """
+    The lease of the running scenario, taken on first use.
+
+    Args:
+        context: Behave context with a credential_pool (None disables leasing)
+
+    Returns:
+        Current lease, or None without a pool
+    """
+    pool = getattr(context, "credential_pool", None)
+    if pool is None:
+        return None
+    lease = getattr(context, "credential_lease", None)
+    if lease is None:
+        if pool.mode == "worker":
+            # Scenario-level context attributes are dropped after each scenario; the pool keeps the worker's lease
+            if pool.worker_lease is None:
+                pool.worker_lease = pool.lease(f"worker {context.worker_id}")
+            lease = pool.worker_lease
+        else:
+            lease = pool.lease(context.scenario.name)
+        context.credential_lease = lease
+    return lease
+
+
+def resolve_token(context, token: str) -> str:
+    """
+    Resolve a credential token for the running scenario.
+
+    Args:
+        context: Behave context object
+        token: Token from a step; unknown tokens are returned unchanged
+
+    Returns:
+        Resolved credential value
+    """
+    core = token.strip()
+    if core != token and core in LEASED_TOKENS:
+        # Padded tokens (" valid_user") keep their padding around the resolved value
+        return token.replace(core, resolve_token(context, core), 1)
+    if token in LEASED_TOKENS:
+        lease = lease_for(context)
+        if lease is not None:
+            return lease.resolve(token)
+        return Lease(DEFAULT_ACCOUNTS[0], "").resolve(token)
+    return STATIC_CREDENTIALS.get(token, token)
+
+
+def end_scenario(context) -> None:
+    """
+    Hand the scenario's lease back: always in 'scenario' mode, and in 'worker'
+    mode when the scenario tainted the account (e.g. by locking it out).
+
+    Args:
+        context: Behave context object
+    """
+    pool = getattr(context, "credential_pool", None)
+    lease = getattr(context, "credential_lease", None)
+    if pool is None or lease is None:
+        return
+    if pool.mode == "scenario" or lease.tainted:
+        pool.release(lease)
+        if lease is pool.worker_lease:
+            pool.worker_lease = None
@@ -0,0 +1,31 @@
+"""In-process mock login application.
+
+Starts Facilitators/Mock Login/mock_login.py on a free local port so the suite
+runs without a deployed application (-D mock_server=true).
+"""
+
+import os
+import sys
+from typing import Iterable
+
+MOCK_LOGIN_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, os.pardir, os.pardir, "Facilitators", "Mock Login"
+))
+
+
+def start_mock_server(userdata, accounts: Iterable = ()):
+    """Start the mock login server on a background thread; call stop() when done.
+
+    Args:
+        userdata: behave userdata (mock_port is honoured, 0 picks a free port)
+        accounts: Extra credentials (username/password) to provision, e.g. the credential pool
+    """
+    if MOCK_LOGIN_DIR not in sys.path:
+        sys.path.insert(0, MOCK_LOGIN_DIR)
+    from mock_login import Account, build_server
+
+    server = build_server(
+        port=userdata.getint("mock_port", 0),
+        extra_accounts=[Account(account.username, account.password) for account in accounts],
+    )
+    return server.start_in_thread()
@@ -1,28 +1,158 @@
 # features/environment.py
+import os
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from support.clock import VirtualClock
+from support.diagnostics import FailureDiagnostics, enable_browser_logs
+from support.diagnostics_store import DiagnosticsStore
+from support.fingerprints import FingerprintIndex
+from support.flakes import FlakeHistory, RetryTracker
+from support.healing import HealingFinder
+from support.mock_server import start_mock_server
+from support.result_cache import ResultCache, harness_fingerprint, scenario_key, step_registry_of
+from support.step_index import StepIndex
+from support.waits import WaitEngine
 
 def before_all(context):
     """Setup the WebDriver instance before all tests."""
+    # Indexed step matching; overlapping step patterns are reported up front
+    context.step_index = StepIndex.for_context(context).build().install()
+    for overlap in context.step_index.overlaps:
+        print(f"[STEP OVERLAP] {overlap}")
+    if context.config.userdata.getbool("fail_on_step_overlap"):
+        assert not context.step_index.overlaps, f"{len(context.step_index.overlaps)} overlapping step patterns"
+
     chrome_options = Options()
     # Uncomment the line below if you want to run headlessly (without a visible browser UI)
     # chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
+    # Console and network logs are buffered in memory and only written for failed scenarios
+    diagnostics = context.config.userdata.getbool("diagnostics", True)
+    if diagnostics:
+        enable_browser_logs(chrome_options)
 
     # Assuming ChromeDriver is in your PATH or specified here
     context.browser = webdriver.Chrome(options=chrome_options)
-    context.browser.implicitly_wait(10) # Wait up to 10 seconds for elements to appear
-    context.base_url = "http://your-app-domain.com/login" # IMPORTANT: Change this
+    # No implicit wait: lookups go through the explicit wait engine so negative checks fail fast
+    context.browser.implicitly_wait(0)
+    context.waits = WaitEngine(context.browser, timeout=context.config.userdata.getfloat("wait_timeout", 10))
+    userdata = context.config.userdata
+    # -D self_healing=true fingerprints found elements and heals locators that stop matching; -D heal_threshold sets
+    # the similarity needed and -D heal_grace (seconds, default 0.3) how long a locator may miss before it is
+    # healed; -D heal_strict=true (CI) waits the full timeout and fails the lookup instead of using the healed element
+    context.healer = None
+    if userdata.getbool("self_healing", False):
+        index = FingerprintIndex(userdata.get("fingerprint_index", os.path.join(".behave_cache", "locator_fingerprints.json")))
+        context.healer = HealingFinder(context.waits, index, threshold=userdata.getfloat("heal_threshold", 0.75),
+                                       strict=userdata.getbool("heal_strict", False),
+                                       grace=userdata.getfloat("heal_grace", 0.3))
+    context.base_url = userdata.get("base_url", "http://your-app-domain.com/login") # IMPORTANT: Change this
+    clock_control_url = userdata.get("clock_control_url")
+    # -D mock_server=true serves the login app in-process (see support/mock_server.py)
+    context.mock_server = None
+    if userdata.getbool("mock_server", False):
+        context.mock_server = start_mock_server(userdata)
+        context.base_url = f"{context.mock_server.url}/login"
+        clock_control_url = clock_control_url or f"{context.mock_server.url}/__test__/clock/advance"
+    # Fake browser time for @virtual_clock scenarios; the control URL also moves the auth server's session clock
+    context.clock = VirtualClock(context.browser, control_url=clock_control_url)
+    # -D diagnostics_dir / diagnostics_max_mb / diagnostics_buffer tune the failure archives
+    context.diagnostics = None
+    if diagnostics:
+        store = DiagnosticsStore(userdata.get("diagnostics_dir", os.path.join("reports", "diagnostics")),
+                                 max_bytes=userdata.getint("diagnostics_max_mb", 200) * 1024 * 1024)
+        context.diagnostics = FailureDiagnostics(context.browser, store,
+                                                 buffer_size=userdata.getint("diagnostics_buffer", 200))
+    # -D retries=N retries failed scenarios in-process; -D lane=main|quarantine splits off chronically flaky ones
+    # (-D flake_history=<json> and -D flake_threshold=0.2 decide which)
+    context.retry_tracker = RetryTracker(
+        FlakeHistory(userdata.get("flake_history", os.path.join(".behave_cache", "flake_history.json")),
+                     threshold=userdata.getfloat("flake_threshold", 0.2)),
+        max_attempts=userdata.getint("retries", 1) + 1,
+        lane=userdata.get("lane", "all"),
+    )
+    # -D result_cache=true skips scenarios that already passed against the same steps, code and
+    # -D build_fingerprint=<app build>
+    context.result_cache = None
+    if userdata.getbool("result_cache", False):
+        context.result_cache = ResultCache(max_entries=userdata.getint("result_cache_size", 5000))
+        context.harness_fingerprint = harness_fingerprint()
+        # A pass against one application (or the mock) says nothing about another
+        context.result_cache_settings = {name: userdata.get(name, "") for name in ("base_url", "mock_server")}
 
 def after_all(context):
     """Quit the WebDriver instance after all tests."""
     context.browser.quit()
+    context.step_index.save()
+    tracker = context.retry_tracker
+    tracker.history.save()
+    if tracker.retried or tracker.history.quarantined():
+        print(f"\n--- Retries: {tracker.retried} retry attempt(s), {len(tracker.flaky)} scenario(s) passed only on a "
+              f"retry, {len(tracker.history.quarantined())} scenario(s) quarantined ---")
+    if context.healer:
+        context.healer.index.save()
+        if context.healer.healed:
+            context.healer.write_report(context.config.userdata.get("healing_report", os.path.join("reports", "healed_locators.json")))
+            print(f"\n--- Self-healing: {len(context.healer.healed)} locator(s) healed, review the report ---")
+    if context.result_cache:
+        context.result_cache.save()
+        print(f"\n--- Result cache: {context.result_cache.hits} scenario(s) skipped as cached passes ---")
+    if context.mock_server:
+        context.mock_server.stop()
+    if context.diagnostics and context.diagnostics.store.written:
+        store = context.diagnostics.store
+        print(f"\n--- Failure diagnostics: {store.written} archive(s) in {store.directory}, "
+              f"{store.evicted} old archive(s) evicted ---")
+    print("\n--- Slowest steps by explicit wait time ---")
+    for stats in context.waits.slowest_steps():
+        print(f"{stats.wait_seconds:7.2f}s  {stats.waits:4d} waits  {stats.step}")
+
+def before_step(context, step):
+    """Attribute wait time to the step that is about to run."""
+    context.waits.start_step(f"{step.keyword} {step.name}")
+
+def after_step(context, step):
+    """Close the step's wait-time record."""
+    context.waits.end_step()
+
+def before_feature(context, feature):
+    """Retry failed scenarios (and Outline rows) of the feature in-process."""
+    context.retry_tracker.patch(feature.walk_scenarios())
 
 def before_scenario(context, scenario):
     """Set up scenario data or state if needed."""
+    if context.healer:
+        context.healer.scenario = scenario.name
+    lane_skip = context.retry_tracker.skip_reason(scenario)
+    if lane_skip:
+        scenario.skip(reason=lane_skip)
+        return
+    if context.result_cache:
+        context.result_cache_key = scenario_key(scenario, context.config.userdata.get("build_fingerprint", ""),
+                                                context.harness_fingerprint, step_registry_of(context),
+                                                context.result_cache_settings)
+        if context.result_cache.lookup(context.result_cache_key):
+            scenario.skip(reason="passed in a previous run, result cached")
+            return
     context.current_user = None # Placeholder for logged-in user state
+    if "virtual_clock" in scenario.effective_tags:
+        context.clock.install()
+    if context.mock_server:
+        context.mock_server.reset() # Fresh lockouts and sessions for every scenario
+    if context.diagnostics:
+        context.diagnostics.begin()
 
 def after_scenario(context, scenario):
     """Clear cookies or reset state after each scenario."""
+    if getattr(context, "result_cache_key", None):
+        context.result_cache.record(context.result_cache_key, scenario)
+    context.retry_tracker.on_scenario_finished(scenario)
+    # Screenshot, page source, network and console logs of failed scenarios only
+    if context.diagnostics and scenario.status != "skipped":
+        archive = context.diagnostics.finish(scenario)
+        if archive:
+            print(f"[DIAGNOSTICS] {scenario.name}: {archive}")
+    context.clock.uninstall() # Only @virtual_clock scenarios (or steps that advanced it) run on fake time
     context.browser.delete_all_cookies()
\ No newline at end of file
@@ -6,7 +6,7 @@ Feature: User Login Functionality
   I want to be able to log in to the application
   So that I can access my personalized content.
 
----
+# ---
 
 ## Functional Scenarios
 
@@ -19,7 +19,7 @@ Scenario: Successful Login with Valid Credentials
   Then I should be redirected to the dashboard or home page
   And I should see a welcome message (e.g., "Welcome, [Username]!")
 
----
+# ---
 
 Scenario Outline: Failed Login with Invalid/Empty Credentials
 
@@ -38,10 +38,12 @@ Scenario Outline: Failed Login with Invalid/Empty Credentials
     | InvalidUser | ValidPassword | Invalid username or password. |
     | ValidUser | InvalidPassword | Invalid username or password. |
     | InvalidUser | InvalidPassword | Invalid username or password. |
-    | ValidUser | ValidPassword | Your account is locked. | # Locked account
-    | InactiveUser | ValidPassword | Your account is inactive. | # Inactive user
+    # Locked account
+    | ValidUser | ValidPassword | Your account is locked. |
+    # Inactive user
+    | InactiveUser | ValidPassword | Your account is inactive. |
 
----
+# ---
 
 Scenario Outline: Boundary and Constraint Testing for Input Fields
 
@@ -59,7 +61,7 @@ Scenario Outline: Boundary and Constraint Testing for Input Fields
     | password | Less than Min Length (e.g., 5 chars) | Password must be at least 8 characters long. |
     | password | More than Max Length (e.g., 129 chars) | Password cannot exceed 128 characters. |
 
----
+# ---
 
 Scenario Outline: Case Sensitivity
 
@@ -74,7 +76,7 @@ Scenario Outline: Case Sensitivity
     | Incorrect Case | Correct Case | remain on the login page and see an error. |
     | Correct Case | Incorrect Case | remain on the login page and see an error. |
 
----
+# ---
 
 Scenario: Password Visibility (Show/Hide)
 
@@ -86,7 +88,7 @@ Scenario: Password Visibility (Show/Hide)
   When I click the Hide toggle again
   Then the password field input type should change from "text" to "password" (text is masked)
 
----
+# ---
 
 Scenario: Focus and Navigation
 
@@ -97,8 +99,9 @@ Scenario: Focus and Navigation
   And I press the Enter key
   Then the login attempt should be processed
 
----
+# ---
 
+@virtual_clock
 Scenario: Session Management (Logout/Timeout)
 
   Given I have successfully logged in
@@ -109,7 +112,7 @@ Scenario: Session Management (Logout/Timeout)
   When I remain inactive for the configured session timeout duration (e.g., 30 minutes)
   Then I should be automatically logged out and redirected to the login page.
 
----
+# ---
 
 ## Non-Functional Scenarios
 
@@ -119,7 +122,7 @@ Scenario: Localization/Internationalization
   When I change the language selection from English to Spanish
   Then all UI elements (field labels, button text, error messages) should be displayed in Spanish.
 
----
+# ---
 
 Scenario: Performance - Load Time
 
@@ -127,7 +130,7 @@ Scenario: Performance - Load Time
   When the page starts to load
   Then the page should be fully rendered within 2 seconds (under a normal load).
 
----
+# ---
 
 Scenario: Performance - Concurrent Users
 
@@ -136,7 +139,7 @@ Scenario: Performance - Concurrent Users
   Then the system response time for a successful login should not exceed 3 seconds
   And the system should not return any HTTP 5xx errors.
 
----
+# ---
 
 Scenario: Security - XSS and SQL Injection
 
@@ -150,7 +153,7 @@ Scenario: Security - XSS and SQL Injection
   And I click "Login"
   Then the application should encode the input and not execute the script.
 
----
+# ---
 
 Scenario: Responsiveness and Accessibility
 
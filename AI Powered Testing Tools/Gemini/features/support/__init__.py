@@ -0,0 +1 @@
+"""Support modules shared by environment.py and the login step definitions."""
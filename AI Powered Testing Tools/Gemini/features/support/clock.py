@@ -0,0 +1,133 @@
+# features/support/clock.py
+"""Virtual clock for time-dependent scenarios.
+
+Session timeout, token expiry and remember-me checks depend on wall-clock
+time. Instead of sleeping, VirtualClock shifts the browser's Date and timers
+forward and tells the auth stand-in to move its session clock by the same
+amount, so a 30-minute timeout is exercised in milliseconds.
+
+The clock replaces page globals, so it is only installed for scenarios tagged
+@virtual_clock (or once a step advances it) and removed after the scenario.
+"""
+
+import json
+import urllib.request
+from dataclasses import dataclass
+from typing import Optional
+
+# Installed before any page script runs. Date and performance.now() report
+# real time plus an offset; timers still fire normally in real time, and when
+# the offset jumps every timer that has become due fires at once.
+CLOCK_SCRIPT = """
+(() => {
+    if (window.__virtualClock) { window.__virtualClock.set(%(offset)d); return; }
+    const RealDate = Date;
+    const realNow = RealDate.now.bind(RealDate);
+    const realSetTimeout = window.setTimeout.bind(window);
+    const realClearTimeout = window.clearTimeout.bind(window);
+    let offset = %(offset)d;
+    let nextId = 1;
+    const timers = new Map();
+
+    // A function, not a class: Date() without new must still return a string
+    function VirtualDate(...args) {
+        if (!new.target) return new RealDate(realNow() + offset).toString();
+        return args.length ? new RealDate(...args) : new RealDate(realNow() + offset);
+    }
+    VirtualDate.prototype = RealDate.prototype;
+    VirtualDate.now = () => realNow() + offset;
+    VirtualDate.parse = RealDate.parse;
+    VirtualDate.UTC = RealDate.UTC;
+    window.Date = VirtualDate;
+    const realPerfNow = performance.now.bind(performance);
+    performance.now = () => realPerfNow() + offset;
+
+    const schedule = (id) => {
+        const timer = timers.get(id);
+        realClearTimeout(timer.handle);
+        timer.handle = realSetTimeout(() => fire(id), Math.max(0, timer.due - VirtualDate.now()));
+    };
+    const fire = (id) => {
+        const timer = timers.get(id);
+        if (!timer) return;
+        if (timer.interval === null) { realClearTimeout(timer.handle); timers.delete(id); }
+        else { timer.due = VirtualDate.now() + Math.max(1, timer.interval); schedule(id); }
+        timer.callback(...timer.args);
+    };
+    const add = (callback, delay, args, repeat) => {
+        if (typeof callback !== "function") callback = new Function(String(callback));
+        const id = nextId++;
+        delay = Math.max(0, Number(delay) || 0);
+        timers.set(id, { callback, args, due: VirtualDate.now() + delay, interval: repeat ? delay : null });
+        schedule(id);
+        return id;
+    };
+    const clear = (id) => {
+        const timer = timers.get(id);
+        if (timer) { realClearTimeout(timer.handle); timers.delete(id); }
+    };
+    window.setTimeout = (callback, delay, ...args) => add(callback, delay, args, false);
+    window.setInterval = (callback, delay, ...args) => add(callback, delay, args, true);
+    window.clearTimeout = clear;
+    window.clearInterval = clear;
+
+    window.__virtualClock = {
+        offset: () => offset,
+        set(value) {
+            offset = value;
+            const due = [...timers.entries()].filter(([, timer]) => timer.due <= VirtualDate.now());
+            due.sort((a, b) => a[1].due - b[1].due).forEach(([id]) => fire(id));
+            timers.forEach((timer, id) => schedule(id));
+        },
+    };
+})();
+"""
+
+
+@dataclass
+class VirtualClock:
+    """Shared fake time for the browser and the auth stand-in."""
+    driver: object
+    control_url: Optional[str] = None
+    offset_ms: int = 0
+
+    def __post_init__(self):
+        self._script_id = None
+        self.installed = False
+
+    def install(self):
+        """Inject the clock into every new document (Chromium) or the current one."""
+        script = CLOCK_SCRIPT % {"offset": self.offset_ms}
+        self._remove_script()
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            result = self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+            self._script_id = result["identifier"]
+        # Also patch the page that is already loaded; the script is idempotent
+        self.driver.execute_script(script)
+        self.installed = True
+
+    def uninstall(self):
+        """Stop patching new documents and put the current page back on real time."""
+        if not self.installed:
+            return
+        self._remove_script()
+        self.offset_ms = 0
+        self.driver.execute_script("if (window.__virtualClock) window.__virtualClock.set(0);")
+        self.installed = False
+
+    def _remove_script(self):
+        if self._script_id:
+            self.driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._script_id})
+            self._script_id = None
+
+    def advance(self, seconds):
+        """Move browser and server time forward, firing any timers that became due."""
+        milliseconds = int(seconds * 1000)
+        self.offset_ms += milliseconds
+        if self.control_url:
+            request = urllib.request.Request(
+                self.control_url, data=json.dumps({"ms": milliseconds}).encode(),
+                headers={"Content-Type": "application/json"}, method="POST")
+            with urllib.request.urlopen(request, timeout=5) as response:
+                assert response.status < 400, f"Clock control endpoint returned {response.status}"
+        self.install()
@@ -0,0 +1,131 @@
+# features/support/diagnostics.py
+"""Failure-only diagnostics for the Selenium suite.
+
+Chrome is started with browser and performance logging, so chromedriver keeps
+the page's console output and DevTools network events. At the end of every
+scenario both logs are drained into bounded in-memory ring buffers. A passing
+scenario's buffers are simply cleared; a failed scenario gets a screenshot,
+the page source, the network log (as HAR) and the console log packed into one
+compressed archive in the DiagnosticsStore (support/diagnostics_store.py),
+which is capped by size and evicts its oldest archives first.
+"""
+
+import json
+import re
+import time
+from collections import deque
+
+from selenium.common.exceptions import WebDriverException
+from support.flakes import FAILED_STATUSES
+
+# DevTools events that make up the network log; everything else is dropped on drain
+NETWORK_EVENTS = ("Network.requestWillBeSent", "Network.responseReceived", "Network.loadingFailed")
+
+
+def enable_browser_logs(chrome_options):
+    """Ask chromedriver to keep console messages and DevTools network events."""
+    chrome_options.set_capability("goog:loggingPrefs", {"browser": "ALL", "performance": "ALL"})
+
+
+def to_har(events):
+    """HAR 1.2 log (no bodies) from DevTools Network.* events, oldest first."""
+    requests = {}
+    entries = []
+    for event in events:
+        params = event["params"]
+        if event["method"] == "Network.requestWillBeSent":
+            requests[params["requestId"]] = params
+            continue
+        sent = requests.get(params["requestId"], {})
+        request = sent.get("request", {})
+        response = params.get("response", {})
+        started = sent.get("wallTime", time.time())
+        wait_ms = max(response.get("timing", {}).get("receiveHeadersEnd", 0), 0)
+        entries.append({
+            "startedDateTime": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(started))
+                               + f".{int(started * 1000) % 1000:03d}Z",
+            "time": wait_ms,
+            "request": {"method": request.get("method", "GET"), "url": request.get("url", response.get("url", "")),
+                        "httpVersion": response.get("protocol", "HTTP/1.1"),
+                        "headers": [{"name": k, "value": v} for k, v in request.get("headers", {}).items()],
+                        "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1},
+            "response": {"status": response.get("status", 0), "statusText": response.get("statusText", ""),
+                         "httpVersion": response.get("protocol", "HTTP/1.1"),
+                         "headers": [{"name": k, "value": v} for k, v in response.get("headers", {}).items()],
+                         "cookies": [], "content": {"size": -1, "mimeType": response.get("mimeType", "")},
+                         "redirectURL": "", "headersSize": -1, "bodySize": -1},
+            "cache": {},
+            "timings": {"send": 0, "wait": wait_ms, "receive": 0},
+            "_resourceType": params.get("type", ""),
+            "_failure": params.get("errorText", ""),
+        })
+    return {"log": {"version": "1.2", "creator": {"name": "login-suite diagnostics", "version": "1.0"},
+                    "entries": entries}}
+
+
+class FailureDiagnostics:
+    """Keeps the latest console and network activity in memory; writes it out for failed scenarios."""
+
+    def __init__(self, driver, store, buffer_size=200):
+        self.driver = driver
+        self.store = store
+        self.console = deque(maxlen=buffer_size)
+        self.network = deque(maxlen=buffer_size * 3)  # Up to three events per request
+        self.logs_available = True
+
+    def _drain(self):
+        """Move everything chromedriver buffered since the last drain into the ring buffers."""
+        if not self.logs_available:
+            return
+        try:
+            for entry in self.driver.get_log("browser"):
+                stamp = time.strftime("%H:%M:%S", time.localtime(entry["timestamp"] / 1000))
+                self.console.append(f"{stamp} [{entry['level']}] {entry['message']}")
+            for entry in self.driver.get_log("performance"):
+                if any(name in entry["message"] for name in NETWORK_EVENTS):
+                    event = json.loads(entry["message"])["message"]
+                    if event["method"] in NETWORK_EVENTS:
+                        self.network.append(event)
+        except (WebDriverException, AttributeError) as error:
+            # Browser or driver without log support: screenshots and page source only
+            print(f"[DIAGNOSTICS] Browser logs unavailable: {error}")
+            self.logs_available = False
+
+    def begin(self):
+        """Start a scenario with empty buffers (drops whatever happened in between)."""
+        self._drain()
+        self.console.clear()
+        self.network.clear()
+
+    def finish(self, scenario):
+        """End a scenario; returns the archive path if it failed, else None."""
+        self._drain()
+        try:
+            if scenario.status not in FAILED_STATUSES:
+                return None
+            return self._persist(scenario)
+        except (WebDriverException, OSError) as error:
+            print(f"[DIAGNOSTICS] Failure diagnostics for '{scenario.name}' incomplete: {error}")
+            return None
+        finally:
+            self.console.clear()
+            self.network.clear()
+
+    def _persist(self, scenario):
+        failed_step = next((step for step in scenario.steps if step.status in FAILED_STATUSES), None)
+        artifacts = {
+            "screenshot.png": self.driver.get_screenshot_as_png(),
+            "page.html": self.driver.page_source.encode(),
+            "scenario.json": json.dumps({
+                "name": scenario.name,
+                "location": str(scenario.location),
+                "status": getattr(scenario.status, "name", str(scenario.status)),
+                "failed_step": f"{failed_step.keyword} {failed_step.name}" if failed_step else None,
+                "error": getattr(failed_step, "error_message", None) if failed_step else None,
+                "url": self.driver.current_url,
+            }, indent=2).encode(),
+            "network.har": json.dumps(to_har(list(self.network)), indent=1).encode(),
+            "console.log": "\n".join(self.console).encode(),
+        }
+        slug = re.sub(r"[^\w.-]+", "_", scenario.name).strip("_")[:80]
+        return self.store.save(f"{time.strftime('%Y%m%d-%H%M%S')}-{self.store.written:04d}-{slug}", artifacts)
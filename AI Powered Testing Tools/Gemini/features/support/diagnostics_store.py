@@ -0,0 +1,83 @@
+"""
+Size-capped directory of compressed failure archives.
+
+The failure diagnostics of either suite hand each failed scenario's
+artifacts (screenshot, page or trace, network and console logs) to a
+DiagnosticsStore, which writes them as one zip archive and deletes the
+oldest archives once the directory exceeds its size cap.
+
+This module is kept identical in the GitHub Copilot and Gemini suites;
+change both copies together.
+"""
+
+import os
+import tempfile
+import zipfile
+from typing import Dict, List
+
+
+# Artifacts that are compressed already are stored in the archive as they are
+PRECOMPRESSED_SUFFIXES = (".zip", ".png")
+
+
+class DiagnosticsStore:
+    """
+    Directory of compressed failure archives, capped by total size.
+    """
+
+    def __init__(self, directory: str = os.path.join("reports", "diagnostics"), max_bytes: int = 200 * 1024 * 1024):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Where archives are written (may be shared by parallel runs)
+            max_bytes: Total archive size above which the oldest archives are deleted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.written = 0
+        self.evicted = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, name: str, artifacts: Dict[str, bytes]) -> str:
+        """
+        Write artifacts as one archive, then enforce the size cap.
+
+        Args:
+            name: Archive name without extension
+            artifacts: File name inside the archive -> content
+
+        Returns:
+            Path of the archive
+        """
+        path = os.path.join(self.directory, f"{name}.zip")
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file, zipfile.ZipFile(tmp_file, "w") as archive:
+            for member, content in artifacts.items():
+                compression = zipfile.ZIP_STORED if member.endswith(PRECOMPRESSED_SUFFIXES) else zipfile.ZIP_DEFLATED
+                archive.writestr(member, content, compress_type=compression)
+        os.replace(tmp_path, path)
+        self.written += 1
+        self._evict(keep=path)
+        return path
+
+    def archives(self) -> List[str]:
+        """Archive paths, oldest first."""
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".zip")]
+        return sorted(paths, key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0)
+
+    def _evict(self, keep: str) -> None:
+        archives = self.archives()
+        sizes = {path: os.path.getsize(path) for path in archives if os.path.exists(path)}
+        total = sum(sizes.values())
+        for path in archives:
+            if total <= self.max_bytes:
+                return
+            if path == keep:
+                continue  # The newest failure is kept even if it alone exceeds the cap
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Removed concurrently by another run sharing the directory
+            total -= sizes.get(path, 0)
+            self.evicted += 1
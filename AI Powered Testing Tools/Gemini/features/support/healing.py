@@ -0,0 +1,119 @@
+# features/support/healing.py
+"""Self-healing element lookups.
+
+Every successful lookup of a LOGIN_LOCATORS key records a compact fingerprint
+of the element (see support/fingerprints.py) in an index that persists between
+runs. When the key's locator still matches nothing after a short grace period
+(a few hundred milliseconds, for elements that are still rendering), the page
+is scanned once for the element most similar to the fingerprint; a close
+enough match is used right away instead of waiting out the timeout, and the
+healed CSS selector is logged with the scenarios that needed it so the locator
+can be fixed. Without a close match the lookup keeps waiting for the locator.
+-D heal_strict=true (for CI) waits the full timeout and then fails the lookup
+instead.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+
+from selenium.common.exceptions import TimeoutException
+from support.fingerprints import FINGERPRINT_FUNCTIONS, similarity
+
+FINGERPRINT_SCRIPT = FINGERPRINT_FUNCTIONS + "return fingerprintOf(arguments[0]);"
+
+# Elements with the target's tag, or sharing an identifying value with it: [[element, fingerprint, selector]]
+CANDIDATES_SCRIPT = FINGERPRINT_FUNCTIONS + """
+const target = arguments[0];
+const identifiers = new Set(Object.values(target.attributes).concat(target.text ? [target.text] : []));
+const shares = (el) => FINGERPRINT_ATTRIBUTES.some((name) => identifiers.has(el.getAttribute(name)))
+    || (target.text && (el.innerText || "").trim() === target.text);
+return Array.from(document.body.querySelectorAll("*"))
+    .filter((el) => el.tagName.toLowerCase() === target.tag || shares(el))
+    .slice(0, 500)
+    .map((el) => [el, fingerprintOf(el), uniqueSelectorOf(el)]);
+"""
+
+
+@dataclass
+class HealedLocator:
+    """A broken locator and the selector it was healed to."""
+    key: str
+    locator: tuple
+    healed_selector: str
+    score: float
+    url: str
+    scenarios: list = field(default_factory=list)
+
+
+class HealingFinder:
+    """find() through the wait engine, falling back to the most similar element when the locator times out."""
+
+    def __init__(self, waits, index, threshold=0.75, strict=False, grace=0.3):
+        self.waits = waits
+        self.index = index
+        self.threshold = threshold
+        self.grace = grace   # Seconds a locator may match nothing before it is healed
+        self.strict = strict   # Fail instead of using a healed element
+        self.scenario = ""   # Running scenario, recorded with each healed locator
+        self.healed = {}   # key -> HealedLocator, tried before scanning the page again
+        self._recorded = set()   # Keys fingerprinted in this run; one refresh per run is enough
+
+    @property
+    def driver(self):
+        return self.waits.driver
+
+    def find(self, key, locator, timeout=None):
+        """Wait for the element of `key`; heals once it has been missing for the grace period (strict: the timeout)."""
+        timeout = self.waits.timeout if timeout is None else timeout
+        grace = timeout if self.strict else min(self.grace, timeout)
+        try:
+            element = self.waits.find(locator, grace)
+        except TimeoutException:
+            healed = self._heal(key, locator)
+            if healed is not None:
+                return healed
+            if grace >= timeout:
+                raise
+            # Nothing similar enough: keep waiting for the locator itself
+            element = self.waits.find(locator, timeout - grace)
+        self._remember(key, locator, element)
+        return element
+
+    def _remember(self, key, locator, element):
+        if key not in self._recorded:
+            self.index.record(key, locator, self.driver.execute_script(FINGERPRINT_SCRIPT, element))
+            self._recorded.add(key)
+
+    def _heal(self, key, locator):
+        target = self.index.get(key)
+        if target is None:
+            return None
+        known = self.healed.get(key)
+        if known:
+            elements = self.driver.find_elements("css selector", known.healed_selector)
+            if len(elements) == 1:
+                return elements[0]
+        scored = [(similarity(target, fingerprint), element, selector)
+                  for element, fingerprint, selector in self.driver.execute_script(CANDIDATES_SCRIPT, target)]
+        score, element, selector = max(scored, key=lambda item: item[0], default=(0.0, None, ""))
+        if score < self.threshold:
+            return None
+        if not known or known.healed_selector != selector:
+            known = self.healed[key] = HealedLocator(key, tuple(locator), selector, round(score, 3),
+                                                     self.driver.current_url)
+            print(f"[HEALED] {key}: {locator} -> css '{selector}' (similarity {score:.2f})")
+        if self.scenario and self.scenario not in known.scenarios:
+            known.scenarios.append(self.scenario)
+        if self.strict:
+            raise AssertionError(f"Locator {locator} of '{key}' matches nothing; the most similar element is "
+                                 f"css '{selector}' (similarity {score:.2f}). Update LOGIN_LOCATORS.")
+        return element
+
+    def write_report(self, path=os.path.join("reports", "healed_locators.json")):
+        """Healed locators of this run, for review."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as report_file:
+            json.dump({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                       "healed": [asdict(healed) for healed in self.healed.values()]}, report_file, indent=2)
@@ -0,0 +1,172 @@
+# features/support/load.py
+"""Concurrent-users load mode for the login flow.
+
+Drives the login form endpoint over plain HTTP from a thread pool (no browser),
+starting users on a linear ramp-up schedule, and reports throughput, error
+rate and latency percentiles so they can be asserted from feature steps.
+
+A login counts as successful when the response redirects away from the login
+page or sets a session cookie; a form re-rendered with an error is a 200 too.
+"""
+
+import http.client
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+
+@dataclass
+class LoadProfile:
+    """How many logins to run, over how long, and how many at once."""
+    users: int
+    ramp_up_seconds: float = 0.0
+    concurrency: int = 50
+
+
+@dataclass
+class LoginResult:
+    """Outcome of one simulated user's login request."""
+    started_at: float
+    latency: float
+    status: Optional[int] = None
+    error: Optional[str] = None
+    authenticated: bool = False
+
+    @property
+    def succeeded(self):
+        return self.error is None and self.authenticated
+
+
+@dataclass
+class LoadReport:
+    """Aggregated results of a load run."""
+    results: List[LoginResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def total(self):
+        return len(self.results)
+
+    @property
+    def throughput(self):
+        """Completed logins per second over the whole run."""
+        return self.total / self.duration if self.duration else 0.0
+
+    @property
+    def successful(self):
+        return sum(1 for result in self.results if result.succeeded)
+
+    @property
+    def error_rate(self):
+        return (self.total - self.successful) / self.total if self.total else 0.0
+
+    @property
+    def server_errors(self):
+        """Number of HTTP 5xx responses."""
+        return sum(1 for result in self.results if result.status and result.status >= 500)
+
+    @property
+    def status_counts(self) -> Dict[str, int]:
+        counts = {}
+        for result in self.results:
+            key = str(result.status) if result.status else "connection error"
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def latency_percentile(self, pct, successful_only=True):
+        """Latency in seconds at the given percentile (nearest-rank)."""
+        latencies = sorted(r.latency for r in self.results if r.succeeded or not successful_only)
+        if not latencies:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * len(latencies)))
+        return latencies[rank - 1]
+
+    def summary(self):
+        return (f"{self.total} logins in {self.duration:.1f}s | "
+                f"throughput {self.throughput:.1f}/s | error rate {self.error_rate:.2%} | "
+                f"p50 {self.latency_percentile(50):.3f}s p95 {self.latency_percentile(95):.3f}s "
+                f"p99 {self.latency_percentile(99):.3f}s | statuses {self.status_counts}")
+
+
+def parse_duration(text):
+    """Convert phrases like '1-minute', '30 seconds' or '2 hours' to seconds."""
+    match = re.search(r"(\d+(?:\.\d+)?)[\s-]*(second|sec|minute|min|hour)s?", text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Cannot parse a duration from '{text}'")
+    unit = match.group(2).lower()
+    multiplier = 3600 if unit == "hour" else 60 if unit.startswith("min") else 1
+    return float(match.group(1)) * multiplier
+
+
+def is_authenticated(response, login_path):
+    """True if a login response redirects off the login page or sets a session cookie."""
+    if response.status >= 400:
+        return False
+    location = response.getheader("Location")
+    if 300 <= response.status < 400 and location and urlsplit(location).path.rstrip("/") != login_path.rstrip("/"):
+        return True
+    for cookie in response.headers.get_all("Set-Cookie") or []:
+        name_value, _, attributes = cookie.partition(";")
+        _, _, value = name_value.partition("=")
+        if value.strip() and not re.search(r"max-age=0\b|expires=thu, 01 jan 1970", attributes, re.IGNORECASE):
+            return True
+    return False
+
+
+class _ConnectionPool(threading.local):
+    """One keep-alive HTTP connection per worker thread."""
+
+    def __init__(self, scheme, netloc, timeout):
+        self.connection = None
+        self.scheme, self.netloc, self.timeout = scheme, netloc, timeout
+
+    def get(self):
+        if self.connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self.connection = connection_class(self.netloc, timeout=self.timeout)
+        return self.connection
+
+    def reset(self):
+        if self.connection is not None:
+            self.connection.close()
+        self.connection = None
+
+
+def run_login_load(login_url, username, password, profile: LoadProfile,
+                   username_field="username", password_field="password", timeout=30.0) -> LoadReport:
+    """Post `profile.users` logins to `login_url`, ramping users up linearly."""
+    url = urlsplit(login_url)
+    path = url.path or "/"
+    body = urlencode({username_field: username, password_field: password})
+    headers = {"Content-Type": "application/x-www-form-urlencoded", "Connection": "keep-alive"}
+    connections = _ConnectionPool(url.scheme, url.netloc, timeout)
+    interval = profile.ramp_up_seconds / profile.users if profile.users else 0.0
+    run_start = time.perf_counter()
+
+    def login(index):
+        # Wait for this user's slot in the ramp-up schedule
+        delay = run_start + index * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        started = time.perf_counter()
+        try:
+            connection = connections.get()
+            connection.request("POST", path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.getheader("Connection", "").lower() == "close":
+                connections.reset()
+            return LoginResult(started - run_start, time.perf_counter() - started, status=response.status,
+                               authenticated=is_authenticated(response, path))
+        except (OSError, http.client.HTTPException) as error:
+            connections.reset()
+            return LoginResult(started - run_start, time.perf_counter() - started, error=str(error))
+
+    with ThreadPoolExecutor(max_workers=max(1, profile.concurrency)) as executor:
+        results = list(executor.map(login, range(profile.users)))
+    return LoadReport(results=results, duration=time.perf_counter() - run_start)
@@ -0,0 +1,26 @@
+# features/support/mock_server.py
+"""In-process mock login application (Facilitators/Mock Login) for hermetic runs."""
+
+import os
+import sys
+
+MOCK_LOGIN_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, os.pardir, os.pardir, "Facilitators", "Mock Login"))
+
+
+def start_mock_server(userdata):
+    """Start the mock on a free port; latency and faults come from the mock_* userdata."""
+    if MOCK_LOGIN_DIR not in sys.path:
+        sys.path.insert(0, MOCK_LOGIN_DIR)
+    from mock_login import build_server
+
+    seed = userdata.get("mock_seed")
+    server = build_server(
+        port=userdata.getint("mock_port", 0),
+        latency=userdata.get("mock_latency"),
+        error_rate=userdata.getfloat("mock_error_rate", 0.0),
+        error_status=userdata.getint("mock_error_status", 503),
+        drop_rate=userdata.getfloat("mock_drop_rate", 0.0),
+        seed=int(seed) if seed else None,
+    )
+    return server.start_in_thread()
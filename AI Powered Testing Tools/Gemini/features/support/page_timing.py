@@ -0,0 +1,105 @@
+# features/support/page_timing.py
+"""Page-load measurement from the browser's own timing APIs.
+
+Reads Navigation Timing Level 2, paint and largest-contentful-paint entries
+through the Selenium driver, and keeps a JSON-lines history of every
+measurement so a slow build shows up against previous runs.
+"""
+
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+# Async script: LCP entries are only delivered to a PerformanceObserver, and
+# buffered entries arrive in a callback, so give the observer one task to fire.
+PAGE_TIMING_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const [nav] = performance.getEntriesByType("navigation");
+const fcp = performance.getEntriesByType("paint").find((e) => e.name === "first-contentful-paint");
+let lcp = null;
+const finish = () => done({
+    ttfb: nav ? nav.responseStart : null,
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd : null,
+    first_contentful_paint: fcp ? fcp.startTime : null,
+    largest_contentful_paint: lcp,
+});
+try {
+    const observer = new PerformanceObserver((list) => {
+        const entries = list.getEntries();
+        if (entries.length) lcp = entries[entries.length - 1].startTime;
+    });
+    observer.observe({ type: "largest-contentful-paint", buffered: true });
+    setTimeout(() => { observer.disconnect(); finish(); }, 50);
+} catch (e) {
+    finish();  // Browser without LCP support
+}
+"""
+
+# Metrics that must stay within the "fully rendered" threshold
+THRESHOLD_METRICS = ("ttfb", "dom_content_loaded", "largest_contentful_paint")
+
+
+@dataclass
+class PageTiming:
+    """Milliseconds from navigation start; None where the browser gave no value."""
+    url: str
+    ttfb: Optional[float] = None
+    dom_content_loaded: Optional[float] = None
+    load: Optional[float] = None
+    first_contentful_paint: Optional[float] = None
+    largest_contentful_paint: Optional[float] = None
+
+    def over_threshold(self, threshold_ms):
+        """Names and values of the threshold metrics that exceed `threshold_ms`."""
+        return {name: getattr(self, name) for name in THRESHOLD_METRICS
+                if getattr(self, name) is not None and getattr(self, name) > threshold_ms}
+
+    def summary(self):
+        return ", ".join(f"{name}={value:.0f}ms" for name, value in asdict(self).items()
+                         if name != "url" and value is not None)
+
+
+def collect_page_timing(driver) -> PageTiming:
+    """Read the timing entries of the document currently loaded in `driver`."""
+    metrics = driver.execute_async_script(PAGE_TIMING_SCRIPT)
+    return PageTiming(url=driver.current_url, **metrics)
+
+
+class PageLoadHistory:
+    """Append-only JSON-lines log of page-load measurements."""
+
+    def __init__(self, path=os.path.join("reports", "page_load_history.jsonl")):
+        self.path = path
+
+    def entries(self, url=None) -> List[dict]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as history_file:
+            entries = [json.loads(line) for line in history_file if line.strip()]
+        return [entry for entry in entries if url is None or entry["url"] == url]
+
+    def append(self, timing: PageTiming):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as history_file:
+            history_file.write(json.dumps({"timestamp": time.time(), **asdict(timing)}) + "\n")
+
+    def regressions(self, timing: PageTiming, window=10, tolerance=1.2):
+        """Compare against the median of the last `window` runs for the same URL.
+
+        Returns a message per metric that is more than `tolerance` times slower.
+        """
+        previous = self.entries(timing.url)[-window:]
+        messages = []
+        for name in THRESHOLD_METRICS + ("load",):
+            current = getattr(timing, name)
+            history = [entry[name] for entry in previous if entry.get(name) is not None]
+            if current is None or not history:
+                continue
+            baseline = statistics.median(history)
+            if baseline and current > baseline * tolerance:
+                messages.append(f"{name} {current:.0f}ms vs median {baseline:.0f}ms of last {len(history)} runs")
+        return messages
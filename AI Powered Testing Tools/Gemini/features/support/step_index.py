@@ -0,0 +1,214 @@
+# features/support/step_index.py
+"""Indexed step matching for the behave step registry.
+
+Behave resolves a step line by trying every registered pattern in order. The
+StepIndex keeps behave's first-match-wins order but only tries the patterns
+that can possibly match:
+
+- each pattern's literal prefix (the text before its first field) is indexed
+  by its leading words, so a step line is only tried against patterns that
+  share them, plus the few patterns whose first word holds a field;
+- step lines resolved in a previous run with the same step library are
+  looked up directly from an on-disk cache;
+- overlapping patterns (one step line matched by two definitions, where the
+  later one is silently shadowed) are reported.
+
+The cache is keyed by a signature of all registered patterns, so adding,
+removing or reordering a step definition rebuilds it.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from behave.matchers import ParseMatcher
+from behave.step_registry import registry as default_registry
+
+STEP_TYPES = ("given", "when", "then", "step")
+WILDCARD = ""
+KEY_WORDS = 3  # Leading words used as index key
+FIELD = re.compile(r"\{([^{}]*)\}")
+
+
+def literal_prefix(matcher):
+    """Text that every line matched by `matcher` starts with (casefolded)."""
+    if not isinstance(matcher, ParseMatcher):
+        return ""  # Regex and custom matchers: no safe prefix, always tried
+    return matcher.pattern.split("{", 1)[0].casefold()
+
+
+def prefix_key(prefix):
+    """Index key: up to KEY_WORDS complete words at the start of a literal prefix."""
+    words = prefix.split(" ")[:-1]  # The last piece is incomplete (or empty after a trailing space)
+    return " ".join(words[:KEY_WORDS])
+
+
+def lookup_keys(text):
+    """Every index key a step line can be filed under, shortest first."""
+    words = text.split(" ")
+    return [" ".join(words[:count]) for count in range(min(KEY_WORDS, len(words) - 1) + 1)]
+
+
+def probe_texts(pattern):
+    """Sample step lines a parse pattern matches, used to detect overlaps."""
+    def sample(field, generic):
+        spec = field.group(1).partition(":")[2]
+        if spec.endswith(("d", "n")):
+            return "1"
+        if spec.endswith(("g", "f", "e", "%")):
+            return "1.5"
+        return generic
+    return [FIELD.sub(lambda field: sample(field, generic), pattern) for generic in ("x", "1", '"x y"')]
+
+
+@dataclass
+class Overlap:
+    step_type: str
+    winner: str
+    shadowed: str
+    example: str
+
+    def __str__(self):
+        return f"[{self.step_type}] '{self.example}' matches {self.winner} before {self.shadowed}"
+
+
+class StepIndex:
+    """Prefix index and resolution cache over a behave StepRegistry."""
+
+    def __init__(self, step_registry, cache_path=os.path.join(".behave_cache", "step_index.json")):
+        self.registry = step_registry
+        self.cache_path = cache_path
+        self.candidates: Dict[str, list] = {}
+        self.buckets: Dict[str, Dict[str, List[int]]] = {}
+        self.prefixes: Dict[str, List[str]] = {}
+        self.resolved: Dict[str, int] = {}
+        self.overlaps: List[Overlap] = []
+        self.signature = ""
+        self.lookups = 0
+        self.cache_hits = 0
+        self._dirty = False
+
+    @classmethod
+    def for_context(cls, context, **kwargs):
+        """Index over the registry the running behave runner uses."""
+        return cls(getattr(context._runner, "step_registry", None) or default_registry, **kwargs)
+
+    def _describe(self, matcher):
+        return f"'{matcher.pattern}' ({matcher.location})"
+
+    def build(self):
+        """Index the registry, reusing the on-disk cache when the step library is unchanged."""
+        steps = self.registry.steps
+        for step_type in STEP_TYPES:
+            more = steps["step"] if step_type != "step" else []
+            self.candidates[step_type] = list(steps[step_type]) + list(more)
+
+        digest = hashlib.sha256()
+        for step_type in STEP_TYPES:
+            for matcher in self.candidates[step_type]:
+                digest.update(f"{step_type}\t{type(matcher).__name__}\t{matcher.pattern}\t{matcher.location}\n".encode())
+        self.signature = digest.hexdigest()
+
+        for step_type, candidates in self.candidates.items():
+            self.prefixes[step_type] = [literal_prefix(matcher) for matcher in candidates]
+            buckets: Dict[str, List[int]] = {}
+            for position, prefix in enumerate(self.prefixes[step_type]):
+                buckets.setdefault(prefix_key(prefix), []).append(position)
+            self.buckets[step_type] = buckets
+
+        cached = self._load_cache()
+        if cached is not None:
+            self.resolved = cached["resolved"]
+            self.overlaps = [Overlap(**overlap) for overlap in cached["overlaps"]]
+        else:
+            self.overlaps = self._find_overlaps()
+            self._dirty = True
+        return self
+
+    # --- Matching ---
+
+    def find_match(self, step):
+        """Drop-in replacement for StepRegistry.find_match()."""
+        self.lookups += 1
+        step_type = step.step_type if step.step_type in self.candidates else "step"
+        candidates = self.candidates[step_type]
+        key = f"{step_type}\t{step.name}"
+        position = self.resolved.get(key)
+        if position is not None:
+            self.cache_hits += 1
+            return candidates[position].match(step.name) if position >= 0 else None
+
+        text = step.name.casefold()
+        buckets = self.buckets[step_type]
+        positions = sorted(position for key in lookup_keys(text) for position in buckets.get(key, ()))
+        prefixes = self.prefixes[step_type]
+        for position in positions:
+            if not text.startswith(prefixes[position]):
+                continue
+            match = candidates[position].match(step.name)
+            if match:
+                self.resolved[key] = position
+                self._dirty = True
+                return match
+        self.resolved[key] = -1
+        self._dirty = True
+        return None
+
+    def install(self):
+        """Route the registry's step lookups through this index."""
+        self.registry.find_match = self.find_match
+        return self
+
+    # --- Overlaps ---
+
+    def _find_overlaps(self):
+        overlaps = []
+        seen = set()
+        for step_type, candidates in self.candidates.items():
+            prefixes = self.prefixes[step_type]
+            for later in range(len(candidates)):
+                for earlier in range(later):
+                    pair = (id(candidates[earlier]), id(candidates[later]))
+                    if pair in seen:
+                        continue
+                    a, b = prefixes[earlier], prefixes[later]
+                    if not (a.startswith(b) or b.startswith(a)):
+                        continue
+                    # Probe both ways: a line written for either pattern that the other also matches
+                    probes = [(probe, candidates[earlier]) for probe in probe_texts(candidates[later].pattern)]
+                    probes += [(probe, candidates[later]) for probe in probe_texts(candidates[earlier].pattern)]
+                    for probe, other in probes:
+                        if other.matches(probe):
+                            seen.add(pair)
+                            overlaps.append(Overlap(step_type, self._describe(candidates[earlier]),
+                                                    self._describe(candidates[later]), probe))
+                            break
+        return overlaps
+
+    # --- Cache ---
+
+    def _load_cache(self) -> Optional[dict]:
+        try:
+            with open(self.cache_path) as cache_file:
+                cached = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        return cached if cached.get("signature") == self.signature else None
+
+    def save(self):
+        """Persist resolutions and overlaps for the next run with the same step library."""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.cache_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        data = {"signature": self.signature, "resolved": self.resolved,
+                "overlaps": [overlap.__dict__ for overlap in self.overlaps]}
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as cache_file:
+            json.dump(data, cache_file)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
@@ -0,0 +1,106 @@
+# features/support/waits.py
+"""Explicit wait engine for the Selenium driver.
+
+Replaces the global implicitly_wait(10): every lookup states its own condition
+and timeout, polling starts fast and backs off, and negative checks
+("this element is absent") return immediately instead of burning the full
+implicit timeout. Time spent waiting is recorded per step.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+
+@dataclass
+class StepWaitStats:
+    """Waiting done while one step ran."""
+    step: str
+    waits: int = 0
+    wait_seconds: float = 0.0
+
+
+@dataclass
+class WaitEngine:
+    """Polls conditions against the driver with an adaptive interval."""
+    driver: object
+    timeout: float = 10.0
+    initial_poll: float = 0.05
+    max_poll: float = 0.5
+    backoff: float = 1.5
+    history: List[StepWaitStats] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.current = StepWaitStats(step="<outside steps>")
+
+    # --- Step bookkeeping ---
+
+    def start_step(self, name):
+        self.current = StepWaitStats(step=name)
+
+    def end_step(self):
+        self.history.append(self.current)
+        return self.current
+
+    def slowest_steps(self, limit=10) -> List[StepWaitStats]:
+        """Steps with the most wait time, merged by step text."""
+        merged: Dict[str, StepWaitStats] = {}
+        for stats in self.history:
+            total = merged.setdefault(stats.step, StepWaitStats(step=stats.step))
+            total.waits += stats.waits
+            total.wait_seconds += stats.wait_seconds
+        return sorted(merged.values(), key=lambda stats: stats.wait_seconds, reverse=True)[:limit]
+
+    # --- Waiting ---
+
+    def until(self, condition, timeout=None, message=""):
+        """Return the first truthy value of condition(driver), polling until `timeout`."""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        deadline = start + timeout
+        interval = self.initial_poll
+        try:
+            while True:
+                try:
+                    value = condition(self.driver)
+                    if value:
+                        return value
+                except IGNORED_EXCEPTIONS:
+                    pass
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutException(message or f"Condition not met within {timeout}s")
+                time.sleep(min(interval, remaining))
+                interval = min(interval * self.backoff, self.max_poll)
+        finally:
+            self.current.waits += 1
+            self.current.wait_seconds += time.perf_counter() - start
+
+    def find(self, locator, timeout=None):
+        """Wait for an element located by a (by, value) tuple and return it."""
+        return self.until(lambda driver: driver.find_element(*locator), timeout,
+                          message=f"Element {locator} not found")
+
+    def is_present(self, locator, timeout=None):
+        """True once an element matches, False if none appears within `timeout`."""
+        try:
+            self.find(locator, timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    def is_absent(self, locator, timeout=0.0):
+        """True once no element matches; with the default timeout this is a single lookup."""
+        try:
+            self.until(lambda driver: not driver.find_elements(*locator) or None, timeout)
+            return True
+        except TimeoutException:
+            return False
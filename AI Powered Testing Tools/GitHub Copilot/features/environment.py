@@ -2,9 +2,96 @@
 Behave environment configuration for login feature tests.
 
 This module provides hooks for test setup and teardown.
+
+Runtime options are passed as behave userdata (-D name=value, or the
+[behave.userdata] section of behave.ini):
+    base_url   - Base URL of the application under test
+    browser    - Playwright browser to launch: chromium, firefox or webkit
+    browser_matrix - Set by run_parallel.py: rows pinned to another browser run on that browser's worker
+    headless   - Run the browser without a visible UI (true/false)
+    worker_id  - Index of the parallel worker running this process (set by run_parallel.py)
+    context_pool_size - Number of pre-warmed browser contexts kept idle
+    context_max_uses  - Scenarios served by one browser context before it is replaced
+    readiness  - How LoginPage waits: event (specific outcomes) or networkidle
+    session_cache       - Reuse authenticated sessions across scenarios (true/false)
+    session_cache_ttl   - Maximum age of a cached session in seconds
+    authenticated_path  - Page used to verify that a cached session is still valid
+    auth_path  - Path the login form posts credentials to
+    latency_report - Where after_all writes login latency percentiles (JSON)
+    mock_server - Serve the application from the in-process mock (overrides base_url)
+    mock_latency      - Mock login latency distribution, e.g. lognormal:80,0.4 (ms)
+    mock_error_rate   - Fraction of mock login requests answered with mock_error_status
+    mock_error_status - HTTP status of injected errors (default 503)
+    mock_drop_rate    - Fraction of mock login requests whose connection is dropped
+    mock_seed         - Seed for mock latency and fault sampling
+    result_cache      - Skip scenarios whose cache key (steps, code, settings, build) already passed (true/false)
+    result_cache_size - Entries kept in the result cache index (LRU)
+    build_fingerprint - Identifies the application build; part of the result cache key
+    asset_cache   - Serve immutable static assets from the on-disk asset cache (true/false, default false)
+    blocked_hosts - Comma-separated analytics hosts whose requests are aborted
+    asset_report  - Where after_all writes per-navigation asset cache statistics (JSON)
+    worker_count  - Number of parallel workers sharing the credential pool (set by run_parallel.py)
+    credential_pool      - JSON file of pre-provisioned accounts [{"username": ..., "password": ...}]
+    credential_pool_size - Accounts per worker provisioned in the mock server when no pool file is given
+    credential_lease     - Lease an account per scenario or per worker (scenario/worker)
+    lockout_reset_url    - Endpoint that clears lockouts of {"usernames": [...]} (the mock provides its own)
+    datagen_rows - Generated rows appended to each @datagen:<profile> outline (default 0; mock_server only)
+    datagen_seed - Seed of the generated rows; the same seed always yields the same rows
+    api_fast_path  - Run @api_fast_path outline rows against the login API (true/false)
+    api_login_path - Path of the JSON login endpoint used by the fast path
+    api_in_flight  - Login API requests in flight at most
+    api_ui_sample  - Fraction of fast path rows still run through the browser
+    fast_path_backend - Where fast path rows are submitted: api (JSON endpoint) or browser (async pages)
+    async_browser  - Start the async Playwright browser for async_step steps up front (true/false);
+                     @async_browser scenarios start it on first use otherwise
+    async_pages    - Pages the async browser drives concurrently at most
+    diagnostics        - Keep trace, screenshot, network and console logs of failed scenarios (true/false)
+    diagnostics_trace  - Include a Playwright trace in the failure diagnostics (true/false)
+    diagnostics_buffer - Network responses and console messages kept in memory per browser context
+    diagnostics_dir    - Where failure archives are written
+    diagnostics_max_mb - Size cap of diagnostics_dir; the oldest archives are evicted first
+    selector_report - Where after_all writes which selector alternatives matched, incl. dead fallbacks (JSON)
+    self_healing      - Fingerprint matched elements and heal selectors that stop matching (true/false)
+    fingerprint_index - JSON file the element fingerprints persist in between runs
+    heal_threshold    - Similarity (0-1) a candidate element needs to replace a broken selector
+    heal_grace_ms     - How long a selector may match nothing before it is healed
+    heal_strict       - Fail scenarios that needed a healed selector, e.g. in CI (true/false)
+    heal_wait_ms      - With heal_strict, the full wait before a missing selector is reported
+    healing_report    - Where after_all writes the healed selectors for review (JSON)
+    retries         - Extra in-process attempts of a failed scenario, each in a fresh browser context
+    lane            - all, main (skip quarantined flaky scenarios) or quarantine (run only those)
+    flake_history   - JSON file of recent scenario outcomes the quarantine is based on
+    flake_threshold - Flake rate (0-1) over the recent runs at which a scenario is quarantined
 """
 
 import logging
+import os
+
+from playwright.sync_api import Error as PlaywrightError, sync_playwright
+
+from support.api_login import ApiFastPath, LoginApiClient
+from support.asset_cache import DEFAULT_BLOCKED_HOSTS, AssetCache
+from support.async_login_page import AsyncBrowserHost, close_async_login_page
+from support.browser_pool import ContextPool
+from support.browsers import launch_browser, pinned_browser, same_browser
+from support.credential_pool import (
+    DEFAULT_ACCOUNTS, CredentialPool, end_scenario, generate_accounts, http_lockout_resetter, load_accounts,
+)
+from support.datagen import attach_streams
+from support.diagnostics import FailureDiagnostics
+from support.diagnostics_store import DiagnosticsStore
+from support.fingerprints import FingerprintIndex
+from support.flakes import FAILED_STATUSES, FlakeHistory, RetryTracker
+from support.healing import LocatorHealer
+from support.latency import LatencyRecorder
+from support.mock_server import start_mock_server
+from support.result_cache import ResultCache, harness_fingerprint, scenario_key, step_registry_of
+from support.selectors import SelectorStats
+from support.session_cache import SessionCache
+
+
+# Userdata that changes what a scenario tests; part of the result cache key
+RESULT_CACHE_SETTINGS = ("base_url", "browser", "readiness", "mock_server", "api_fast_path", "fast_path_backend")
 
 
 def before_all(context):
@@ -22,12 +109,207 @@ def before_all(context):
     
     # Initialize any shared test configuration
     context.config.setup_logging = True
+    userdata = context.config.userdata
+    context.base_url = userdata.get("base_url", "http://localhost:3000")
+    context.worker_id = userdata.getint("worker_id", 0)
+    worker_count = userdata.getint("worker_count", 1)
+    mock_server = userdata.getbool("mock_server", False)
+    
+    # Accounts every worker leases its own slice of; the mock provisions a generated pool
+    if userdata.get("credential_pool"):
+        pool_accounts = load_accounts(userdata.get("credential_pool"))
+    elif mock_server:
+        pool_accounts = generate_accounts(userdata.getint("credential_pool_size", 4) * worker_count)
+    else:
+        pool_accounts = list(DEFAULT_ACCOUNTS)
+    
+    context.mock_server = None
+    if mock_server:
+        context.mock_server = start_mock_server(userdata, pool_accounts)
+        context.base_url = context.mock_server.url
+        logging.info(f"Mock login server listening on {context.base_url}")
+    
+    # Generated rows expect the mock's login policy, so they only run against the mock
+    context.datagen_rows = userdata.getint("datagen_rows", 0)
+    if context.datagen_rows and not mock_server:
+        logging.warning("datagen_rows ignored: generated rows expect the mock's login policy (-D mock_server=true)")
+        context.datagen_rows = 0
+    
+    resetter = None
+    if context.mock_server:
+        resetter = context.mock_server.unlock
+    elif userdata.get("lockout_reset_url"):
+        resetter = http_lockout_resetter(userdata.get("lockout_reset_url"))
+    context.credential_pool = CredentialPool(
+        pool_accounts,
+        worker_id=context.worker_id,
+        worker_count=worker_count,
+        mode=userdata.get("credential_lease", "scenario"),
+        resetter=resetter,
+    )
+    context.browser_name = userdata.get("browser", "chromium")
+    
+    # Each behave process (including every parallel worker) owns one browser
+    context.playwright = sync_playwright().start()
+    context.browser = launch_browser(
+        context.playwright,
+        context.browser_name,
+        headless=userdata.getbool("headless", True),
+    )
+    logging.info(f"Worker {context.worker_id} launched {context.browser_name}")
+    
+    # Opt-in: immutable static assets are served from disk and analytics requests blocked in every context
+    context.asset_cache = None
+    if userdata.getbool("asset_cache", False):
+        blocked_hosts = userdata.get("blocked_hosts")
+        context.asset_cache = AssetCache(
+            blocked_hosts=blocked_hosts.split(",") if blocked_hosts is not None else DEFAULT_BLOCKED_HOSTS
+        )
+    
+    # Traces and network/console logs are recorded in memory and only written for failures
+    context.diagnostics = None
+    if userdata.getbool("diagnostics", True):
+        context.diagnostics = FailureDiagnostics(
+            DiagnosticsStore(
+                directory=userdata.get("diagnostics_dir", os.path.join("reports", "diagnostics")),
+                max_bytes=userdata.getint("diagnostics_max_mb", 200) * 1024 * 1024,
+            ),
+            buffer_size=userdata.getint("diagnostics_buffer", 200),
+            trace=userdata.getbool("diagnostics_trace", True),
+            worker_id=context.worker_id,
+        )
+    context_setup = [service.install for service in (context.asset_cache, context.diagnostics) if service]
+    
+    def setup_context(browser_context):
+        for install in context_setup:
+            install(browser_context)
+    context.setup_browser_context = setup_context
+    
+    # Pre-warmed contexts are handed out per scenario and recycled afterwards
+    context.context_pool = ContextPool(
+        context.browser,
+        size=userdata.getint("context_pool_size", 2),
+        max_uses=userdata.getint("context_max_uses", 50),
+        on_create=setup_context,
+    )
+    context.context_pool.prewarm()
+    
+    # Serial runs launch the browsers compatibility rows are pinned to on first use
+    context.browser_matrix = userdata.getbool("browser_matrix", False)
+    context.pinned_pools = {}
     
-    # In production, initialize WebDriver/browser automation framework here
-    # Example:
-    # context.driver = webdriver.Chrome()
-    # context.base_url = "http://localhost:8080"
+    # Authenticated storage state shared by scenarios that only need a logged-in user
+    context.session_cache = None
+    if userdata.getbool("session_cache", True):
+        context.session_cache = SessionCache(ttl_seconds=userdata.getint("session_cache_ttl", 1800))
     
+    # Timing of every login in this process, reported in after_all
+    context.latency_recorder = LatencyRecorder()
+    
+    # Which alternative of each fallback selector matched, reported in after_all
+    context.selector_stats = SelectorStats()
+    
+    # Fingerprints of matched elements; selectors that stop matching are healed from them
+    context.locator_healer = None
+    if userdata.getbool("self_healing", False):
+        context.locator_healer = LocatorHealer(
+            FingerprintIndex(userdata.get("fingerprint_index", os.path.join(".behave_cache", "locator_fingerprints.json"))),
+            threshold=userdata.getfloat("heal_threshold", 0.75),
+            grace_ms=userdata.getfloat("heal_grace_ms", 300),
+            strict=userdata.getbool("heal_strict", False),
+            strict_wait_ms=userdata.getfloat("heal_wait_ms", 30000),
+        )
+    
+    # One async browser on a background event loop, multiplexing many pages (async steps, browser fast path)
+    api_fast_path = userdata.getbool("api_fast_path", False)
+    fast_path_backend = userdata.get("fast_path_backend", "api")
+    context.async_host = AsyncBrowserHost(
+        context.browser_name,
+        headless=userdata.getbool("headless", True),
+        base_url=context.base_url,
+        max_pages=userdata.getint("async_pages", 8),
+    )
+    if userdata.getbool("async_browser", False) or (api_fast_path and fast_path_backend == "browser"):
+        context.async_host.start()
+    
+    # Opt-in: server-side validation rows skip the browser and go straight to the login API
+    context.api_fast_path = None
+    if api_fast_path:
+        if fast_path_backend == "browser":
+            context.login_api = context.async_host
+        else:
+            context.login_api = LoginApiClient(
+                context.base_url,
+                api_path=userdata.get("api_login_path", "/api/login"),
+                max_connections=userdata.getint("api_in_flight", 200),
+            )
+        context.api_fast_path = ApiFastPath(context.login_api, ui_sample=userdata.getfloat("api_ui_sample", 0.1))
+    
+    # Failed scenarios are retried in-process; chronically flaky ones move to the quarantine lane
+    context.retry_tracker = RetryTracker(
+        FlakeHistory(
+            userdata.get("flake_history", os.path.join(".behave_cache", "flake_history.json")),
+            threshold=userdata.getfloat("flake_threshold", 0.2),
+        ),
+        max_attempts=userdata.getint("retries", 1) + 1,
+        lane=userdata.get("lane", "all"),
+    )
+    
+    # Opt-in: skip scenarios that already passed against the same steps, code and build
+    context.result_cache = None
+    if userdata.getbool("result_cache", False):
+        context.result_cache = ResultCache(max_entries=userdata.getint("result_cache_size", 5000))
+        context.build_fingerprint = userdata.get("build_fingerprint", "")
+        context.harness_fingerprint = harness_fingerprint()
+        # A pass against one target, browser or readiness mode says nothing about another
+        context.result_cache_settings = {name: userdata.get(name, "") for name in RESULT_CACHE_SETTINGS}
+
+
+def pinned_pool(context, browser):
+    """
+    Get the context pool of a browser a row is pinned to, launching the browser on first use.
+    
+    If the browser cannot be launched (e.g. the Edge channel is not installed),
+    its rows run in the configured browser instead.
+    
+    Args:
+        context: The behave context object
+        browser: Browser name from the row
+        
+    Returns:
+        ContextPool to borrow the row's browser context from
+    """
+    if browser not in context.pinned_pools:
+        try:
+            pinned = launch_browser(context.playwright, browser,
+                                    headless=context.config.userdata.getbool("headless", True))
+        except PlaywrightError as error:
+            logging.warning(f"{browser} is not available, its rows run in {context.browser_name}: "
+                            f"{str(error).splitlines()[0]}")
+            context.pinned_pools[browser] = context.context_pool
+        else:
+            logging.info(f"Launched {browser} for the rows pinned to it")
+            context.pinned_pools[browser] = ContextPool(pinned, size=1, on_create=context.setup_browser_context)
+    return context.pinned_pools[browser]
+
+
+def before_feature(context, feature):
+    """
+    Execute before each feature.
+    
+    Args:
+        context: The behave context object
+        feature: The feature object
+    """
+    # Seeded synthetic rows are streamed into @datagen outlines while they run
+    userdata = context.config.userdata
+    context.datagen_streams = attach_streams(
+        feature,
+        rows_per_outline=context.datagen_rows,
+        seed=userdata.getint("datagen_seed", 0),
+    )
+    context.retry_tracker.patch(feature.walk_scenarios())
+
 
 def before_scenario(context, scenario):
     """
@@ -43,10 +325,69 @@ def before_scenario(context, scenario):
     context.last_login_response_time_ms = 0
     context.using_screen_reader = False
     context.current_browser = "default"
+    if context.locator_healer:
+        context.locator_healer.scenario = scenario.name
+    
+    # Under run_parallel.py, rows pinned to another browser belong to that browser's matrix worker
+    browser = pinned_browser(scenario)
+    pool = context.context_pool
+    if browser and not same_browser(browser, context.browser_name):
+        if context.browser_matrix:
+            scenario.skip(reason=f"pinned to {browser}; runs on the {browser} worker")
+            return
+        pool = pinned_pool(context, browser)
+    
+    lane_skip = context.retry_tracker.skip_reason(scenario)
+    if lane_skip:
+        scenario.skip(reason=lane_skip)
+        if context.api_fast_path:
+            context.api_fast_path.discard(scenario, context.credential_pool)
+        return
     
-    # In production, set up clean browser state
-    # Example:
-    # context.driver.delete_all_cookies()
+    if context.result_cache:
+        context.result_cache_key = scenario_key(scenario, context.build_fingerprint, context.harness_fingerprint,
+                                                step_registry_of(context), context.result_cache_settings)
+        cached = context.result_cache.lookup(context.result_cache_key)
+        if cached:
+            scenario.skip(reason=f"passed in a previous run ({cached['location']}), result cached")
+            if context.api_fast_path:
+                context.api_fast_path.discard(scenario, context.credential_pool)
+            return
+    
+    # API fast path rows need no browser; their result is usually prefetched with the rest of the outline
+    context.api_mode = bool(context.api_fast_path) and context.api_fast_path.uses_api(scenario)
+    if context.api_mode:
+        context.api_prefetched = context.api_fast_path.take(scenario, context.credential_pool)
+        if context.api_prefetched and context.api_prefetched.lease:
+            context.credential_lease = context.api_prefetched.lease
+        context.api_fast_path.api_rows += 1
+        return
+    
+    # @async_browser scenarios drive their pages with async steps on the shared async browser
+    if "async_browser" in scenario.effective_tags:
+        context.async_host.start()
+        return
+    
+    # Borrow a clean browser context and page for this scenario
+    context.browser_session = pool.acquire()
+    context.browser_session_pool = pool
+    context.browser_context = context.browser_session.browser_context
+    context.page = context.browser_session.page
+    if context.diagnostics:
+        context.diagnostics.begin(context.browser_context, scenario.name)
+
+
+def before_step(context, step):
+    """
+    Execute before each step.
+    
+    Args:
+        context: The behave context object
+        step: The step object
+    """
+    # A step may observe changes made since the previous step (e.g. async UI updates)
+    if hasattr(context, 'login_page'):
+        context.login_page.invalidate_snapshot()
 
 
 def after_scenario(context, scenario):
@@ -57,16 +398,35 @@ def after_scenario(context, scenario):
         context: The behave context object
         scenario: The scenario object
     """
-    # Take screenshot on failure
     if scenario.status == "failed":
         logging.error(f"Scenario failed: {scenario.name}")
-        # In production, capture screenshot
-        # Example:
-        # screenshot_path = f"screenshots/{scenario.name}_{datetime.now()}.png"
-        # context.driver.save_screenshot(screenshot_path)
     
-    # Clean up any scenario-specific resources
-    pass
+    # Trace, screenshot, network and console logs are written for failed scenarios only
+    if getattr(context, 'diagnostics', None) and hasattr(context, 'browser_session'):
+        archive = context.diagnostics.finish(context.browser_context, context.page, scenario)
+        if archive:
+            logging.error(f"Failure diagnostics written to {archive}")
+    
+    if getattr(context, 'result_cache_key', None):
+        context.result_cache.record(context.result_cache_key, scenario)
+    
+    if hasattr(context, 'retry_tracker'):
+        context.retry_tracker.on_scenario_finished(scenario)
+    
+    # Leased accounts are parked until the next bulk lockout reset
+    end_scenario(context)
+    
+    # Queue the next generated row once the outline's last scenario has finished
+    for stream in getattr(context, 'datagen_streams', ()):
+        stream.on_scenario_finished(scenario)
+        context.retry_tracker.patch(stream.outline.scenarios[-1:])
+    
+    if getattr(context, 'async_host', None):
+        close_async_login_page(context)
+    
+    # Return the browser context to the pool; failed scenarios (and so their retries) never reuse theirs
+    if hasattr(context, 'browser_session'):
+        context.browser_session_pool.release(context.browser_session, discard=scenario.status in FAILED_STATUSES)
 
 
 def after_all(context):
@@ -76,9 +436,81 @@ def after_all(context):
     Args:
         context: The behave context object
     """
+    # Write login latency percentiles for the run
+    if hasattr(context, 'latency_recorder') and context.latency_recorder.samples:
+        report_path = context.config.userdata.get(
+            "latency_report", os.path.join("reports", "login_latency.json")
+        )
+        context.latency_recorder.write_report(report_path)
+        logging.info(f"Login latency report written to {report_path}")
+    
+    if getattr(context, 'asset_cache', None) and context.asset_cache.navigations:
+        report_path = context.config.userdata.get("asset_report", os.path.join("reports", "asset_cache.json"))
+        context.asset_cache.write_report(report_path)
+        summary = context.asset_cache.summary()
+        logging.info(f"Asset cache: {summary['cache_hits']}/{summary['asset_requests']} asset requests served "
+                     f"from cache, {summary['bytes_saved']} bytes saved ({report_path})")
+    
+    if getattr(context, 'selector_stats', None) and context.selector_stats.resolutions:
+        report_path = context.config.userdata.get(
+            "selector_report", os.path.join("reports", "selector_fallbacks.json")
+        )
+        context.selector_stats.write_report(report_path)
+        logging.info(f"Selectors: {context.selector_stats.resolutions} resolution(s), "
+                     f"{context.selector_stats.cache_hits} cached lookup(s) ({report_path})")
+        for key, dead in context.selector_stats.dead_fallbacks().items():
+            logging.info(f"Selector '{key}' never matched through: {', '.join(dead)}")
+    
+    if getattr(context, 'locator_healer', None):
+        context.locator_healer.index.save()
+        if context.locator_healer.healed:
+            report_path = context.config.userdata.get(
+                "healing_report", os.path.join("reports", "healed_selectors.json")
+            )
+            context.locator_healer.write_report(report_path)
+            logging.warning(f"Self-healing: {len(context.locator_healer.healed)} selector(s) healed, "
+                            f"review {report_path}")
+    
+    if hasattr(context, 'retry_tracker'):
+        tracker = context.retry_tracker
+        tracker.history.save()
+        logging.info(f"Retries: {tracker.retried} retry attempt(s), {len(tracker.flaky)} scenario(s) passed "
+                     f"only on a retry, {len(tracker.history.quarantined())} scenario(s) quarantined")
+    
+    if getattr(context, 'result_cache', None):
+        context.result_cache.save()
+        logging.info(f"Result cache: {context.result_cache.hits} scenario(s) skipped as cached passes")
+    
+    if getattr(context, 'diagnostics', None) and context.diagnostics.store.written:
+        store = context.diagnostics.store
+        logging.info(f"Failure diagnostics: {store.written} archive(s) in {store.directory}, "
+                     f"{store.evicted} old archive(s) evicted")
+    
+    if getattr(context, 'api_fast_path', None):
+        context.login_api.close()
+        logging.info(f"API fast path: {context.api_fast_path.api_rows} row(s), "
+                     f"{context.login_api.requests} login(s) submitted by {type(context.login_api).__name__}")
+    
+    # Return all leases and clear their lockout state in one call
+    if hasattr(context, 'credential_pool'):
+        context.credential_pool.release_all()
+        context.credential_pool.reset_lockouts()
+        logging.info(f"Credential pool: {context.credential_pool.leased} lease(s), "
+                     f"{context.credential_pool.resets} bulk lockout reset(s)")
+    
     # Clean up shared resources
-    # In production, quit WebDriver
-    # Example:
-    # if hasattr(context, 'driver'):
-    #     context.driver.quit()
-    pass
+    if getattr(context, 'async_host', None):
+        context.async_host.close()
+    for pool in getattr(context, 'pinned_pools', {}).values():
+        if pool is not context.context_pool:
+            pool.close()
+            pool.browser.close()
+    if hasattr(context, 'context_pool'):
+        context.context_pool.close()
+    if hasattr(context, 'browser'):
+        context.browser.close()
+    if hasattr(context, 'playwright'):
+        context.playwright.stop()
+    if getattr(context, 'mock_server', None):
+        context.mock_server.stop()
+
@@ -31,6 +31,13 @@ Feature: Login page UI for username and password
     Then I should be successfully logged in
     And I should be redirected to the authenticated home page
 
+  @functional
+  Scenario: Signed-in session persists across page loads
+    Given I am logged in
+    When I reopen the authenticated home page
+    Then I should be successfully logged in
+    And I should be redirected to the authenticated home page
+
   @functional
   Scenario Outline: Invalid login attempts with various incorrect credentials
     Given I am on the login page
@@ -78,7 +85,7 @@ Feature: Login page UI for username and password
       | "valid_user "     | "valid_password"    | valid_user        | valid_password     |
       | "  valid_user  "  | "  valid_password"  | valid_user        | valid_password     |
 
-  @functional
+  @functional @datagen:length_boundaries @api_fast_path
   Scenario Outline: Username and password length boundaries
     Given I am on the login page
     And I enter "<username>" into the username field
@@ -111,7 +118,7 @@ Feature: Login page UI for username and password
   # 3. Security and robustness (functional + non-functional)
   # --------------------------------------------------------------------------
 
-  @security @functional
+  @security @functional @datagen:injection
   Scenario Outline: Resilience against obvious injection strings
     Given I am on the login page
     And I enter "<username_input>" into the username field
@@ -229,3 +236,17 @@ Feature: Login page UI for username and password
       | Firefox   |
       | Edge      |
 
+  # --------------------------------------------------------------------------
+  # 8. Async browser (pages of many scenarios multiplexed over one event loop)
+  # --------------------------------------------------------------------------
+
+  @async_browser @functional
+  Scenario: Successful login through the async page object
+    Given I am on the login page in the async browser
+    When I log in with valid credentials in the async browser
+    Then I should be successfully logged in in the async browser
+
+  @async_browser @performance @nonfunctional
+  Scenario: Concurrent logins in one async browser
+    When 8 users log in with valid credentials concurrently in the async browser
+    Then every concurrent login should succeed
@@ -14,11 +14,40 @@ Best Practices Implemented:
 """
 
 from behave import given, when, then
-from playwright.sync_api import Page, Browser, sync_playwright, expect
+from playwright.sync_api import Page, Browser, Response, sync_playwright, expect
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from typing import Optional, Dict, Any
 import time
 import re
 
+from support.api_login import ApiLoginResult, LoginApiClient, Prefetched
+from support.async_login_page import async_step, get_async_login_page
+from support.credential_pool import lease_for, resolve_token
+from support.dom_snapshot import LoginFormSnapshot, take_snapshot
+from support.healing import LocatorHealer
+from support.latency import LatencyRecorder, LoginTiming
+from support.lockout import LockoutDriver
+from support.login_form import (
+    AUTH_PATH_PATTERN, LOGIN_OUTCOME_SCRIPT, LOGIN_SELECTORS, MARK_ATTEMPT_SCRIPT, SESSION_STATE_SCRIPT,
+    AuthResponseWatcher, outcome_arg,
+)
+from support.selectors import SelectorResolver, SelectorStats
+from support.session_cache import SessionCache
+
+
+# Navigation Timing Level 2 figures for the current document, in milliseconds
+NAVIGATION_TIMING_SCRIPT = """
+() => {
+    const [entry] = performance.getEntriesByType("navigation");
+    if (!entry) return {};
+    return {
+        ttfb: entry.responseStart - entry.requestStart,
+        dom_content_loaded: entry.domContentLoadedEventEnd - entry.startTime,
+        load: entry.loadEventEnd > 0 ? entry.loadEventEnd - entry.startTime : null,
+    };
+}
+"""
+
 
 # ============================================================================
 # Page Object Model
@@ -29,30 +58,94 @@ class LoginPage:
     Page Object encapsulating login page interactions.
     
     Uses Playwright for browser automation with robust selectors and waits.
+    
+    Readiness modes:
+        event: wait for the specific outcome - the login form being ready, the
+            authentication response, the redirect to an authenticated page or
+            the error message becoming visible
+        networkidle: wait for network quiescence after every action
     """
     
-    def __init__(self, page: Page, base_url: str = "http://localhost:3000"):
+    READINESS_MODES = ("event", "networkidle")
+    
+    def __init__(self, page: Page, base_url: str = "http://localhost:3000", readiness: str = "event",
+                 auth_path_pattern: str = AUTH_PATH_PATTERN,
+                 recorder: Optional[LatencyRecorder] = None, timing_label: str = "",
+                 selector_stats: Optional[SelectorStats] = None, healer: Optional[LocatorHealer] = None):
         """
         Initialize the LoginPage.
         
         Args:
             page: Playwright page instance
             base_url: Base URL of the application
+            readiness: How actions wait for the page - 'event' or 'networkidle'
+            auth_path_pattern: Regex matching the URL path of the authentication request
+            recorder: Collects the timing of every login submitted through this page
+            timing_label: Label stored with each timing sample (e.g. the scenario name)
+            selector_stats: Collects which selector alternatives matched, for the dead fallback report
+            healer: Fingerprints matched elements and heals selectors that stop matching
         """
+        if readiness not in self.READINESS_MODES:
+            raise ValueError(f"Unknown readiness mode '{readiness}', expected one of {self.READINESS_MODES}")
         self.page = page
         self.base_url = base_url
+        self.readiness = readiness
+        self.auth_path_pattern = re.compile(auth_path_pattern)
+        self.last_auth_response: Optional[Response] = None
+        self.last_outcome: Optional[str] = None
+        self.recorder = recorder
+        self.timing_label = timing_label
+        self.last_timing: Optional[LoginTiming] = None
+        self._pending_fill_ns = 0
         
         # Selectors - using multiple strategies for robustness
-        self.username_input = "input#username, input[name='username'], input[type='text'][placeholder*='username' i]"
-        self.password_input = "input#password, input[name='password'], input[type='password']"
-        self.login_button = "button:has-text('Login'), button[type='submit'], input[type='submit']"
-        self.error_message = ".error, .alert-danger, [role='alert'], .error-message"
-        self.user_menu = "#user-menu, .user-profile, [data-testid='user-menu']"
+        self.username_input = LOGIN_SELECTORS["username"]
+        self.password_input = LOGIN_SELECTORS["password"]
+        self.login_button = LOGIN_SELECTORS["login_button"]
+        self.error_message = LOGIN_SELECTORS["error"]
+        self.user_menu = LOGIN_SELECTORS["user_menu"]
+        self.username_label = LOGIN_SELECTORS["username_label"]
+        self.password_label = LOGIN_SELECTORS["password_label"]
+        
+        # The alternative of each selector that matches, resolved once per page load
+        self.selectors = None
+        if page is not None:
+            self.selectors = SelectorResolver.attach(page, LOGIN_SELECTORS, selector_stats, healer)
+        
+        # Snapshot of the form state, reused until the next action on the page
+        self._snapshot: Optional[LoginFormSnapshot] = None
+    
+    def snapshot(self, refresh: bool = False) -> LoginFormSnapshot:
+        """
+        Get the state of all login-form elements, captured in one round-trip.
+        
+        Args:
+            refresh: Capture a new snapshot even if a cached one exists
+            
+        Returns:
+            LoginFormSnapshot of the current page
+        """
+        if refresh or self._snapshot is None:
+            # Alternatives already resolved on this page load are not evaluated again
+            self._snapshot = take_snapshot(self.page, {key: self.selectors.current(key) for key in LOGIN_SELECTORS})
+        return self._snapshot
+    
+    def invalidate_snapshot(self) -> None:
+        """Discard the cached snapshot after the page may have changed."""
+        self._snapshot = None
+        if self.selectors:
+            # The action may render elements that did not match before
+            self.selectors.forget_unmatched()
     
     def navigate(self) -> None:
-        """Navigate to the login page."""
-        self.page.goto(f"{self.base_url}/login")
-        self.page.wait_for_load_state("networkidle")
+        """Navigate to the login page and wait until the form can be used."""
+        self.invalidate_snapshot()
+        if self.readiness == "networkidle":
+            self.page.goto(f"{self.base_url}/login")
+            self.page.wait_for_load_state("networkidle")
+            return
+        self.page.goto(f"{self.base_url}/login", wait_until="domcontentloaded")
+        self.selectors.locator("login_button").wait_for(state="visible")
     
     def enter_username(self, username: str) -> None:
         """
@@ -61,7 +154,8 @@ class LoginPage:
         Args:
             username: Username to enter
         """
-        username_field = self.page.locator(self.username_input).first
+        self.invalidate_snapshot()
+        username_field = self.selectors.locator("username")
         username_field.clear()
         username_field.fill(username)
     
@@ -72,13 +166,101 @@ class LoginPage:
         Args:
             password: Password to enter
         """
-        password_field = self.page.locator(self.password_input).first
+        self.invalidate_snapshot()
+        password_field = self.selectors.locator("password")
         password_field.clear()
         password_field.fill(password)
     
     def click_login_button(self) -> None:
         """Click the login button."""
-        self.page.locator(self.login_button).first.click()
+        self.invalidate_snapshot()
+        self.selectors.locator("login_button").click()
+    
+    def submit_login(self, timeout: int = 5000) -> None:
+        """
+        Click the login button and wait until the login result is known.
+        
+        Args:
+            timeout: Maximum time to wait for the outcome in milliseconds
+        """
+        self.last_auth_response = None
+        self.last_outcome = None
+        submit_start_ns = time.perf_counter_ns()
+        
+        if self.readiness == "networkidle":
+            self.click_login_button()
+            self.page.wait_for_load_state("networkidle", timeout=timeout)
+            self._record_timing(submit_start_ns, None, time.perf_counter_ns())
+            return
+        
+        # One wait covers every outcome, including forms rejected client-side without any request;
+        # the auth response is only observed on the way
+        watcher = AuthResponseWatcher(self.auth_path_pattern)
+        self.page.on("response", watcher)
+        try:
+            since = self.page.evaluate(MARK_ATTEMPT_SCRIPT, self.error_message)
+            self.click_login_button()
+            self.wait_for_login_outcome(timeout, since)
+        finally:
+            self.page.remove_listener("response", watcher)
+        self.last_auth_response = watcher.response
+        self._record_timing(submit_start_ns, watcher.response_ns, time.perf_counter_ns())
+    
+    def _record_timing(self, submit_start_ns: int, response_ns: Optional[int], end_ns: int) -> None:
+        """
+        Store the phase breakdown of the login that just completed.
+        
+        Args:
+            submit_start_ns: perf_counter_ns() when the Login button was clicked
+            response_ns: perf_counter_ns() when the auth response arrived, if observed
+            end_ns: perf_counter_ns() when the outcome was known
+        """
+        fill_ns, self._pending_fill_ns = self._pending_fill_ns, 0
+        response_ns = response_ns or end_ns
+        self.last_timing = LoginTiming(
+            label=self.timing_label,
+            outcome=self.last_outcome or "unknown",
+            fill_ms=fill_ns / 1e6,
+            submit_ms=(response_ns - submit_start_ns) / 1e6,
+            render_ms=(end_ns - response_ns) / 1e6,
+            total_ms=(fill_ns + end_ns - submit_start_ns) / 1e6,
+        )
+        if self.recorder is None:
+            return
+        self.last_timing.server_ms = self._server_time_ms()
+        self.last_timing.navigation = self.page.evaluate(NAVIGATION_TIMING_SCRIPT)
+        self.recorder.record(self.last_timing)
+    
+    def _server_time_ms(self) -> Optional[float]:
+        """Server processing time of the last auth request from the browser's Resource Timing."""
+        if self.last_auth_response is None:
+            return None
+        timing = self.last_auth_response.request.timing
+        if timing.get("requestStart", -1) < 0 or timing.get("responseStart", -1) < 0:
+            return None
+        return timing["responseStart"] - timing["requestStart"]
+    
+    def wait_for_login_outcome(self, timeout: int = 5000, since: Optional[float] = None) -> str:
+        """
+        Wait until the page shows an authenticated view (with the user menu) or an error message.
+        
+        Args:
+            timeout: Maximum time to wait in milliseconds
+            since: Click time from MARK_ATTEMPT_SCRIPT; errors shown before it count only once the auth request completed
+            
+        Returns:
+            'authenticated', 'error', 'invalid' (blocked by form validation), or 'unknown' if nothing appeared in time
+        """
+        try:
+            handle = self.page.wait_for_function(
+                LOGIN_OUTCOME_SCRIPT,
+                arg=outcome_arg(since, self.auth_path_pattern.pattern),
+                timeout=timeout,
+            )
+            self.last_outcome = handle.json_value()
+        except PlaywrightTimeoutError:
+            self.last_outcome = "unknown"
+        return self.last_outcome
     
     def get_error_message(self) -> str:
         """
@@ -87,13 +269,8 @@ class LoginPage:
         Returns:
             Error message text or empty string if not visible
         """
-        try:
-            error = self.page.locator(self.error_message).first
-            if error.is_visible():
-                return error.inner_text()
-        except Exception:
-            pass
-        return ""
+        error = self.snapshot().error
+        return error.text if error.visible else ""
     
     def is_logged_in(self) -> bool:
         """
@@ -102,10 +279,7 @@ class LoginPage:
         Returns:
             True if logged in, False otherwise
         """
-        try:
-            return self.page.locator(self.user_menu).first.is_visible(timeout=3000)
-        except Exception:
-            return False
+        return self.snapshot().user_menu.visible
     
     def is_on_login_page(self) -> bool:
         """
@@ -132,14 +306,25 @@ class LoginPage:
         Returns:
             True if both fields are empty, False otherwise
         """
-        username_value = self.page.locator(self.username_input).first.input_value()
-        password_value = self.page.locator(self.password_input).first.input_value()
-        return username_value == "" and password_value == ""
+        snapshot = self.snapshot()
+        return snapshot.username.value == "" and snapshot.password.value == ""
     
     def press_tab(self) -> None:
         """Press the Tab key on the currently focused element."""
+        self.invalidate_snapshot()
         self.page.keyboard.press("Tab")
     
+    def press_tab_from(self, key: str) -> None:
+        """
+        Focus a form element and press the Tab key.
+        
+        Args:
+            key: Selector name of the element to start from, e.g. 'username'
+        """
+        self.invalidate_snapshot()
+        self.selectors.locator(key).focus()
+        self.press_tab()
+    
     def get_focused_element_role(self) -> str:
         """
         Get information about the currently focused element.
@@ -147,8 +332,7 @@ class LoginPage:
         Returns:
             Description of focused element
         """
-        focused = self.page.evaluate("() => document.activeElement.id || document.activeElement.name || document.activeElement.type")
-        return str(focused)
+        return self.snapshot().focused
     
     def is_password_masked(self) -> bool:
         """
@@ -157,8 +341,7 @@ class LoginPage:
         Returns:
             True if password is masked, False otherwise
         """
-        password_field = self.page.locator(self.password_input).first
-        return password_field.get_attribute("type") == "password"
+        return self.snapshot().password.type == "password"
     
     def get_username_label(self) -> Optional[str]:
         """
@@ -167,11 +350,8 @@ class LoginPage:
         Returns:
             Label text or None if not found
         """
-        try:
-            label = self.page.locator("label[for='username'], label:has-text('Username')").first
-            return label.inner_text() if label.is_visible() else None
-        except Exception:
-            return None
+        label = self.snapshot().username_label
+        return label.text if label.visible else None
     
     def get_password_label(self) -> Optional[str]:
         """
@@ -180,11 +360,8 @@ class LoginPage:
         Returns:
             Label text or None if not found
         """
-        try:
-            label = self.page.locator("label[for='password'], label:has-text('Password')").first
-            return label.inner_text() if label.is_visible() else None
-        except Exception:
-            return None
+        label = self.snapshot().password_label
+        return label.text if label.visible else None
     
     def has_accessible_name(self, field_type: str) -> bool:
         """
@@ -196,24 +373,9 @@ class LoginPage:
         Returns:
             True if field has accessible name, False otherwise
         """
-        selector = self.username_input if field_type == "username" else self.password_input
-        field = self.page.locator(selector).first
-        
-        aria_label = field.get_attribute("aria-label")
-        aria_labelledby = field.get_attribute("aria-labelledby")
-        field_id = field.get_attribute("id")
-        
-        if aria_label or aria_labelledby:
-            return True
-        
-        if field_id:
-            try:
-                self.page.locator(f"label[for='{field_id}']").first.is_visible()
-                return True
-            except Exception:
-                pass
-        
-        return False
+        snapshot = self.snapshot()
+        field = snapshot.username if field_type == "username" else snapshot.password
+        return field.has_accessible_name
     
     def is_login_button_accessible(self) -> bool:
         """
@@ -222,11 +384,8 @@ class LoginPage:
         Returns:
             True if button has accessible name, False otherwise
         """
-        button = self.page.locator(self.login_button).first
-        text = button.inner_text().strip()
-        aria_label = button.get_attribute("aria-label")
-        
-        return bool(text or aria_label)
+        button = self.snapshot().login_button
+        return bool(button.text or button.aria_label)
     
     def is_error_visually_prominent(self) -> bool:
         """
@@ -235,11 +394,7 @@ class LoginPage:
         Returns:
             True if error is visible and prominent, False otherwise
         """
-        try:
-            error = self.page.locator(self.error_message).first
-            return error.is_visible()
-        except Exception:
-            return False
+        return self.snapshot().error.visible
     
     def error_contains_technical_details(self) -> bool:
         """
@@ -270,16 +425,8 @@ class LoginPage:
         Returns:
             True if all controls are ready, False otherwise
         """
-        try:
-            username = self.page.locator(self.username_input).first
-            password = self.page.locator(self.password_input).first
-            button = self.page.locator(self.login_button).first
-            
-            return (username.is_visible() and username.is_enabled() and
-                    password.is_visible() and password.is_enabled() and
-                    button.is_visible() and button.is_enabled())
-        except Exception:
-            return False
+        snapshot = self.snapshot()
+        return snapshot.username.usable and snapshot.password.usable and snapshot.login_button.usable
     
     def has_layout_issues(self) -> bool:
         """
@@ -332,16 +479,194 @@ class LoginPage:
         Returns:
             Response time in milliseconds
         """
-        start_time = time.time()
+        fill_start_ns = time.perf_counter_ns()
         self.enter_username(username)
         self.enter_password(password)
-        self.click_login_button()
-        self.page.wait_for_load_state("networkidle", timeout=5000)
-        end_time = time.time()
+        self._pending_fill_ns = time.perf_counter_ns() - fill_start_ns
+        self.submit_login(timeout=5000)
         
-        response_time = int((end_time - start_time) * 1000)
+        response_time = int(self.last_timing.total_ms)
         self._last_response_time = response_time
         return response_time
+    
+    def restore_storage_state(self, state: Dict[str, Any]) -> None:
+        """
+        Inject saved cookies and localStorage into the current browser context.
+        
+        Args:
+            state: Playwright storage state (BrowserContext.storage_state())
+        """
+        self.invalidate_snapshot()
+        self.page.context.add_cookies(state.get("cookies", []))
+        for origin in state.get("origins", []):
+            if not origin.get("localStorage"):
+                continue
+            self.page.goto(origin["origin"], wait_until="commit")
+            self.page.evaluate(
+                "(items) => items.forEach(({ name, value }) => localStorage.setItem(name, value))",
+                origin["localStorage"],
+            )
+    
+    def open_authenticated_page(self, path: str = "/home") -> bool:
+        """
+        Open a page that requires authentication and report whether access was granted.
+        
+        Args:
+            path: Path of a page only authenticated users can see
+            
+        Returns:
+            True if the page opened without a redirect to the login page
+        """
+        self.invalidate_snapshot()
+        self.page.goto(f"{self.base_url}{path}", wait_until="domcontentloaded")
+        try:
+            # An SPA renders the user menu (or redirects to the login form) after the document has loaded
+            state = self.page.wait_for_function(SESSION_STATE_SCRIPT, arg=outcome_arg(), timeout=5000).json_value()
+        except PlaywrightTimeoutError:
+            return False
+        return state == "authenticated" and not self.is_on_login_page()
+    
+    def login_with_session_cache(self, username: str, password: str, cache: Optional[SessionCache],
+                                 authenticated_path: str = "/home") -> bool:
+        """
+        Log in by reusing a cached session, falling back to the login form.
+        
+        A successful form login refreshes the cache for later scenarios.
+        
+        Args:
+            username: Username to use
+            password: Password to use
+            cache: Session cache, or None to always use the login form
+            authenticated_path: Path used to check that a restored session is valid
+            
+        Returns:
+            True if the user ended up logged in, False otherwise
+        """
+        state = cache.load(self.base_url, username) if cache else None
+        if state:
+            self.restore_storage_state(state)
+            if self.open_authenticated_page(authenticated_path):
+                return True
+            cache.invalidate(self.base_url, username)
+        
+        self.navigate()
+        self.perform_login(username, password)
+        if not self.is_logged_in():
+            return False
+        if cache:
+            cache.save(self.base_url, username, self.page.context.storage_state())
+        return True
+
+
+# Raised by ApiLoginPage for checks that need a rendered page
+NO_RENDERED_PAGE = ("This check needs the rendered login page, but the row runs on the API fast path. "
+                    "Remove @api_fast_path from its outline.")
+
+
+class ApiLoginPage(LoginPage):
+    """
+    LoginPage stand-in that submits the form's credentials to the login API.
+    
+    Used for @api_fast_path outline rows: the entered values are posted as
+    JSON (or taken from the result prefetched for the row) and the checks
+    answer from the API response. There is no rendered page, so every check
+    that needs one raises instead of passing unchecked; outlines with such
+    checks must not be tagged @api_fast_path.
+    """
+    
+    def __init__(self, client: LoginApiClient, base_url: str = "http://localhost:3000",
+                 prefetched: Optional[Prefetched] = None):
+        """
+        Initialize the API page.
+        
+        Args:
+            client: Pooled client for the login endpoint
+            base_url: Base URL of the application
+            prefetched: Result submitted ahead of this row, used if the entered values match
+        """
+        super().__init__(page=None, base_url=base_url)
+        self.client = client
+        self.prefetched = prefetched
+        self.username = ""
+        self.password = ""
+        self.result: Optional[ApiLoginResult] = None
+    
+    @property
+    def page(self) -> Page:
+        """There is no rendered page; see the class docstring."""
+        raise RuntimeError(NO_RENDERED_PAGE)
+    
+    @page.setter
+    def page(self, page: None) -> None:
+        """LoginPage.__init__ stores the page; there is none to store."""
+    
+    @property
+    def selectors(self) -> SelectorResolver:
+        """Nothing to resolve selectors in; see the class docstring."""
+        raise RuntimeError(NO_RENDERED_PAGE)
+    
+    @selectors.setter
+    def selectors(self, selectors: None) -> None:
+        """LoginPage.__init__ stores the resolver; there is none to store."""
+    
+    def invalidate_snapshot(self) -> None:
+        """Nothing is cached; the API result is final."""
+    
+    def navigate(self) -> None:
+        """Start from an empty form."""
+        self.username = self.password = ""
+        self.result = None
+    
+    def enter_username(self, username: str) -> None:
+        """Remember the username for the next submission."""
+        self.username = username
+    
+    def enter_password(self, password: str) -> None:
+        """Remember the password for the next submission."""
+        self.password = password
+    
+    def submit_login(self, timeout: int = 5000) -> None:
+        """
+        Submit the entered credentials through the login API.
+        
+        Args:
+            timeout: Unused; the client's socket timeout applies
+        """
+        prefetched = self.prefetched
+        if prefetched and (prefetched.username, prefetched.password) == (self.username, self.password):
+            self.result = prefetched.result
+        else:
+            self.result = self.client.login(self.username, self.password)
+        assert not self.result.error, f"Login API request failed: {self.result.error}"
+        self.last_outcome = "authenticated" if self.result.authenticated else "error"
+        fill_ns, self._pending_fill_ns = self._pending_fill_ns, 0
+        elapsed_ms = self.result.elapsed_ms
+        self.last_timing = LoginTiming(self.timing_label, self.last_outcome, fill_ns / 1e6, elapsed_ms, 0.0,
+                                       fill_ns / 1e6 + elapsed_ms)
+    
+    def click_login_button(self) -> None:
+        """Submit the entered credentials."""
+        self.submit_login()
+    
+    def get_error_message(self) -> str:
+        """Error message of a rejected login, or empty string."""
+        return self.result.message if self.result and not self.result.authenticated else ""
+    
+    def is_logged_in(self) -> bool:
+        """True if the API accepted the credentials."""
+        return bool(self.result and self.result.authenticated)
+    
+    def is_on_login_page(self) -> bool:
+        """A rejected login leaves the user on the login page."""
+        return not self.is_logged_in()
+    
+    def get_current_url(self) -> str:
+        """URL the browser would show after this login."""
+        return f"{self.base_url}{'/dashboard' if self.is_logged_in() else '/login'}"
+    
+    def has_server_error(self) -> bool:
+        """True if the API answered with a 5xx status."""
+        return bool(self.result and self.result.status >= 500)
 
 
 # ============================================================================
@@ -352,16 +677,29 @@ def get_login_page(context) -> LoginPage:
     """
     Get or create LoginPage instance from context.
     
+    Rows running on the API fast path get an ApiLoginPage instead.
+    
     Args:
         context: Behave context object
         
     Returns:
         LoginPage instance
     """
+    if not hasattr(context, 'login_page') and getattr(context, 'api_mode', False):
+        context.login_page = ApiLoginPage(context.login_api, context.base_url, context.api_prefetched)
     if not hasattr(context, 'login_page'):
         if not hasattr(context, 'page'):
             raise RuntimeError("Browser page not initialized. Check environment.py setup.")
-        context.login_page = LoginPage(context.page, context.base_url)
+        readiness = context.config.userdata.get("readiness", "event")
+        context.login_page = LoginPage(
+            context.page,
+            context.base_url,
+            readiness=readiness,
+            recorder=getattr(context, 'latency_recorder', None),
+            timing_label=context.scenario.name,
+            selector_stats=getattr(context, 'selector_stats', None),
+            healer=getattr(context, 'locator_healer', None),
+        )
     return context.login_page
 
 
@@ -370,6 +708,8 @@ def get_credential(context, token: str) -> str:
     Resolve credential tokens to actual values.
     
     Centralizes test data mapping to avoid hardcoding in feature files.
+    Account tokens (valid_user, valid_password, ...) resolve to the account
+    this scenario leased from the worker's credential pool.
     
     Args:
         context: Behave context object
@@ -378,42 +718,32 @@ def get_credential(context, token: str) -> str:
     Returns:
         Resolved credential value
     """
-    if not hasattr(context, 'credentials'):
-        context.credentials = {
-            'valid_user': 'testuser@example.com',
-            'valid_password': 'SecurePass123!',
-            'unknown_user': 'unknown@example.com',
-            'wrong_password': 'WrongPassword123',
-            'password_with_typo': 'SecurePass12',
-            'any_password': 'AnyPassword123',
-            'empty': '',
-            'minimal_length_user': 'ab',
-            'minimal_length_pass': 'p1',
-            'overlong_username': 'u' * 300,
-            'overlong_password': 'p' * 300,
-            'sql_injection_text': "' OR '1'='1",
-            'script_tag_text': '<script>alert("xss")</script>',
-            'user.with.dots': 'user.with.dots@example.com',
-            'user+alias': 'user+alias@example.com',
-        }
-    
-    return context.credentials.get(token, token)
+    return resolve_token(context, token)
 
 
 def perform_multiple_login_attempts(context, username: str, passwords: list) -> None:
     """
     Perform multiple login attempts with different passwords.
     
+    All but the last attempt are posted directly to the login endpoint; the
+    last one goes through the UI so the resulting lockout state is shown on
+    the page for the following steps.
+    
     Args:
         context: Behave context object
         username: Username to use
         passwords: List of passwords to try
     """
+    if not passwords:
+        return
     page = get_login_page(context)
-    for password in passwords:
-        page.navigate()
-        page.perform_login(username, password)
-        time.sleep(0.3)  # Brief pause between attempts
+    *direct_attempts, last_password = passwords
+    if direct_attempts:
+        auth_path = context.config.userdata.get("auth_path", "/login")
+        driver = LockoutDriver(page.page.context.request, f"{page.base_url}{auth_path}")
+        driver.fire_failed_attempts(username, direct_attempts)
+    page.navigate()
+    page.perform_login(username, last_password)
 
 
 # ============================================================================
@@ -488,6 +818,10 @@ def step_given_attempt_invalid_login(context):
 def step_given_repeated_failed_attempts(context, password_attempts):
     """Perform multiple failed login attempts."""
     username = get_credential(context, 'valid_user')
+    lease = lease_for(context)
+    if lease:
+        # A locked account must not be handed to the worker's next scenario before it is reset
+        lease.tainted = True
     passwords = [pwd.strip() for pwd in password_attempts.split(',')]
     perform_multiple_login_attempts(context, username, passwords)
 
@@ -500,10 +834,29 @@ def step_given_using_screen_reader(context):
     context.screen_reader_mode = True
 
 
+@given('I am logged in')
+def step_given_logged_in(context):
+    """Start authenticated as the default valid user without testing the login form."""
+    context.execute_steps('Given I am logged in as "valid_user" with "valid_password"')
+
+
+@given('I am logged in as "{user_token}" with "{password_token}"')
+def step_given_logged_in_as(context, user_token, password_token):
+    """Start authenticated, reusing a cached session for the account when available."""
+    page = get_login_page(context)
+    username = get_credential(context, user_token)
+    password = get_credential(context, password_token)
+    authenticated_path = context.config.userdata.get("authenticated_path", "/home")
+    logged_in = page.login_with_session_cache(
+        username, password, getattr(context, 'session_cache', None), authenticated_path
+    )
+    assert logged_in, f"Could not log in as '{user_token}'"
+
+
 @given('I open the login page in "{browser}"')
 def step_given_open_in_browser(context, browser):
     """Open login page in specified browser."""
-    # Browser switching would be handled in environment.py
+    # before_scenario skips rows pinned to a browser other than the one this process launched
     context.current_browser = browser
     page = get_login_page(context)
     page.navigate()
@@ -517,24 +870,21 @@ def step_given_open_in_browser(context, browser):
 def step_when_click_login(context):
     """Click the login button."""
     page = get_login_page(context)
-    page.click_login_button()
-    page.page.wait_for_load_state("networkidle", timeout=5000)
+    page.submit_login(timeout=5000)
 
 
 @when('I press the Tab key from the username field')
 def step_when_press_tab_from_username(context):
     """Press Tab key from username field."""
     page = get_login_page(context)
-    page.page.locator(page.username_input).first.focus()
-    page.press_tab()
+    page.press_tab_from("username")
 
 
 @when('I press the Tab key from the password field')
 def step_when_press_tab_from_password(context):
     """Press Tab key from password field."""
     page = get_login_page(context)
-    page.page.locator(page.password_input).first.focus()
-    page.press_tab()
+    page.press_tab_from("password")
 
 
 @when('I enter a password into the password field')
@@ -550,6 +900,7 @@ def step_when_error_displayed(context):
     """Wait for error message to be displayed."""
     page = get_login_page(context)
     page.page.wait_for_selector(page.error_message, state="visible", timeout=5000)
+    page.invalidate_snapshot()
 
 
 @when('I attempt to log in with valid credentials')
@@ -568,6 +919,15 @@ def step_when_navigate_to_login(context):
     page.navigate()
 
 
+@when('I reopen the authenticated home page')
+def step_when_reopen_home(context):
+    """Load the authenticated home page again in the same session."""
+    page = get_login_page(context)
+    authenticated_path = context.config.userdata.get("authenticated_path", "/home")
+    assert page.open_authenticated_page(authenticated_path), \
+        f"{authenticated_path} redirected to the login page; the session did not persist"
+
+
 @when('I exceed the configured number of failed attempts')
 def step_when_exceed_failed_attempts(context):
     """Continuation step - attempts already performed in Given step."""
@@ -867,8 +1227,7 @@ def step_then_lockout_policy_enforced(context):
 def step_then_username_visible_enabled(context):
     """Verify username field is visible and enabled."""
     page = get_login_page(context)
-    username = page.page.locator(page.username_input).first
-    assert username.is_visible() and username.is_enabled(), \
+    assert page.snapshot().username.usable, \
         "Username field should be visible and enabled"
 
 
@@ -876,8 +1235,7 @@ def step_then_username_visible_enabled(context):
 def step_then_password_visible_enabled(context):
     """Verify password field is visible and enabled."""
     page = get_login_page(context)
-    password = page.page.locator(page.password_input).first
-    assert password.is_visible() and password.is_enabled(), \
+    assert page.snapshot().password.usable, \
         "Password field should be visible and enabled"
 
 
@@ -885,8 +1243,7 @@ def step_then_password_visible_enabled(context):
 def step_then_login_button_visible_enabled(context):
     """Verify login button is visible and enabled."""
     page = get_login_page(context)
-    button = page.page.locator(page.login_button).first
-    assert button.is_visible() and button.is_enabled(), \
+    assert page.snapshot().login_button.usable, \
         "Login button should be visible and enabled"
 
 
@@ -897,3 +1254,50 @@ def step_then_layout_not_broken(context):
     browser = getattr(context, 'current_browser', 'unknown')
     assert not page.has_layout_issues(), \
         f"Layout should not be broken in {browser}"
+
+
+# ============================================================================
+# Async Browser Steps
+# ============================================================================
+
+@given('I am on the login page in the async browser')
+@async_step
+async def step_given_on_async_login_page(context):
+    """Navigate to the login page in a page of the async browser."""
+    page = await get_async_login_page(context)
+    await page.navigate()
+
+
+@when('I log in with valid credentials in the async browser')
+@async_step
+async def step_when_async_valid_login(context):
+    """Log in through the form of the async page."""
+    page = await get_async_login_page(context)
+    await page.enter_username(get_credential(context, 'valid_user'))
+    await page.enter_password(get_credential(context, 'valid_password'))
+    await page.submit_login()
+
+
+@when('{count:d} users log in with valid credentials concurrently in the async browser')
+def step_when_concurrent_async_logins(context, count):
+    """Run complete logins concurrently, each in its own page of the async browser."""
+    credentials = (get_credential(context, 'valid_user'), get_credential(context, 'valid_password'))
+    context.async_results = context.async_host.login_many([credentials] * count)
+
+
+@then('I should be successfully logged in in the async browser')
+@async_step
+async def step_then_async_logged_in(context):
+    """Verify the async page shows the authenticated view."""
+    page = await get_async_login_page(context)
+    assert await page.is_logged_in(), \
+        f"User should be logged in but is not (outcome: {page.last_outcome}, URL: {page.get_current_url()})"
+
+
+@then('every concurrent login should succeed')
+def step_then_all_async_logins_succeeded(context):
+    """Verify every login run by login_many reached the authenticated view."""
+    failed = [result for result in context.async_results if not result.authenticated]
+    assert not failed, \
+        f"{len(failed)} of {len(context.async_results)} concurrent logins failed: " \
+        f"{[result.error or result.message for result in failed]}"
@@ -0,0 +1,8 @@
+"""
+Support package for the login feature tests.
+
+Holds the runtime infrastructure shared by ``environment.py`` and the step
+modules (browser management, parallel execution, reporting). behave adds the
+``features`` directory to ``sys.path`` for the whole run, so these modules are
+imported as ``support.<module>``.
+"""
@@ -0,0 +1,266 @@
+"""
+API fast path for data-driven login outlines.
+
+Outlines tagged @api_fast_path check server-side validation row by row; a
+browser round trip per row adds seconds without exercising anything the
+server does not already decide. When -D api_fast_path=true, rows of those
+outlines run against the JSON login endpoint instead:
+
+    - LoginApiClient keeps a pool of keep-alive HTTP connections and posts
+      many logins concurrently
+    - when the first API row of an outline starts, ApiFastPath submits the
+      outline's remaining API rows in one concurrent batch; each row's
+      scenario then reads its prefetched result
+    - a deterministic sample of rows (always including the outline's first
+      row) still runs through the browser to verify the UI wiring
+
+With -D fast_path_backend=browser the rows are submitted through the login
+form instead, in concurrent pages of one async browser (AsyncBrowserHost in
+support/async_login_page.py offers the same login/login_many interface).
+
+Rows are matched to their credentials through the 'I enter "<token>" into
+the username/password field' steps; a row without both is left to the UI.
+Only outlines whose checks read the login result belong on the fast path:
+a check that needs the rendered form (layout, focus, labels) raises on an
+API row instead of passing unchecked.
+"""
+
+import hashlib
+import http.client
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from support.credential_pool import CredentialPool, Lease, needs_lease, resolve_with_lease
+
+
+logger = logging.getLogger(__name__)
+
+
+FAST_PATH_TAG = "api_fast_path"
+
+ENTER_STEP = re.compile(r'^I enter "(?P<token>.*)" into the (?P<field>username|password) field$')
+
+
+@dataclass
+class ApiLoginResult:
+    """Outcome of one login request."""
+
+    status: int
+    authenticated: bool
+    message: str
+    elapsed_ms: float
+    error: str = ""  # Transport failure; status is 0
+
+
+class LoginApiClient:
+    """
+    Posts JSON logins over a pool of keep-alive connections.
+    """
+
+    def __init__(self, base_url: str, api_path: str = "/api/login", max_connections: int = 200,
+                 timeout: float = 10.0):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: Base URL of the application
+            api_path: Path of the JSON login endpoint
+            max_connections: Connections (and therefore requests) in flight at most
+            timeout: Socket timeout in seconds
+        """
+        parsed = urlparse(base_url)
+        self.scheme = parsed.scheme or "http"
+        self.netloc = parsed.netloc
+        self.path = parsed.path.rstrip("/") + api_path
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.requests = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.netloc, timeout=self.timeout)
+
+    def login(self, username: str, password: str) -> ApiLoginResult:
+        """
+        Submit one login.
+
+        Args:
+            username: Username as typed into the form
+            password: Password as typed into the form
+
+        Returns:
+            Parsed result; transport failures are reported, not raised
+        """
+        body = json.dumps({"username": username, "password": password})
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+            start_ns = time.perf_counter_ns()
+            for attempt in range(2):
+                try:
+                    connection.request("POST", self.path, body=body, headers=headers)
+                    response = connection.getresponse()
+                    payload = response.read()
+                    break
+                except (http.client.HTTPException, OSError) as error:
+                    connection.close()
+                    if attempt:
+                        return ApiLoginResult(0, False, "", (time.perf_counter_ns() - start_ns) / 1e6,
+                                              error=f"{type(error).__name__}: {error}")
+                    # A pooled connection may have been closed by the server while idle
+                    connection = self._connect()
+            elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            if response.will_close:
+                connection.close()
+            else:
+                self._idle.put(connection)
+        self.requests += 1
+        try:
+            data = json.loads(payload or b"{}")
+        except ValueError:
+            data = {}
+        message = str(data.get("message") or data.get("error") or "") if isinstance(data, dict) else ""
+        authenticated = response.status == 200 and isinstance(data, dict) and bool(data.get("authenticated", True))
+        return ApiLoginResult(response.status, authenticated, "" if authenticated else message, elapsed_ms)
+
+    def login_many(self, credentials: Sequence[Tuple[str, str]]) -> List[ApiLoginResult]:
+        """
+        Submit many logins concurrently.
+
+        Args:
+            credentials: (username, password) pairs
+
+        Returns:
+            Results in input order
+        """
+        if not credentials:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_connections, len(credentials))) as executor:
+            return list(executor.map(lambda pair: self.login(*pair), credentials))
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def row_tokens(scenario) -> Optional[Dict[str, str]]:
+    """The username and password tokens a row enters, or None if it does not enter both."""
+    tokens = {}
+    for step in scenario.steps:
+        match = ENTER_STEP.match(step.name)
+        if match:
+            tokens[match.group("field")] = match.group("token")
+    return tokens if len(tokens) == 2 else None
+
+
+@dataclass
+class Prefetched:
+    """A row submitted ahead of its scenario."""
+
+    username: str
+    password: str
+    lease: Optional[Lease]
+    result: ApiLoginResult
+
+
+class ApiFastPath:
+    """
+    Decides which outline rows use the API and prefetches them in batches.
+    """
+
+    def __init__(self, client: LoginApiClient, ui_sample: float = 0.1):
+        """
+        Initialize the fast path.
+
+        Args:
+            client: LoginApiClient, or an AsyncBrowserHost to submit rows through browser pages
+            ui_sample: Fraction of rows still run through the browser
+        """
+        self.client = client
+        self.ui_sample = ui_sample
+        self.prefetched: Dict[int, Prefetched] = {}
+        self.api_rows = 0
+
+    def uses_api(self, scenario) -> bool:
+        """
+        Whether a scenario is an @api_fast_path outline row outside the UI sample.
+
+        Args:
+            scenario: behave Scenario
+
+        Returns:
+            True to run the row against the API
+        """
+        outline = getattr(scenario, "parent", None)
+        row = getattr(scenario, "_row", None)
+        if row is None or outline is None or FAST_PATH_TAG not in outline.tags:
+            return False
+        if row_tokens(scenario) is None:
+            return False
+        if outline.scenarios and outline.scenarios[0] is scenario:
+            return False  # Every outline keeps at least one row in the browser
+        digest = hashlib.sha256(f"{outline.filename}:{outline.line}:{row.id}".encode()).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32 >= self.ui_sample
+
+    def take(self, scenario, pool: Optional[CredentialPool]) -> Optional[Prefetched]:
+        """
+        Return the prefetched result of a row, prefetching the outline's remaining rows on a miss.
+
+        Args:
+            scenario: The API row about to run
+            pool: Credential pool to lease row accounts from (None: default account)
+
+        Returns:
+            Prefetched row, or None if the row must be submitted live
+        """
+        if id(scenario) not in self.prefetched:
+            self._prefetch(scenario, pool)
+        return self.prefetched.pop(id(scenario), None)
+
+    def discard(self, scenario, pool: Optional[CredentialPool]) -> None:
+        """Drop a prefetched row that will not run, returning its lease."""
+        record = self.prefetched.pop(id(scenario), None)
+        if record and record.lease and pool:
+            pool.release(record.lease)
+
+    def _prefetch(self, first, pool: Optional[CredentialPool]) -> None:
+        scenarios = first.parent.scenarios
+        batch = []
+        leasing = pool is not None and pool.mode == "scenario"
+        for scenario in scenarios[scenarios.index(first):]:
+            if scenario.should_skip or id(scenario) in self.prefetched or not self.uses_api(scenario):
+                continue
+            tokens = row_tokens(scenario)
+            lease = None
+            if any(needs_lease(token) for token in tokens.values()):
+                if not leasing:
+                    continue  # Rows sharing one account must not be submitted concurrently
+                try:
+                    lease = pool.lease(scenario.name)
+                except RuntimeError:
+                    leasing = False
+                    continue  # Left to be submitted live once an account is free
+            batch.append((scenario, lease, resolve_with_lease(tokens["username"], lease),
+                          resolve_with_lease(tokens["password"], lease)))
+        results = self.client.login_many([(username, password) for _, _, username, password in batch])
+        for (scenario, lease, username, password), result in zip(batch, results):
+            self.prefetched[id(scenario)] = Prefetched(username, password, lease, result)
+        logger.info("Prefetched %d row(s) of '%s' through %s", len(batch), first.parent.name,
+                    type(self.client).__name__)
@@ -0,0 +1,293 @@
+"""
+Content-addressed static asset cache for Playwright browser contexts.
+
+Scripts, stylesheets, fonts and images requested by the application are
+intercepted with BrowserContext.route(). A response is stored on disk under
+the SHA-256 of its body only if it cannot change under its URL: it is marked
+immutable, its URL carries a content hash (app.3f9a1c2e.js), or the server
+allows caching it for at least a day. Later requests for the same URL (in any
+scenario or parallel worker) are fulfilled from disk without touching the
+server until the server's max-age runs out, so a deploy is never tested with
+yesterday's app.js. Requests to configured analytics hosts are aborted.
+
+Bytes served from the cache are counted per main-frame navigation so the
+saving can be reported after the run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional
+
+from playwright.sync_api import BrowserContext, Error as PlaywrightError, Frame, Page, Route
+
+
+logger = logging.getLogger(__name__)
+
+
+CACHEABLE_RESOURCE_TYPES = ("script", "stylesheet", "font", "image")
+
+# Only URLs that look like static files are routed through Python at all
+STATIC_ASSET_URL = re.compile(r"\.(?:m?js|css|woff2?|ttf|otf|eot|png|jpe?g|gif|svg|webp|avif|ico)(?:[?#]|$)", re.I)
+
+DEFAULT_BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "segment.io",
+    "segment.com",
+    "hotjar.com",
+    "mixpanel.com",
+    "fullstory.com",
+    "newrelic.com",
+    "nr-data.net",
+)
+
+# A hex content hash in the file name, e.g. main.3f9a1c2e.js or chunk-8d1e0b7f42.css
+CONTENT_HASHED_URL = re.compile(r"[.\-_](?=[0-9a-f]*\d)[0-9a-f]{8,}\.[a-z0-9]+(?:[?#]|$)", re.I)
+
+# Response headers replayed from the cache; encodings and lengths refer to the
+# original transfer and are recomputed by Playwright
+STORED_HEADERS = ("content-type", "cache-control", "etag", "last-modified", "access-control-allow-origin")
+
+
+def freshness_lifetime(url: str, headers: Dict[str, str], min_max_age: int, max_age_cap: int) -> int:
+    """
+    Seconds a response may be replayed from the cache.
+
+    Args:
+        url: Request URL
+        headers: Response headers (lower-case names)
+        min_max_age: A plain max-age below this is too short to be worth caching across runs
+        max_age_cap: Upper bound for any lifetime
+
+    Returns:
+        Lifetime in seconds; 0 means the response must not be cached
+    """
+    directives = {}
+    for directive in headers.get("cache-control", "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name] = value.strip('"')
+    if directives.keys() & {"no-store", "no-cache", "private"}:
+        return 0
+    try:
+        max_age = int(directives["max-age"]) if "max-age" in directives else None
+    except ValueError:
+        max_age = None
+    if "immutable" in directives or CONTENT_HASHED_URL.search(url):
+        return min(max_age if max_age is not None else max_age_cap, max_age_cap)
+    if max_age is not None and max_age >= min_max_age:
+        return min(max_age, max_age_cap)
+    return 0
+
+
+@dataclass
+class NavigationStats:
+    """Asset traffic of one main-frame navigation."""
+
+    url: str
+    asset_requests: int = 0
+    cache_hits: int = 0
+    bytes_saved: int = 0
+    bytes_fetched: int = 0
+    blocked: int = 0
+
+
+class AssetCache:
+    """
+    Serves immutable static assets from an on-disk, content-addressed store.
+    """
+
+    def __init__(self, directory: str = os.path.join(".behave_cache", "assets"),
+                 blocked_hosts: Iterable[str] = DEFAULT_BLOCKED_HOSTS, min_max_age_seconds: int = 86400,
+                 max_age_seconds: int = 7 * 86400):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Root of the cache (objects/ holds bodies, urls/ the URL index)
+            blocked_hosts: Hosts (and their subdomains) whose requests are aborted
+            min_max_age_seconds: Server max-age a response without immutable or a hashed URL needs to be cached
+            max_age_seconds: Longest time any cached URL is replayed before it is fetched again
+        """
+        self.directory = directory
+        self.blocked_hosts = tuple(host.strip().lower() for host in blocked_hosts if host.strip())
+        self.min_max_age_seconds = min_max_age_seconds
+        self.max_age_seconds = max_age_seconds
+        self.navigations: List[NavigationStats] = []
+        self._current: Dict[int, NavigationStats] = {}
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "urls"), exist_ok=True)
+
+    # --- Installation ---
+
+    def install(self, browser_context: BrowserContext) -> None:
+        """
+        Route the context's static asset and analytics requests through the cache.
+
+        Args:
+            browser_context: Context to intercept; existing and future pages are tracked
+        """
+        browser_context.route(STATIC_ASSET_URL, self._handle_asset)
+        if self.blocked_hosts:
+            hosts = "|".join(re.escape(host) for host in self.blocked_hosts)
+            browser_context.route(re.compile(rf"^[a-z]+://([^/?#]*\.)?({hosts})(?::\d+)?(?:[/?#]|$)", re.I),
+                                  self._handle_blocked)
+        for page in browser_context.pages:
+            self._track(page)
+        browser_context.on("page", self._track)
+
+    def _track(self, page: Page) -> None:
+        page.on("framenavigated", lambda frame: self._on_navigation(page, frame))
+
+    def _on_navigation(self, page: Page, frame: Frame) -> None:
+        if frame == page.main_frame and frame.url.startswith("http"):
+            stats = NavigationStats(url=frame.url)
+            self.navigations.append(stats)
+            self._current[id(page)] = stats
+
+    def _stats_for(self, route: Route) -> Optional[NavigationStats]:
+        try:
+            return self._current.get(id(route.request.frame.page))
+        except PlaywrightError:
+            return None  # e.g. service worker requests have no frame
+
+    # --- Route handlers ---
+
+    def _handle_blocked(self, route: Route) -> None:
+        stats = self._stats_for(route)
+        if stats:
+            stats.blocked += 1
+        route.abort("blockedbyclient")
+
+    def _handle_asset(self, route: Route) -> None:
+        request = route.request
+        if request.method != "GET" or request.resource_type not in CACHEABLE_RESOURCE_TYPES:
+            route.fallback()
+            return
+        stats = self._stats_for(route)
+        if stats:
+            stats.asset_requests += 1
+
+        cached = self._lookup(request.url)
+        if cached is not None:
+            entry, body = cached
+            if stats:
+                stats.cache_hits += 1
+                stats.bytes_saved += len(body)
+            route.fulfill(status=200, headers=entry["headers"], body=body)
+            return
+
+        try:
+            response = route.fetch()
+        except PlaywrightError as error:
+            logger.debug(f"Asset fetch failed for {request.url}: {error}")
+            route.abort()
+            return
+        body = response.body()
+        if stats:
+            stats.bytes_fetched += len(body)
+        if response.status == 200:
+            lifetime = freshness_lifetime(request.url, response.headers, self.min_max_age_seconds,
+                                          self.max_age_seconds)
+            if lifetime > 0:
+                self._store(request.url, response.headers, body, lifetime)
+        route.fulfill(response=response, body=body)
+
+    # --- Storage ---
+
+    def _url_path(self, url: str) -> str:
+        return os.path.join(self.directory, "urls", hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest[2:])
+
+    def _lookup(self, url: str):
+        """Return (index entry, body) for a fresh cached URL, else None."""
+        try:
+            with open(self._url_path(url)) as entry_file:
+                entry = json.load(entry_file)
+            if time.time() >= entry["expires_at"]:
+                return None
+            with open(self._object_path(entry["sha256"]), "rb") as body_file:
+                return entry, body_file.read()
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store(self, url: str, headers: Dict[str, str], body: bytes, lifetime: int) -> None:
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            self._write_atomic(object_path, body)
+        entry = {
+            "url": url,
+            "sha256": digest,
+            "size": len(body),
+            "stored_at": time.time(),
+            "expires_at": time.time() + lifetime,
+            "headers": {name: value for name, value in headers.items() if name.lower() in STORED_HEADERS},
+        }
+        self._write_atomic(self._url_path(url), json.dumps(entry).encode())
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        # Workers may store the same asset concurrently; os.replace keeps every reader consistent
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+
+    # --- Reporting ---
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Totals over all navigations.
+
+        Returns:
+            navigations, asset_requests, cache_hits, bytes_saved, bytes_fetched, blocked
+        """
+        totals = {"navigations": len(self.navigations), "asset_requests": 0, "cache_hits": 0,
+                  "bytes_saved": 0, "bytes_fetched": 0, "blocked": 0}
+        for stats in self.navigations:
+            for key in ("asset_requests", "cache_hits", "bytes_saved", "bytes_fetched", "blocked"):
+                totals[key] += getattr(stats, key)
+        return totals
+
+    def write_report(self, path: str) -> None:
+        """
+        Write per-navigation statistics and totals as JSON.
+
+        Args:
+            path: Output file path
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as report_file:
+            json.dump({"summary": self.summary(),
+                       "navigations": [asdict(stats) for stats in self.navigations]}, report_file, indent=2)
+
+
+def merge_summaries(paths: Iterable[str]) -> Dict[str, int]:
+    """
+    Add up the summaries of several reports written by write_report().
+
+    Args:
+        paths: Report paths; missing files are skipped
+
+    Returns:
+        Combined totals (empty when no report exists)
+    """
+    totals: Dict[str, int] = {}
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path) as report_file:
+            for key, value in json.load(report_file)["summary"].items():
+                totals[key] = totals.get(key, 0) + value
+    return totals
@@ -0,0 +1,418 @@
+"""
+Async Playwright backend for the login page object.
+
+LoginPage (steps/login_steps.py) is built on playwright.sync_api: a process
+drives one page at a time and every locator call blocks the thread.
+AsyncLoginPage is the same page object on playwright.async_api. An
+AsyncBrowserHost runs one event loop on a background thread with one
+browser, and any number of AsyncLoginPages, each in its own browser context,
+are multiplexed over that loop.
+
+behave runs steps one after another on the main thread; the integration is:
+
+    - async_step: decorator for `async def` step functions; the coroutine runs
+      on the host's loop while the step waits for it, so the pages of many
+      scenarios share one loop and one browser process
+    - get_async_login_page(context): the async counterpart of get_login_page;
+      awaited in an async step, it opens the scenario's AsyncLoginPage on
+      first use, and close_async_login_page() closes it after the scenario
+    - AsyncBrowserHost.login_many(): many complete login flows driven
+      concurrently in separate pages of the one browser, e.g. every row of a
+      data-driven outline at once; it backs the ApiFastPath
+      (support/api_login.py) when fast_path_backend=browser
+
+The outcome of a login is detected with the same in-page scripts as
+LoginPage (support/login_form.py).
+"""
+
+import asyncio
+import functools
+import logging
+import re
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from playwright.async_api import Browser, Error as PlaywrightError, Page, Playwright, Response, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from support.api_login import ApiLoginResult
+from support.browsers import resolve_engine
+from support.login_form import (
+    AUTH_PATH_PATTERN,
+    LOGIN_OUTCOME_SCRIPT,
+    LOGIN_SELECTORS,
+    MARK_ATTEMPT_SCRIPT,
+    AuthResponseWatcher,
+    outcome_arg,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLoginPage:
+    """
+    Page Object for the login page on playwright.async_api.
+
+    Waits the way LoginPage does in 'event' readiness mode.
+    """
+
+    def __init__(self, page: Page, base_url: str = "http://localhost:3000",
+                 auth_path_pattern: str = AUTH_PATH_PATTERN):
+        """
+        Initialize the AsyncLoginPage.
+
+        Args:
+            page: Async Playwright page instance
+            base_url: Base URL of the application
+            auth_path_pattern: Regex matching the URL path of the authentication request
+        """
+        self.page = page
+        self.base_url = base_url
+        self.auth_path_pattern = re.compile(auth_path_pattern)
+        self.last_auth_response: Optional[Response] = None
+        self.last_outcome: Optional[str] = None
+
+    async def navigate(self) -> None:
+        """Navigate to the login page and wait until the form can be used."""
+        await self.page.goto(f"{self.base_url}/login", wait_until="domcontentloaded")
+        await self.page.locator(LOGIN_SELECTORS["login_button"]).first.wait_for(state="visible")
+
+    async def enter_username(self, username: str) -> None:
+        """
+        Enter username into the username field.
+
+        Args:
+            username: Username to enter
+        """
+        await self.page.locator(LOGIN_SELECTORS["username"]).first.fill(username)
+
+    async def enter_password(self, password: str) -> None:
+        """
+        Enter password into the password field.
+
+        Args:
+            password: Password to enter
+        """
+        await self.page.locator(LOGIN_SELECTORS["password"]).first.fill(password)
+
+    async def submit_login(self, timeout: int = 5000) -> str:
+        """
+        Click the login button and wait until the login result is known.
+
+        As in LoginPage, one wait covers every outcome, including forms
+        rejected client-side without any request; the auth response is only
+        observed on the way.
+
+        Args:
+            timeout: Maximum time to wait for the outcome in milliseconds
+
+        Returns:
+            'authenticated', 'error', 'invalid' (blocked by form validation), or 'unknown'
+        """
+        self.last_auth_response = None
+        self.last_outcome = None
+        watcher = AuthResponseWatcher(self.auth_path_pattern)
+        self.page.on("response", watcher)
+        try:
+            since = await self.page.evaluate(MARK_ATTEMPT_SCRIPT, LOGIN_SELECTORS["error"])
+            await self.page.locator(LOGIN_SELECTORS["login_button"]).first.click()
+            await self.wait_for_login_outcome(timeout, since)
+        finally:
+            self.page.remove_listener("response", watcher)
+        self.last_auth_response = watcher.response
+        return self.last_outcome
+
+    async def wait_for_login_outcome(self, timeout: int = 5000, since: Optional[float] = None) -> str:
+        """
+        Wait until the page shows an authenticated view (with the user menu) or an error message.
+
+        Args:
+            timeout: Maximum time to wait in milliseconds
+            since: Click time from MARK_ATTEMPT_SCRIPT; errors shown before it count only once the auth request completed
+
+        Returns:
+            'authenticated', 'error', 'invalid' (blocked by form validation), or 'unknown' if nothing appeared in time
+        """
+        try:
+            handle = await self.page.wait_for_function(
+                LOGIN_OUTCOME_SCRIPT,
+                arg=outcome_arg(since, self.auth_path_pattern.pattern),
+                timeout=timeout,
+            )
+            self.last_outcome = await handle.json_value()
+        except PlaywrightTimeoutError:
+            self.last_outcome = "unknown"
+        return self.last_outcome
+
+    async def get_error_message(self) -> str:
+        """
+        Get the error message text if displayed.
+
+        Returns:
+            Error message text or empty string if not visible
+        """
+        error = self.page.locator(LOGIN_SELECTORS["error"]).first
+        return (await error.inner_text()).strip() if await error.is_visible() else ""
+
+    async def is_logged_in(self) -> bool:
+        """
+        Check if user is successfully logged in.
+
+        Returns:
+            True if logged in, False otherwise
+        """
+        return await self.page.locator(LOGIN_SELECTORS["user_menu"]).first.is_visible()
+
+    def is_on_login_page(self) -> bool:
+        """
+        Check if currently on the login page.
+
+        Returns:
+            True if on login page, False otherwise
+        """
+        return "/login" in self.page.url
+
+    def get_current_url(self) -> str:
+        """
+        Get the current page URL.
+
+        Returns:
+            Current URL
+        """
+        return self.page.url
+
+    def has_server_error(self) -> bool:
+        """
+        Check whether the last login was answered with a 5xx status.
+
+        Returns:
+            True for a server error, False otherwise
+        """
+        return bool(self.last_auth_response and self.last_auth_response.status >= 500)
+
+    async def login(self, username: str, password: str, timeout: int = 5000) -> ApiLoginResult:
+        """
+        Run one complete login through the form.
+
+        Args:
+            username: Username to enter
+            password: Password to enter
+            timeout: Maximum time to wait for the outcome in milliseconds
+
+        Returns:
+            Result; status is 0 when the form was rejected without a request
+        """
+        await self.navigate()
+        await self.enter_username(username)
+        await self.enter_password(password)
+        start_ns = time.perf_counter_ns()
+        outcome = await self.submit_login(timeout)
+        elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        authenticated = outcome == "authenticated"
+        return ApiLoginResult(
+            status=self.last_auth_response.status if self.last_auth_response else 0,
+            authenticated=authenticated,
+            message="" if authenticated else await self.get_error_message(),
+            elapsed_ms=elapsed_ms,
+        )
+
+
+class AsyncBrowserHost:
+    """
+    One event loop on a background thread driving one browser for many pages.
+
+    login() and login_many() match LoginApiClient, so the host can back the
+    ApiFastPath with real browser pages.
+    """
+
+    def __init__(self, browser_name: str = "chromium", headless: bool = True,
+                 base_url: str = "http://localhost:3000", max_pages: int = 8):
+        """
+        Initialize the host; start() launches the browser, e.g. on first use.
+
+        Args:
+            browser_name: Browser name understood by resolve_engine()
+            headless: Whether to run the browser without a visible UI
+            base_url: Base URL of the application
+            max_pages: Pages (browser contexts) open at the same time at most
+        """
+        self.browser_name = browser_name
+        self.headless = headless
+        self.base_url = base_url
+        self.max_pages = max(1, max_pages)
+        self.loop = asyncio.new_event_loop()
+        self.requests = 0
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-browser-host", daemon=True)
+        self._playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def start(self) -> "AsyncBrowserHost":
+        """
+        Start the loop thread and launch the browser; later calls return at once.
+
+        Returns:
+            The host itself
+
+        Raises:
+            RuntimeError: If an earlier start failed to launch the browser
+        """
+        if self._thread.ident is not None:
+            if self.browser is None:
+                raise RuntimeError("The async browser failed to launch earlier in this run")
+            return self
+        self._thread.start()
+        try:
+            self.run(self._launch())
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    async def _launch(self) -> None:
+        self._slots = asyncio.Semaphore(self.max_pages)
+        self._playwright = await async_playwright().start()
+        engine, channel = resolve_engine(self.browser_name)
+        browser_type = getattr(self._playwright, engine)
+        if channel:
+            self.browser = await browser_type.launch(headless=self.headless, channel=channel)
+        else:
+            self.browser = await browser_type.launch(headless=self.headless)
+
+    def run(self, coroutine, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the host's loop and wait for its result.
+
+        Args:
+            coroutine: Coroutine to run
+            timeout: Seconds to wait at most (None: no limit)
+
+        Returns:
+            The coroutine's result; its exception is re-raised here
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    async def new_page(self) -> AsyncLoginPage:
+        """
+        Open a login page in a fresh browser context.
+
+        Returns:
+            AsyncLoginPage; close its page.context when done
+        """
+        browser_context = await self.browser.new_context()
+        return AsyncLoginPage(await browser_context.new_page(), self.base_url)
+
+    async def _login(self, username: str, password: str) -> ApiLoginResult:
+        async with self._slots:
+            start_ns = time.perf_counter_ns()
+            login_page = None
+            try:
+                login_page = await self.new_page()
+                return await login_page.login(username, password)
+            except PlaywrightError as error:
+                return ApiLoginResult(0, False, "", (time.perf_counter_ns() - start_ns) / 1e6,
+                                      error=f"{type(error).__name__}: {error}")
+            finally:
+                self.requests += 1
+                if login_page:
+                    await login_page.page.context.close()
+
+    def login(self, username: str, password: str) -> ApiLoginResult:
+        """
+        Run one login in a fresh page.
+
+        Args:
+            username: Username to enter
+            password: Password to enter
+
+        Returns:
+            Result; browser failures are reported, not raised
+        """
+        return self.run(self._login(username, password))
+
+    def login_many(self, credentials: Sequence[Tuple[str, str]]) -> List[ApiLoginResult]:
+        """
+        Run many logins concurrently, each in its own page, max_pages at a time.
+
+        Args:
+            credentials: (username, password) pairs
+
+        Returns:
+            Results in input order
+        """
+        async def login_all() -> List[ApiLoginResult]:
+            return list(await asyncio.gather(*(self._login(username, password) for username, password in credentials)))
+        return self.run(login_all()) if credentials else []
+
+    def close(self) -> None:
+        """Close the browser, stop Playwright and the loop thread; safe to call twice."""
+        if self.loop.is_closed():
+            return
+        if self._thread.is_alive():
+            try:
+                self.run(self._shutdown(), timeout=30)
+            except Exception as error:
+                logger.warning(f"Async browser host did not shut down cleanly: {error}")
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+        self.loop.close()
+
+    async def _shutdown(self) -> None:
+        if self.browser:
+            await self.browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+
+def async_step(func):
+    """
+    Let an `async def` step function run on the scenario's AsyncBrowserHost.
+
+    Place it below the behave decorator:
+
+        @when('I log in with valid credentials in the async browser')
+        @async_step
+        async def step_impl(context): ...
+
+    Args:
+        func: Coroutine function taking the behave context first
+
+    Returns:
+        Synchronous step function for behave
+    """
+    @functools.wraps(func)
+    def run_step(context, *args, **kwargs):
+        return context.async_host.run(func(context, *args, **kwargs))
+    return run_step
+
+
+async def get_async_login_page(context) -> AsyncLoginPage:
+    """
+    Get or create the scenario's AsyncLoginPage.
+
+    Runs on the host's loop, so await it from an async_step function.
+
+    Args:
+        context: Behave context with an async_host
+
+    Returns:
+        AsyncLoginPage instance
+    """
+    if getattr(context, "async_login_page", None) is None:
+        context.async_login_page = await context.async_host.new_page()
+    return context.async_login_page
+
+
+def close_async_login_page(context) -> None:
+    """
+    Close the scenario's AsyncLoginPage, if one was opened.
+
+    Args:
+        context: Behave context object
+    """
+    login_page = getattr(context, "async_login_page", None)
+    if login_page is not None:
+        context.async_host.run(login_page.page.context.close())
+        context.async_login_page = None
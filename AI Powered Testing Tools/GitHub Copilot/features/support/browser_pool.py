@@ -0,0 +1,221 @@
+"""
+Pool of pre-warmed Playwright browser contexts.
+
+One browser is launched per behave process; scenarios borrow an isolated
+BrowserContext/Page pair from this pool instead of paying context and page
+startup each time. Contexts are reset when returned and retired after a fixed
+number of uses so memory stays bounded on long runs.
+
+A reset gives the context a new page, so listeners, routes and init scripts
+added to the old page go with it, and clears cookies and the storage
+(localStorage, IndexedDB, Cache Storage, service workers) of every origin the
+context visited. A context that had init scripts, routes, bindings or
+listeners added to it during the scenario cannot be reset and is retired.
+"""
+
+import functools
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional, Set
+from urllib.parse import urlparse
+
+from playwright.sync_api import Browser, BrowserContext, Frame, Page, Route
+
+
+logger = logging.getLogger(__name__)
+
+# BrowserContext methods whose effect outlives the scenario that called them
+STICKY_CONTEXT_METHODS = (
+    "add_init_script", "expose_binding", "expose_function", "route", "route_from_har", "route_web_socket",
+    "on", "once", "set_extra_http_headers", "set_geolocation", "set_offline",
+)
+
+# Clears the storage of the document's origin; sessionStorage goes with the page
+CLEAR_ORIGIN_STORAGE_SCRIPT = """
+async () => {
+    try { localStorage.clear(); } catch (e) {}
+    try {
+        for (const db of await indexedDB.databases()) {
+            await new Promise((done) => {
+                const request = indexedDB.deleteDatabase(db.name);
+                request.onsuccess = request.onerror = request.onblocked = done;
+            });
+        }
+    } catch (e) {}
+    try { for (const key of await caches.keys()) await caches.delete(key); } catch (e) {}
+    try {
+        for (const registration of await navigator.serviceWorker.getRegistrations()) await registration.unregister();
+    } catch (e) {}
+}
+"""
+
+
+@dataclass
+class PooledSession:
+    """A BrowserContext with its single working Page."""
+
+    browser_context: BrowserContext
+    page: Page
+    uses: int = 0
+    # Origins (scheme://host:port) the context's frames navigated to since the last reset
+    origins: Set[str] = field(default_factory=set)
+    # Name of the first sticky BrowserContext method called during a scenario
+    sticky: Optional[str] = None
+
+
+class ContextPool:
+    """
+    Hands out pre-warmed BrowserContext/Page pairs and recycles them.
+    """
+
+    def __init__(self, browser: Browser, size: int = 2, max_uses: int = 50,
+                 context_options: Optional[Dict[str, Any]] = None,
+                 on_create: Optional[Callable[[BrowserContext], None]] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            browser: Browser that owns every pooled context
+            size: Maximum number of idle contexts kept warm
+            max_uses: Scenarios served by one context before it is replaced
+            context_options: Keyword arguments for Browser.new_context()
+            on_create: Called with every new context, e.g. to install request routes
+        """
+        self.browser = browser
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.context_options = context_options or {}
+        self.on_create = on_create
+        self._idle: Deque[PooledSession] = deque()
+        self.created = 0
+        self.retired = 0
+
+    def prewarm(self) -> None:
+        """Fill the pool up to its idle capacity."""
+        while len(self._idle) < self.size:
+            self._idle.append(self._create())
+
+    def acquire(self) -> PooledSession:
+        """
+        Borrow a context/page pair, creating one if the pool is empty.
+
+        Returns:
+            Pooled session ready for a scenario
+        """
+        session = self._idle.popleft() if self._idle else self._create()
+        session.uses += 1
+        return session
+
+    def release(self, session: PooledSession, discard: bool = False) -> None:
+        """
+        Return a session to the pool.
+
+        The session is reset to a clean state; it is closed instead when it is
+        worn out, the reset fails, the pool is full, discard is requested or the
+        scenario changed the context in a way a reset cannot undo.
+
+        Args:
+            session: Session previously returned by acquire()
+            discard: Close the session rather than recycling it
+        """
+        if discard or session.uses >= self.max_uses or len(self._idle) >= self.size:
+            self._retire(session)
+            return
+        if session.sticky:
+            logger.info(f"Retiring browser context: BrowserContext.{session.sticky}() was called during the scenario")
+            self._retire(session)
+            return
+        try:
+            self._reset(session)
+        except Exception as error:
+            logger.warning(f"Discarding browser context that failed to reset: {error}")
+            self._retire(session)
+            return
+        self._idle.append(session)
+
+    def close(self) -> None:
+        """Close every idle context."""
+        while self._idle:
+            self._retire(self._idle.popleft())
+
+    def _create(self) -> PooledSession:
+        """Open a new context with one page."""
+        browser_context = self.browser.new_context(**self.context_options)
+        if self.on_create:
+            self.on_create(browser_context)
+        self.created += 1
+        session = PooledSession(browser_context=browser_context, page=None)
+        browser_context.on("page", lambda page: page.on("framenavigated", functools.partial(_record_origin, session)))
+        # Wrapped only now, so the setup of on_create and the pool itself does not count
+        for name in STICKY_CONTEXT_METHODS:
+            method = getattr(browser_context, name, None)
+            if method is not None:
+                setattr(browser_context, name, _flag_sticky(session, name, method))
+        session.page = browser_context.new_page()
+        return session
+
+    def _reset(self, session: PooledSession) -> None:
+        """Replace the page, and clear cookies, storage of every visited origin and permissions."""
+        browser_context = session.browser_context
+        session.page = browser_context.new_page()
+        for old_page in browser_context.pages:
+            if old_page != session.page:
+                old_page.close()
+        if session.origins:
+            if self.browser.browser_type.name == "chromium":
+                self._clear_origins_cdp(session)
+            else:
+                self._clear_origins_in_page(session)
+        browser_context.clear_cookies()
+        browser_context.clear_permissions()
+        session.origins.clear()
+
+    @staticmethod
+    def _clear_origins_cdp(session: PooledSession) -> None:
+        """Clear every visited origin with the DevTools protocol (Chromium only)."""
+        cdp = session.browser_context.new_cdp_session(session.page)
+        try:
+            for origin in sorted(session.origins):
+                cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        finally:
+            cdp.detach()
+
+    @staticmethod
+    def _clear_origins_in_page(session: PooledSession) -> None:
+        """Clear every visited origin from a blank document of that origin; nothing reaches the server."""
+        page = session.page
+
+        def blank_document(route: Route) -> None:
+            route.fulfill(status=200, content_type="text/html", body="")
+
+        page.route("**/*", blank_document)
+        try:
+            for origin in sorted(session.origins):
+                page.goto(f"{origin}/", wait_until="commit")
+                page.evaluate(CLEAR_ORIGIN_STORAGE_SCRIPT)
+        finally:
+            page.unroute("**/*", blank_document)
+        page.goto("about:blank")
+
+    def _retire(self, session: PooledSession) -> None:
+        """Close a session for good."""
+        self.retired += 1
+        try:
+            session.browser_context.close()
+        except Exception as error:
+            logger.warning(f"Failed to close browser context: {error}")
+
+
+def _record_origin(session: PooledSession, frame: Frame) -> None:
+    parts = urlparse(frame.url)
+    if parts.scheme in ("http", "https") and parts.netloc:
+        session.origins.add(f"{parts.scheme}://{parts.netloc}")
+
+
+def _flag_sticky(session: PooledSession, name: str, method: Callable) -> Callable:
+    @functools.wraps(method)
+    def call(*args, **kwargs):
+        session.sticky = session.sticky or name
+        return method(*args, **kwargs)
+    return call
@@ -0,0 +1,106 @@
+"""
+Playwright browser launch helpers.
+
+Maps the browser names used in behave userdata and in feature files to
+Playwright engines so every process (a single behave run or one parallel
+worker) launches its own browser the same way.
+
+Scenarios that open the login page in a named browser are pinned to that
+browser: the parallel runner gives each pinned browser a dedicated worker, and
+its other workers skip them. A serial run launches each pinned browser on
+first use, or runs the rows in its own browser if that one is not installed.
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+from playwright.sync_api import Browser, Playwright
+
+
+# Browser name -> (Playwright engine, optional distribution channel)
+BROWSER_ENGINES: Dict[str, Tuple[str, Optional[str]]] = {
+    "chromium": ("chromium", None),
+    "chrome": ("chromium", "chrome"),
+    "edge": ("chromium", "msedge"),
+    "msedge": ("chromium", "msedge"),
+    "firefox": ("firefox", None),
+    "webkit": ("webkit", None),
+}
+
+# Step that pins a scenario (typically a compatibility Examples row) to one browser
+BROWSER_STEP = re.compile(r'^I open the login page in "(?P<browser>[^"]+)"$')
+
+
+def resolve_engine(name: str) -> Tuple[str, Optional[str]]:
+    """
+    Resolve a browser name to a Playwright engine and channel.
+
+    Args:
+        name: Browser name, case-insensitive (e.g. 'chromium', 'firefox')
+
+    Returns:
+        Tuple of (engine name, channel or None)
+
+    Raises:
+        ValueError: If the browser name is not supported
+    """
+    key = name.strip().lower()
+    if key not in BROWSER_ENGINES:
+        supported = ", ".join(sorted(BROWSER_ENGINES))
+        raise ValueError(f"Unsupported browser '{name}'. Supported browsers: {supported}")
+    return BROWSER_ENGINES[key]
+
+
+def pinned_browser(scenario) -> Optional[str]:
+    """
+    Browser a scenario must run in, taken from its 'I open the login page in "<browser>"' step.
+
+    Args:
+        scenario: behave Scenario (outline rows carry their Examples values)
+
+    Returns:
+        Lower-case browser name, or None if the scenario runs in any browser
+
+    Raises:
+        ValueError: If the step names an unsupported browser
+    """
+    for step in scenario.steps:
+        match = BROWSER_STEP.match(step.name)
+        if match:
+            name = match.group("browser").strip().lower()
+            resolve_engine(name)
+            return name
+    return None
+
+
+def same_browser(first: str, second: str) -> bool:
+    """
+    Whether two browser names launch the same engine and channel (e.g. 'edge' and 'msedge').
+
+    Args:
+        first: Browser name
+        second: Browser name
+
+    Returns:
+        True if both names resolve identically
+    """
+    return resolve_engine(first) == resolve_engine(second)
+
+
+def launch_browser(playwright: Playwright, name: str = "chromium", headless: bool = True) -> Browser:
+    """
+    Launch a Playwright browser by name.
+
+    Args:
+        playwright: Started Playwright instance
+        name: Browser name understood by resolve_engine()
+        headless: Whether to run the browser without a visible UI
+
+    Returns:
+        Launched Browser instance
+    """
+    engine, channel = resolve_engine(name)
+    browser_type = getattr(playwright, engine)
+    if channel:
+        return browser_type.launch(headless=headless, channel=channel)
+    return browser_type.launch(headless=headless)
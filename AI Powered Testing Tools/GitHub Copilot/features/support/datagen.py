@@ -0,0 +1,383 @@
+"""
+Seeded synthetic test data for Scenario Outlines.
+
+Field rules describe what the application accepts for an input (length
+bounds, forbidden characters, trimming). From them an endless, deterministic
+stream of cases is generated per category:
+
+    boundary   - lengths around and far beyond the bounds, including empty
+    unicode    - accented, non-Latin, right-to-left, emoji, combining and
+                 zero-width characters at valid lengths
+    whitespace - leading, trailing and inner spaces, tabs and non-breaking
+                 spaces around valid values, and whitespace-only values
+    injection  - SQL, script, template, LDAP, command and path payloads,
+                 randomly mutated
+
+Each case knows whether the field rule accepts it, so a profile can turn it
+into an Examples row with the expected outcome. An outline tagged
+``@datagen:<profile>`` runs its hand-written rows and then the generated
+rows, which are appended to the running outline one scenario at a time
+(see OutlineStream): no feature file is written and no batch is kept in
+memory beyond the scenarios behave has already run.
+"""
+
+import itertools
+import random
+import string
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from behave.model import Examples, Row, Scenario, ScenarioOutline, ScenarioOutlineBuilder
+
+
+CATEGORIES = ("boundary", "unicode", "whitespace", "injection")
+
+TAG_PREFIX = "datagen:"
+
+UNICODE_SAMPLES = (
+    "éèüñçøåßœ",                           # Latin with diacritics
+    "ΩΔλжЯщ",                              # Greek and Cyrillic
+    "漢字テスト한국어",                        # CJK
+    "مرحباשלום",                            # Right-to-left
+    "\U0001F600\U0001F510\U0001F680\u200d",   # Emoji and a zero-width joiner
+    "e\u0301a\u0308",                       # Combining marks
+    "\u200b\u200c\ufeff",                   # Zero-width characters
+    "ＡＢＣ１２３",                            # Fullwidth forms
+)
+
+WHITESPACE = (" ", "  ", "\t", "\u00a0", "\u3000")
+
+INJECTION_PAYLOADS = (
+    "' OR '1'='1",
+    "' OR 1=1--",
+    "admin'--",
+    "\" OR \"\"=\"",
+    "'; DROP TABLE users;--",
+    "1' UNION SELECT username, password FROM users--",
+    "<script>alert(1)</script>",
+    "<img src=x onerror=alert(1)>",
+    "\"><svg/onload=alert(1)>",
+    "javascript:alert(1)",
+    "{{7*7}}",
+    "${7*7}",
+    "<%= 7*7 %>",
+    "*)(uid=*))(|(uid=*",
+    "; cat /etc/passwd",
+    "$(whoami)",
+    "../../../../etc/passwd",
+    "%00",
+    "%s%s%s%n",
+)
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """What the application accepts for one input field."""
+
+    name: str
+    min_length: int
+    max_length: int
+    alphabet: str = string.ascii_letters + string.digits
+    forbidden: str = ""
+    trimmed: bool = True
+
+    def accepts(self, value: str) -> bool:
+        """
+        Check a value against the rule.
+
+        Args:
+            value: Raw field input
+
+        Returns:
+            True if the application should accept the value's format
+        """
+        core = value.strip() if self.trimmed else value
+        return self.min_length <= len(core) <= self.max_length and not any(c in self.forbidden for c in core)
+
+
+@dataclass(frozen=True)
+class Case:
+    """One generated input for one field."""
+
+    field: str
+    category: str
+    value: str
+    valid: bool
+
+
+@dataclass(frozen=True)
+class Profile:
+    """
+    How generated cases become Examples rows.
+
+    columns maps each Examples heading to a template over {username},
+    {password} (any field name), {expected} and {category}. The field a case
+    was generated for takes the case value; the others take their default.
+    """
+
+    fields: Tuple[FieldRule, ...]
+    categories: Tuple[str, ...]
+    columns: Dict[str, str]
+    defaults: Dict[str, str]
+    expected: Tuple[str, str] = ("accepted", "rejected")
+    empty_token: str = "empty"  # Step parameters cannot be empty
+
+
+# Mirrors the mock application's LoginPolicy defaults
+USERNAME = FieldRule("username", 4, 50, alphabet=string.ascii_lowercase + string.digits + "._-@",
+                     forbidden="$!#%^&*~`|\\{}")
+PASSWORD = FieldRule("password", 8, 128, alphabet=string.ascii_letters + string.digits + "!#%&*-_")
+
+PROFILES = {
+    "length_boundaries": Profile(
+        fields=(USERNAME, PASSWORD),
+        categories=("boundary", "whitespace", "unicode"),
+        columns={"username": "{username}", "password": "{password}", "expected_result": "{expected}"},
+        defaults={"username": "valid_user", "password": "valid_password"},
+        expected=("successful_or_policy_correct", "rejected_with_clear_message"),
+    ),
+    "injection": Profile(
+        fields=(USERNAME, PASSWORD),
+        categories=("injection",),
+        columns={"username_input": "{username}", "password_input": "{password}"},
+        defaults={"username": "unknown_user", "password": "any_password"},
+    ),
+}
+
+
+# ============================================================================
+# Case generators
+# ============================================================================
+
+def _text(rule: FieldRule, length: int, rng: random.Random) -> str:
+    return "".join(rng.choice(rule.alphabet) for _ in range(length))
+
+
+def _boundary_cases(rule: FieldRule, rng: random.Random) -> Iterator[str]:
+    lengths = [0, rule.min_length - 1, rule.min_length, rule.min_length + 1,
+               rule.max_length - 1, rule.max_length, rule.max_length + 1, rule.max_length * 2, 300]
+    for length in dict.fromkeys(length for length in lengths if length >= 0):
+        yield _text(rule, length, rng)
+    while True:
+        yield _text(rule, rng.randint(0, rule.max_length + 10), rng)
+
+
+def _unicode_cases(rule: FieldRule, rng: random.Random) -> Iterator[str]:
+    while True:
+        length = rng.randint(rule.min_length, rule.max_length)
+        sample = rng.choice(UNICODE_SAMPLES)
+        chars = [rng.choice(sample) if rng.random() < 0.5 else rng.choice(rule.alphabet) for _ in range(length)]
+        yield "".join(chars)
+
+
+def _whitespace_cases(rule: FieldRule, rng: random.Random) -> Iterator[str]:
+    while True:
+        core = _text(rule, rng.randint(rule.min_length, rule.max_length), rng)
+        shape = rng.choice(("leading", "trailing", "both", "inner", "only"))
+        pad = rng.choice(WHITESPACE)
+        if shape == "leading":
+            yield pad + core
+        elif shape == "trailing":
+            yield core + pad
+        elif shape == "both":
+            yield pad + core + rng.choice(WHITESPACE)
+        elif shape == "inner":
+            cut = rng.randint(1, max(1, len(core) - 1))
+            yield core[:cut] + pad + core[cut:]
+        else:
+            yield pad * rng.randint(1, 4)
+
+
+def _injection_cases(rule: FieldRule, rng: random.Random) -> Iterator[str]:
+    yield from INJECTION_PAYLOADS
+    while True:
+        payload = rng.choice(INJECTION_PAYLOADS)
+        mutation = rng.choice(("case", "prefix", "encode", "repeat"))
+        if mutation == "case":
+            payload = "".join(c.upper() if rng.random() < 0.5 else c.lower() for c in payload)
+        elif mutation == "prefix":
+            payload = _text(rule, rng.randint(1, 8), rng) + payload
+        elif mutation == "encode":
+            payload = urllib.parse.quote(payload, safe="")
+        else:
+            payload = payload * rng.randint(2, 5)
+        yield payload
+
+
+GENERATORS = {
+    "boundary": _boundary_cases,
+    "unicode": _unicode_cases,
+    "whitespace": _whitespace_cases,
+    "injection": _injection_cases,
+}
+
+
+def generate_cases(fields: Sequence[FieldRule], categories: Sequence[str], seed: int = 0) -> Iterator[Case]:
+    """
+    Endless stream of distinct cases, alternating over fields and categories.
+
+    The same seed always yields the same sequence.
+
+    Args:
+        fields: Field rules to generate inputs for
+        categories: Names from CATEGORIES
+        seed: Random seed
+
+    Returns:
+        Generator of cases
+    """
+    unknown = [category for category in categories if category not in GENERATORS]
+    if unknown:
+        raise ValueError(f"Unknown data categories {unknown}. Supported: {', '.join(CATEGORIES)}")
+    streams = []
+    for rule in fields:
+        for category in categories:
+            rng = random.Random(f"{seed}:{rule.name}:{category}")
+            streams.append((rule, category, GENERATORS[category](rule, rng)))
+    seen = set()
+    for rule, category, values in itertools.cycle(streams):
+        value = next(values)
+        # Random categories repeat themselves eventually; bounded retries keep the stream moving
+        for _ in range(20):
+            if (rule.name, value) not in seen:
+                break
+            value = next(values)
+        seen.add((rule.name, value))
+        yield Case(rule.name, category, value, rule.accepts(value))
+
+
+def generate_rows(profile: Profile, headings: Sequence[str], seed: int = 0) -> Iterator[Tuple[Case, List[str]]]:
+    """
+    Endless stream of Examples rows for a profile.
+
+    Args:
+        profile: Profile describing fields, categories and columns
+        headings: Headings of the outline's Examples table
+        seed: Random seed
+
+    Returns:
+        Generator of (case, cells) pairs
+    """
+    missing = [heading for heading in headings if heading not in profile.columns]
+    if missing:
+        raise ValueError(f"Profile has no column template for {missing}")
+    for case in generate_cases(profile.fields, profile.categories, seed):
+        values = dict(profile.defaults)
+        values[case.field] = case.value or profile.empty_token
+        values["expected"] = profile.expected[0 if case.valid else 1]
+        values["category"] = case.category
+        yield case, [profile.columns[heading].format_map(values) for heading in headings]
+
+
+# ============================================================================
+# Scenario Outline streaming
+# ============================================================================
+
+def datagen_profile(outline: ScenarioOutline) -> Optional[str]:
+    """Profile name from an outline's @datagen:<profile> tag, if any."""
+    for tag in outline.tags:
+        if tag.startswith(TAG_PREFIX):
+            return tag[len(TAG_PREFIX):]
+    return None
+
+
+@dataclass
+class OutlineStream:
+    """
+    Appends generated rows to a running Scenario Outline, one at a time.
+
+    behave runs an outline by iterating its list of scenarios, so a scenario
+    appended while the last one runs is picked up next. Each generated row is
+    owned by one hand-written row (row k by hand-written row k % n); a worker
+    of run_parallel.py only runs the generated rows whose owner it was
+    assigned, so the batch is split across workers without overlap.
+    """
+
+    outline: ScenarioOutline
+    rows: Iterator[Tuple[Case, List[str]]]
+    limit: int
+    headings: List[str]
+    owners: List[Scenario] = field(default_factory=list)
+    generated: int = 0
+    appended: int = 0
+
+    def _owner_line(self, index: int) -> Optional[int]:
+        if not self.owners:
+            return self.outline.line
+        owner = self.owners[index % len(self.owners)]
+        return None if owner.should_skip else owner.line
+
+    def append_next(self) -> bool:
+        """
+        Build the next generated scenario this worker owns and add it to the outline.
+
+        Returns:
+            False when the stream is exhausted
+        """
+        while self.generated < self.limit:
+            index = self.generated
+            case, cells = next(self.rows)
+            self.generated += 1
+            line = self._owner_line(index)
+            if line is None:
+                continue
+            self._append(index, case, cells, line)
+            return True
+        return False
+
+    def _append(self, index: int, case: Case, cells: List[str], line: int) -> None:
+        example = Examples(self.outline.filename, line, "Examples", f"generated {case.field}/{case.category}")
+        example.index = len(self.outline.examples) + 1
+        row = Row(self.headings, cells, line=line)
+        row.index = index + 1
+        row.id = f"{example.index}.{row.index}"
+        params = {"examples.name": example.name, "examples.index": str(example.index),
+                  "row.index": str(row.index), "row.id": row.id}
+        builder = ScenarioOutlineBuilder(self.outline.annotation_schema)
+        scenario = builder.make_scenario_for(example, row, self.outline, params)
+        self.outline.scenarios.append(scenario)
+        self.appended += 1
+
+    def on_scenario_finished(self, scenario: Scenario) -> None:
+        """Chain the next generated row after the outline's last scenario."""
+        if scenario.parent is self.outline and self.outline.scenarios[-1] is scenario:
+            self.append_next()
+
+
+def attach_streams(feature, rows_per_outline: int, seed: int = 0) -> List[OutlineStream]:
+    """
+    Start streaming generated rows into every @datagen outline of a feature.
+
+    Call from before_feature, and pass every finished scenario to
+    OutlineStream.on_scenario_finished() from after_scenario.
+
+    Args:
+        feature: The behave Feature about to run
+        rows_per_outline: Generated rows per outline, summed over all workers
+        seed: Random seed
+
+    Returns:
+        One stream per tagged outline
+    """
+    streams = []
+    if rows_per_outline <= 0:
+        return streams
+    for outline in feature.walk_scenarios(with_outlines=True):
+        if not isinstance(outline, ScenarioOutline):
+            continue
+        name = datagen_profile(outline)
+        if name is None:
+            continue
+        if name not in PROFILES:
+            raise ValueError(f"Unknown datagen profile '{name}' on {outline.location}. "
+                             f"Supported: {', '.join(PROFILES)}")
+        headings = list(outline.examples[0].table.headings)
+        owners = list(outline.scenarios)
+        if owners and all(owner.should_skip for owner in owners):
+            continue  # Not selected in this run or worker
+        stream = OutlineStream(outline, generate_rows(PROFILES[name], headings, seed), rows_per_outline,
+                               headings, owners)
+        stream.append_next()
+        streams.append(stream)
+    return streams
@@ -0,0 +1,244 @@
+"""
+Failure-only diagnostics for Playwright scenarios.
+
+Every pooled browser context records a Playwright trace (screenshots and DOM
+snapshots) in chunks, one chunk per scenario, while its pages feed bounded
+ring buffers of network responses and console messages. All of it stays in
+memory: when a scenario passes, its trace chunk is discarded without being
+written and the buffers are cleared. Only a failed scenario gets its trace,
+a screenshot, the network log (as HAR) and the console log packed into one
+compressed archive in the DiagnosticsStore (support/diagnostics_store.py),
+which evicts its oldest archives once the store exceeds a size cap.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from playwright.sync_api import BrowserContext, ConsoleMessage, Error as PlaywrightError, Page, Request, Response
+
+from support.diagnostics_store import DiagnosticsStore
+from support.flakes import FAILED_STATUSES
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NetworkEntry:
+    """One response (or failed request) seen by a page."""
+
+    started: float
+    method: str
+    url: str
+    resource_type: str
+    status: int
+    status_text: str
+    wait_ms: float
+    request_headers: Dict[str, str]
+    response_headers: Dict[str, str]
+    failure: str = ""
+
+
+@dataclass
+class RingBuffers:
+    """Most recent network and console activity of one browser context."""
+
+    size: int
+    network: Deque[NetworkEntry] = field(init=False)
+    console: Deque[str] = field(init=False)
+
+    def __post_init__(self):
+        self.network = deque(maxlen=self.size)
+        self.console = deque(maxlen=self.size)
+
+    def clear(self) -> None:
+        self.network.clear()
+        self.console.clear()
+
+
+def to_har(entries: List[NetworkEntry]) -> Dict:
+    """
+    Render ring buffer entries as a HAR 1.2 log (no bodies).
+
+    Args:
+        entries: Network entries, oldest first
+
+    Returns:
+        HAR document
+    """
+    def headers(values: Dict[str, str]) -> List[Dict[str, str]]:
+        return [{"name": name, "value": value} for name, value in values.items()]
+
+    return {"log": {
+        "version": "1.2",
+        "creator": {"name": "login-suite diagnostics", "version": "1.0"},
+        "entries": [{
+            "startedDateTime": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(entry.started))
+                               + f".{int(entry.started * 1000) % 1000:03d}Z",
+            "time": entry.wait_ms,
+            "request": {"method": entry.method, "url": entry.url, "httpVersion": "HTTP/1.1",
+                        "headers": headers(entry.request_headers), "queryString": [], "cookies": [],
+                        "headersSize": -1, "bodySize": -1},
+            "response": {"status": entry.status, "statusText": entry.status_text, "httpVersion": "HTTP/1.1",
+                         "headers": headers(entry.response_headers), "cookies": [],
+                         "content": {"size": -1, "mimeType": entry.response_headers.get("content-type", "")},
+                         "redirectURL": entry.response_headers.get("location", ""),
+                         "headersSize": -1, "bodySize": -1},
+            "cache": {},
+            "timings": {"send": 0, "wait": entry.wait_ms, "receive": 0},
+            "_resourceType": entry.resource_type,
+            "_failure": entry.failure,
+        } for entry in entries],
+    }}
+
+
+class FailureDiagnostics:
+    """
+    Records traces and ring buffers per browser context; persists them only for failed scenarios.
+    """
+
+    def __init__(self, store: DiagnosticsStore, buffer_size: int = 200, trace: bool = True, worker_id: int = 0):
+        """
+        Initialize diagnostics.
+
+        Args:
+            store: Where failure archives go
+            buffer_size: Network responses and console messages kept per context
+            trace: Record Playwright traces (screenshots and DOM snapshots)
+            worker_id: Parallel worker index, part of every archive name
+        """
+        self.store = store
+        self.buffer_size = buffer_size
+        self.trace = trace
+        self.worker_id = worker_id
+        self._buffers: Dict[int, RingBuffers] = {}
+
+    # --- Installation ---
+
+    def install(self, browser_context: BrowserContext) -> None:
+        """
+        Start recording in a new browser context.
+
+        Args:
+            browser_context: Context to record; existing and future pages are tracked
+        """
+        buffers = self._buffers[id(browser_context)] = RingBuffers(self.buffer_size)
+        browser_context.on("close", lambda _: self._buffers.pop(id(browser_context), None))
+        for page in browser_context.pages:
+            self._track(page, buffers)
+        browser_context.on("page", lambda page: self._track(page, buffers))
+        if self.trace:
+            # start() opens a first chunk; close it so every scenario starts its own
+            browser_context.tracing.start(screenshots=True, snapshots=True)
+            browser_context.tracing.stop_chunk()
+
+    def _track(self, page: Page, buffers: RingBuffers) -> None:
+        page.on("response", lambda response: buffers.network.append(self._response_entry(response)))
+        page.on("requestfailed", lambda request: buffers.network.append(self._failure_entry(request)))
+        page.on("console", lambda message: buffers.console.append(self._console_line(message)))
+        page.on("pageerror", lambda error: buffers.console.append(f"{time.strftime('%H:%M:%S')} [pageerror] {error}"))
+
+    # Event handlers only read properties Playwright already holds, so recording costs no round trips
+
+    @staticmethod
+    def _response_entry(response: Response) -> NetworkEntry:
+        request = response.request
+        timing = request.timing
+        return NetworkEntry(
+            started=timing["startTime"] / 1000 if timing.get("startTime", -1) > 0 else time.time(),
+            method=request.method,
+            url=response.url,
+            resource_type=request.resource_type,
+            status=response.status,
+            status_text=response.status_text,
+            wait_ms=max(timing.get("responseStart", -1), 0),
+            request_headers=request.headers,
+            response_headers=response.headers,
+        )
+
+    @staticmethod
+    def _failure_entry(request: Request) -> NetworkEntry:
+        return NetworkEntry(time.time(), request.method, request.url, request.resource_type, 0, "", 0,
+                            request.headers, {}, failure=request.failure or "failed")
+
+    @staticmethod
+    def _console_line(message: ConsoleMessage) -> str:
+        location = message.location or {}
+        source = f" ({location.get('url')}:{location.get('lineNumber')})" if location.get("url") else ""
+        return f"{time.strftime('%H:%M:%S')} [{message.type}] {message.text}{source}"
+
+    # --- Per scenario ---
+
+    def begin(self, browser_context: BrowserContext, title: str) -> None:
+        """
+        Start a scenario's recording.
+
+        Args:
+            browser_context: Context the scenario runs in
+            title: Scenario name, shown in the trace viewer
+        """
+        buffers = self._buffers.get(id(browser_context))
+        if buffers:
+            buffers.clear()
+        if self.trace:
+            browser_context.tracing.start_chunk(title=title)
+
+    def finish(self, browser_context: BrowserContext, page: Page, scenario) -> Optional[str]:
+        """
+        End a scenario's recording; persist it only if the scenario failed.
+
+        Args:
+            browser_context: Context the scenario ran in
+            page: The scenario's page, screenshotted on failure
+            scenario: behave Scenario
+
+        Returns:
+            Archive path for a failed scenario, else None
+        """
+        buffers = self._buffers.get(id(browser_context)) or RingBuffers(self.buffer_size)
+        try:
+            if scenario.status not in FAILED_STATUSES:
+                if self.trace:
+                    browser_context.tracing.stop_chunk()  # Discarded without being written
+                return None
+            return self._persist(browser_context, page, scenario, buffers)
+        except (PlaywrightError, OSError) as error:
+            # Diagnostics never turn a result into an error
+            logger.warning(f"Failure diagnostics for '{scenario.name}' incomplete: {error}")
+            return None
+        finally:
+            buffers.clear()
+
+    def _persist(self, browser_context: BrowserContext, page: Page, scenario, buffers: RingBuffers) -> str:
+        artifacts: Dict[str, bytes] = {}
+        if self.trace:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                trace_path = os.path.join(tmp_dir, "trace.zip")
+                browser_context.tracing.stop_chunk(path=trace_path)
+                with open(trace_path, "rb") as trace_file:
+                    artifacts["trace.zip"] = trace_file.read()
+        try:
+            artifacts["screenshot.png"] = page.screenshot(full_page=True)
+        except PlaywrightError as error:
+            logger.debug(f"Failure screenshot unavailable: {error}")
+        failed_step = next((step for step in scenario.steps if step.status in FAILED_STATUSES), None)
+        artifacts["scenario.json"] = json.dumps({
+            "name": scenario.name,
+            "location": str(scenario.location),
+            "status": scenario.status.name if hasattr(scenario.status, "name") else str(scenario.status),
+            "failed_step": f"{failed_step.keyword} {failed_step.name}" if failed_step else None,
+            "error": getattr(failed_step, "error_message", None) if failed_step else None,
+            "url": page.url,
+        }, indent=2).encode()
+        artifacts["network.har"] = json.dumps(to_har(list(buffers.network)), indent=1).encode()
+        artifacts["console.log"] = "\n".join(buffers.console).encode()
+        slug = re.sub(r"[^\w.-]+", "_", scenario.name).strip("_")[:80]
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-w{self.worker_id}-{self.store.written:04d}-{slug}"
+        return self.store.save(name, artifacts)
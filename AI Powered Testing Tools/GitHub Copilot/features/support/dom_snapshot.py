@@ -0,0 +1,185 @@
+"""
+Single round-trip snapshots of the login form.
+
+Reading element state through separate locator calls (is_visible, is_enabled,
+get_attribute, inner_text) costs one browser round-trip each. The snapshot
+script collects the state of every login-form element in one page.evaluate()
+call and returns it as typed dataclasses that the LoginPage assertions read.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from playwright.sync_api import Page
+
+
+# Resolves comma-separated fallback selectors the way Playwright does: every
+# alternative is matched and the first element in document order wins.
+# Playwright's :has-text() pseudo-class is emulated because it is not CSS.
+SNAPSHOT_SCRIPT = """
+(selectors) => {
+    const HAS_TEXT = /^(.*):has-text\\((['"])(.*)\\2\\)$/;
+
+    const splitAlternatives = (selector) => {
+        const parts = [];
+        let depth = 0, quote = null, current = "";
+        for (const ch of selector) {
+            if (quote) {
+                if (ch === quote) quote = null;
+            } else if (ch === "'" || ch === '"') {
+                quote = ch;
+            } else if (ch === "(" || ch === "[") {
+                depth++;
+            } else if (ch === ")" || ch === "]") {
+                depth--;
+            } else if (ch === "," && depth === 0) {
+                parts.push(current.trim());
+                current = "";
+                continue;
+            }
+            current += ch;
+        }
+        if (current.trim()) parts.push(current.trim());
+        return parts;
+    };
+
+    const firstMatch = (selector) => {
+        const found = new Set();
+        for (const alternative of splitAlternatives(selector)) {
+            const hasText = alternative.match(HAS_TEXT);
+            const css = hasText ? (hasText[1] || "*") : alternative;
+            let elements;
+            try {
+                elements = document.querySelectorAll(css);
+            } catch (e) {
+                continue;
+            }
+            for (const el of elements) {
+                const text = (el.innerText || el.value || "").toLowerCase();
+                if (!hasText || text.includes(hasText[3].toLowerCase())) found.add(el);
+            }
+        }
+        const ordered = Array.from(found).sort(
+            (a, b) => (a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING) ? -1 : 1
+        );
+        return ordered[0] || null;
+    };
+
+    const describe = (selector) => {
+        const el = firstMatch(selector);
+        if (!el) return null;
+        const box = el.getBoundingClientRect();
+        return {
+            tag: el.tagName.toLowerCase(),
+            type: el.getAttribute("type"),
+            id: el.id || "",
+            name: el.getAttribute("name"),
+            visible: box.width > 0 && box.height > 0 && getComputedStyle(el).visibility !== "hidden",
+            enabled: !el.matches(":disabled"),
+            text: (el.innerText || "").trim(),
+            value: typeof el.value === "string" ? el.value : "",
+            ariaLabel: el.getAttribute("aria-label"),
+            ariaLabelledby: el.getAttribute("aria-labelledby"),
+            hasLabel: !!(el.labels && el.labels.length),
+        };
+    };
+
+    const active = document.activeElement;
+    const elements = {};
+    for (const [key, selector] of Object.entries(selectors)) {
+        elements[key] = describe(selector);
+    }
+    return {
+        url: window.location.href,
+        focused: active ? String(active.id || active.name || active.type || "") : "",
+        elements,
+    };
+}
+"""
+
+
+@dataclass(frozen=True)
+class ElementState:
+    """State of one element at snapshot time; found is False if nothing matched."""
+
+    found: bool = False
+    tag: str = ""
+    type: Optional[str] = None
+    id: str = ""
+    name: Optional[str] = None
+    visible: bool = False
+    enabled: bool = False
+    text: str = ""
+    value: str = ""
+    aria_label: Optional[str] = None
+    aria_labelledby: Optional[str] = None
+    has_label: bool = False
+
+    @property
+    def usable(self) -> bool:
+        """True if the element is visible and enabled."""
+        return self.visible and self.enabled
+
+    @property
+    def has_accessible_name(self) -> bool:
+        """True if assistive technology can announce a name for the element."""
+        return bool(self.aria_label or self.aria_labelledby or self.has_label or self.text)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ElementState":
+        """
+        Build an ElementState from the snapshot script result.
+
+        Args:
+            data: Element description, or None if no element matched
+
+        Returns:
+            ElementState instance
+        """
+        if not data:
+            return cls()
+        return cls(
+            found=True,
+            tag=data["tag"],
+            type=data["type"],
+            id=data["id"],
+            name=data["name"],
+            visible=data["visible"],
+            enabled=data["enabled"],
+            text=data["text"],
+            value=data["value"],
+            aria_label=data["ariaLabel"],
+            aria_labelledby=data["ariaLabelledby"],
+            has_label=data["hasLabel"],
+        )
+
+
+@dataclass(frozen=True)
+class LoginFormSnapshot:
+    """State of all login-form elements captured in one round-trip."""
+
+    url: str
+    focused: str
+    username: ElementState
+    password: ElementState
+    login_button: ElementState
+    error: ElementState
+    user_menu: ElementState
+    username_label: ElementState
+    password_label: ElementState
+
+
+def take_snapshot(page: Page, selectors: Dict[str, str]) -> LoginFormSnapshot:
+    """
+    Capture the login form state with a single page.evaluate() call.
+
+    Args:
+        page: Playwright page showing the login form
+        selectors: Selector per LoginFormSnapshot element field
+
+    Returns:
+        LoginFormSnapshot for the current page
+    """
+    result = page.evaluate(SNAPSHOT_SCRIPT, selectors)
+    elements = {key: ElementState.from_dict(value) for key, value in result["elements"].items()}
+    return LoginFormSnapshot(url=result["url"], focused=result["focused"], **elements)
@@ -0,0 +1,171 @@
+"""
+Element fingerprints for self-healing locators.
+
+A fingerprint is a compact record of an element: tag, identifying
+attributes, text and DOM path. FINGERPRINT_FUNCTIONS computes it in the
+page, similarity() scores how closely another element matches it, and
+FingerprintIndex keeps the fingerprint of every locator's element in a JSON
+file between runs. support/healing.py uses these with the suite's browser
+driver to heal locators that stop matching.
+
+This module is kept identical in the GitHub Copilot and Gemini suites;
+change both copies together.
+"""
+
+import json
+import os
+import tempfile
+from difflib import SequenceMatcher
+from typing import Any, Dict, Optional, Sequence, Union
+
+
+# In-page helpers: fingerprintOf(el) and uniqueSelectorOf(el)
+FINGERPRINT_FUNCTIONS = """
+const FINGERPRINT_ATTRIBUTES = ["id", "name", "type", "class", "placeholder", "aria-label", "role", "for",
+                                "data-testid", "href", "value"];
+const BUTTON_TYPES = ["submit", "button", "reset"];
+const domPathOf = (el, format) => {
+    const steps = [];
+    for (let node = el; node && node.parentElement; node = node.parentElement) {
+        let index = 1;
+        for (let sibling = node.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            if (sibling.tagName === node.tagName) index++;
+        }
+        steps.unshift(format(node.tagName.toLowerCase(), index));
+    }
+    return steps;
+};
+const fingerprintOf = (el) => {
+    const attributes = {};
+    for (const name of FINGERPRINT_ATTRIBUTES) {
+        const value = el.getAttribute(name);
+        // Typed values change (and may be secrets); only button captions are identifying
+        if (name === "value" && !(el.tagName === "INPUT" && BUTTON_TYPES.includes(el.type))) continue;
+        if (value) attributes[name] = value;
+    }
+    return {
+        tag: el.tagName.toLowerCase(),
+        attributes,
+        text: (el.innerText || "").trim().replace(/\\s+/g, " ").slice(0, 80),
+        path: domPathOf(el, (tag, index) => index > 1 ? `${tag}[${index}]` : tag).join("/"),
+    };
+};
+const uniqueSelectorOf = (el) => {
+    const unique = (selector) => document.querySelectorAll(selector).length === 1;
+    const tag = el.tagName.toLowerCase();
+    if (el.id && unique(`#${CSS.escape(el.id)}`)) return `#${CSS.escape(el.id)}`;
+    for (const name of ["data-testid", "name", "aria-label"]) {
+        const value = el.getAttribute(name);
+        const selector = value && `${tag}[${name}="${CSS.escape(value)}"]`;
+        if (selector && unique(selector)) return selector;
+    }
+    return domPathOf(el, (tag, index) => `${tag}:nth-of-type(${index})`).join(" > ");
+};
+"""
+
+# Weight of each fingerprint feature in the similarity score
+FEATURE_WEIGHTS = {
+    "tag": 2.0, "id": 3.0, "name": 2.0, "data-testid": 3.0, "aria-label": 2.0, "for": 2.0,
+    "placeholder": 1.5, "value": 1.5, "text": 2.0, "type": 1.0, "role": 1.0, "href": 1.0,
+    "class": 1.0, "path": 1.0,
+}
+
+# A healed element must closely match the target on at least one of these
+ANCHOR_FEATURES = ("id", "name", "data-testid", "aria-label", "for", "placeholder", "value", "text")
+
+
+def _features(fingerprint: Dict[str, Any]) -> Dict[str, str]:
+    features = dict(fingerprint.get("attributes", {}))
+    # An <input type="submit"> shows its value where a <button> shows its text
+    features.update(tag=fingerprint.get("tag", ""), text=fingerprint.get("text") or features.pop("value", ""),
+                    path=fingerprint.get("path", ""))
+    return {name: value for name, value in features.items() if value}
+
+
+def _feature_similarity(name: str, expected: str, actual: str) -> float:
+    if expected == actual:
+        return 1.0
+    if not actual:
+        return 0.0
+    if name == "class":
+        expected_set, actual_set = set(expected.split()), set(actual.split())
+        return len(expected_set & actual_set) / len(expected_set | actual_set)
+    if name == "path":
+        return SequenceMatcher(None, expected.split("/"), actual.split("/")).ratio()
+    if name in ("tag", "type", "role"):
+        return 0.0
+    return SequenceMatcher(None, expected.lower(), actual.lower()).ratio()
+
+
+def similarity(target: Dict[str, Any], candidate: Dict[str, Any]) -> float:
+    """
+    Score how closely a candidate element matches a recorded fingerprint.
+
+    Args:
+        target: Recorded fingerprint
+        candidate: Fingerprint of an element on the current page
+
+    Returns:
+        Weighted similarity from 0 to 1; 0 if no identifying feature (anchor) matches
+    """
+    expected, actual = _features(target), _features(candidate)
+    total = matched = 0.0
+    anchored = False
+    for name, value in expected.items():
+        weight = FEATURE_WEIGHTS.get(name, 0.5)
+        score = _feature_similarity(name, value, actual.get(name, ""))
+        total += weight
+        matched += weight * score
+        anchored = anchored or (name in ANCHOR_FEATURES and score >= 0.8)
+    return matched / total if total and anchored else 0.0
+
+
+class FingerprintIndex:
+    """
+    Element fingerprints by locator name, persisted as JSON between runs.
+    """
+
+    def __init__(self, path: str = os.path.join(".behave_cache", "locator_fingerprints.json")):
+        """
+        Initialize the index, loading an existing file.
+
+        Args:
+            path: JSON file of the index
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if os.path.exists(path):
+            with open(path) as index_file:
+                self.entries = json.load(index_file)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Recorded fingerprint of a locator name, if any."""
+        entry = self.entries.get(key)
+        return entry["fingerprint"] if entry else None
+
+    def record(self, key: str, locator: Union[str, Sequence[str]], fingerprint: Dict[str, Any]) -> None:
+        """
+        Store the fingerprint of the element a locator matched.
+
+        Args:
+            key: Locator name
+            locator: The selector or (by, value) locator that matched
+            fingerprint: Fingerprint of the matched element
+        """
+        entry = {"locator": locator if isinstance(locator, str) else list(locator), "fingerprint": fingerprint}
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self.dirty = True
+
+    def save(self) -> None:
+        """Write the index atomically if anything changed."""
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(self.entries, tmp_file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
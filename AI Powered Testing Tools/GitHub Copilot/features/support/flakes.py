@@ -0,0 +1,224 @@
+"""
+In-process retries and a quarantine lane for flaky scenarios.
+
+A failed scenario is retried in the same behave process (behave's
+patch_scenario_with_autoretry) instead of forcing a rerun of the suite;
+after_scenario resets the browser state of a failed scenario, so every
+attempt starts logged out. The final outcome of every scenario - passed,
+flaky (passed on a retry) or failed - goes into a local history.
+Scenarios whose recent runs are too unstable are quarantined: the main
+lane (-D lane=main) leaves them out and they run in a separate lane
+afterwards (-D lane=quarantine), so the main lane's duration does not
+depend on retries of chronically flaky scenarios.
+
+This module is kept identical in the GitHub Copilot and Gemini suites;
+change both copies together.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+from behave.contrib.scenario_autoretry import patch_scenario_with_autoretry
+
+
+logger = logging.getLogger(__name__)
+
+
+FAILED_STATUSES = ("failed", "error")
+
+LANES = ("all", "main", "quarantine")
+
+
+def history_key(feature_file: str, scenario_name: str) -> str:
+    """
+    Identify a scenario across runs without line numbers, which shift with edits.
+
+    Args:
+        feature_file: Path of the feature file
+        scenario_name: Scenario name (Outline rows include their row id)
+
+    Returns:
+        History key
+    """
+    return f"{feature_file.replace(os.sep, '/')}::{scenario_name}"
+
+
+class FlakeHistory:
+    """
+    Recent final outcomes per scenario, persisted as JSON and shared by workers.
+    """
+
+    def __init__(self, path: str = os.path.join(".behave_cache", "flake_history.json"), window: int = 20,
+                 threshold: float = 0.2, min_runs: int = 5):
+        """
+        Initialize the history.
+
+        Args:
+            path: JSON file of the history
+            window: Outcomes kept per scenario (most recent)
+            threshold: Flake rate at which a scenario is quarantined
+            min_runs: Outcomes needed before a scenario can be quarantined
+        """
+        self.path = path
+        self.window = window
+        self.threshold = threshold
+        self.min_runs = min_runs
+        self.outcomes: Dict[str, List[str]] = self._read()
+        self._pending: Dict[str, List[str]] = {}
+
+    def _read(self) -> Dict[str, List[str]]:
+        try:
+            with open(self.path) as history_file:
+                return json.load(history_file)
+        except (OSError, ValueError):
+            return {}
+
+    def record(self, key: str, outcome: str) -> None:
+        """
+        Add a scenario's final outcome.
+
+        Args:
+            key: Key from history_key()
+            outcome: 'passed', 'flaky' or 'failed'
+        """
+        self.outcomes.setdefault(key, []).append(outcome)
+        self.outcomes[key] = self.outcomes[key][-self.window:]
+        self._pending.setdefault(key, []).append(outcome)
+
+    def flake_rate(self, key: str) -> float:
+        """
+        Share of recent runs that were unstable.
+
+        Flaky runs always count; failed runs count only if the scenario also
+        passed in the window, so a consistently failing (broken) scenario is
+        not mistaken for a flaky one.
+
+        Args:
+            key: Key from history_key()
+
+        Returns:
+            Rate from 0 to 1
+        """
+        outcomes = self.outcomes.get(key, [])
+        if not outcomes:
+            return 0.0
+        unstable = outcomes.count("flaky")
+        if unstable or "passed" in outcomes:
+            unstable += outcomes.count("failed")
+        return unstable / len(outcomes)
+
+    def is_quarantined(self, key: str) -> bool:
+        """True if the scenario has enough history and its flake rate reaches the threshold."""
+        return len(self.outcomes.get(key, [])) >= self.min_runs and self.flake_rate(key) >= self.threshold
+
+    def quarantined(self) -> List[str]:
+        """Keys of all quarantined scenarios."""
+        return sorted(key for key in self.outcomes if self.is_quarantined(key))
+
+    def save(self) -> None:
+        """Merge this run's outcomes into the file on disk (other workers may have saved meanwhile)."""
+        if not self._pending:
+            return
+        outcomes = self._read()
+        for key, recorded in self._pending.items():
+            outcomes[key] = (outcomes.get(key, []) + recorded)[-self.window:]
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(outcomes, tmp_file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.outcomes = outcomes
+        self._pending = {}
+
+
+class RetryTracker:
+    """
+    Patches scenarios for retries and turns their attempts into final outcomes.
+    """
+
+    def __init__(self, history: FlakeHistory, max_attempts: int = 2, lane: str = "all"):
+        """
+        Initialize the tracker.
+
+        Args:
+            history: Where final outcomes are recorded
+            max_attempts: Runs of a failing scenario before its failure is accepted (1: no retries)
+            lane: 'all', 'main' (quarantined scenarios are skipped) or 'quarantine' (only those run)
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane '{lane}', expected one of {LANES}")
+        self.history = history
+        self.max_attempts = max(1, max_attempts)
+        self.lane = lane
+        self.retried = 0
+        self.flaky: List[str] = []
+        self._attempts: Dict[str, int] = {}
+
+    def patch(self, scenarios: Iterable) -> None:
+        """
+        Let failing scenarios run again, up to max_attempts; safe to call twice.
+
+        Args:
+            scenarios: Scenarios (or Outline rows) about to run
+        """
+        if self.max_attempts < 2:
+            return
+        for scenario in scenarios:
+            if not getattr(scenario, "_autoretry_patched", False):
+                patch_scenario_with_autoretry(scenario, max_attempts=self.max_attempts)
+                scenario._autoretry_patched = True
+
+    def skip_reason(self, scenario) -> Optional[str]:
+        """
+        Why the scenario does not belong to this process's lane, if it doesn't.
+
+        Args:
+            scenario: Scenario about to run
+
+        Returns:
+            Skip reason, or None if the scenario runs here
+        """
+        if self.lane == "all":
+            return None
+        key = history_key(scenario.filename, scenario.name)
+        quarantined = self.history.is_quarantined(key)
+        if self.lane == "main" and quarantined:
+            return f"quarantined (flake rate {self.history.flake_rate(key):.0%}); runs in the quarantine lane"
+        if self.lane == "quarantine" and not quarantined:
+            return "not quarantined; runs in the main lane"
+        return None
+
+    def on_scenario_finished(self, scenario) -> None:
+        """
+        Count an attempt; record the outcome once the scenario passed or ran out of attempts.
+
+        Args:
+            scenario: The finished behave Scenario (one attempt of it)
+        """
+        if scenario.status not in ("passed",) + FAILED_STATUSES:
+            return  # Skipped or untested: nothing to learn
+        key = history_key(scenario.filename, scenario.name)
+        attempt = self._attempts.get(key, 0) + 1
+        if scenario.status in FAILED_STATUSES and attempt < self.max_attempts:
+            self._attempts[key] = attempt
+            self.retried += 1
+            logger.warning(f"Retrying '{scenario.name}' (attempt {attempt + 1} of {self.max_attempts})")
+            return
+        self._attempts.pop(key, None)
+        if scenario.status == "passed":
+            outcome = "flaky" if attempt > 1 else "passed"
+        else:
+            outcome = "failed"
+        if outcome == "flaky":
+            self.flaky.append(scenario.name)
+        was_quarantined = self.history.is_quarantined(key)
+        self.history.record(key, outcome)
+        if self.history.is_quarantined(key) and not was_quarantined:
+            logger.warning(f"'{scenario.name}' moves to the quarantine lane "
+                           f"(flake rate {self.history.flake_rate(key):.0%})")
+        elif was_quarantined and not self.history.is_quarantined(key):
+            logger.info(f"'{scenario.name}' is stable again and returns to the main lane")
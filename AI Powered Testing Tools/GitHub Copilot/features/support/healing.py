@@ -0,0 +1,137 @@
+"""
+Self-healing fallback for the login selectors.
+
+Whenever SelectorResolver (support/selectors.py) resolves a selector, the
+same page.evaluate() returns a compact fingerprint of the element (see
+support/fingerprints.py), which goes into an index that persists between
+runs. When no alternative of a selector matches within a short grace period
+(a few hundred milliseconds, for elements that are still rendering), the
+page is scanned once for the element most similar to the recorded
+fingerprint. A close enough match is used at once, so a broken selector
+does not cost the full action timeout; a real match takes over again as
+soon as it appears. Healed selectors are logged and reported, with the
+scenarios that needed them, for review. In strict mode (for CI) the
+selector gets the full normal wait instead, and a healed selector fails
+the scenario, naming the element it would have used.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from playwright.sync_api import Page
+
+from support.fingerprints import FINGERPRINT_FUNCTIONS, FingerprintIndex, similarity
+
+
+logger = logging.getLogger(__name__)
+
+
+# Fingerprints and unique selectors of the elements that could be the target:
+# same tag, or sharing an identifying value with it
+CANDIDATES_SCRIPT = "(target) => {" + FINGERPRINT_FUNCTIONS + """
+    const identifiers = new Set(Object.values(target.attributes).concat(target.text ? [target.text] : []));
+    const shares = (el) => FINGERPRINT_ATTRIBUTES.some((name) => identifiers.has(el.getAttribute(name)))
+        || (target.text && (el.innerText || "").trim() === target.text);
+    return Array.from(document.body.querySelectorAll("*"))
+        .filter((el) => el.tagName.toLowerCase() === target.tag || shares(el))
+        .slice(0, 500)
+        .map((el) => ({ fingerprint: fingerprintOf(el), selector: uniqueSelectorOf(el) }));
+}"""
+
+
+@dataclass
+class HealedSelector:
+    """A selector that matched nothing and the selector it was healed to."""
+
+    key: str
+    selector: str
+    healed_selector: str
+    score: float
+    url: str
+    scenarios: List[str] = field(default_factory=list)
+
+
+class LocatorHealer:
+    """
+    Finds the element most similar to a recorded fingerprint when a selector misses.
+    """
+
+    def __init__(self, index: FingerprintIndex, threshold: float = 0.75, grace_ms: float = 300,
+                 strict: bool = False, strict_wait_ms: float = 30000):
+        """
+        Initialize the healer.
+
+        Args:
+            index: Recorded fingerprints
+            threshold: Similarity a candidate needs to be used
+            grace_ms: How long a selector may match nothing before it is healed
+            strict: Fail instead of using a healed selector
+            strict_wait_ms: Wait before looking for a replacement in strict mode
+        """
+        self.index = index
+        self.threshold = threshold
+        self.grace_ms = grace_ms
+        self.strict = strict
+        self.strict_wait_ms = strict_wait_ms
+        self.healed: Dict[str, HealedSelector] = {}
+        # Name of the running scenario, recorded with each healed selector
+        self.scenario = ""
+
+    @property
+    def wait_ms(self) -> float:
+        """How long a selector may match nothing before heal() is tried."""
+        return self.strict_wait_ms if self.strict else self.grace_ms
+
+    def heal(self, page: Page, key: str, selector: str) -> Optional[str]:
+        """
+        Find a replacement for a selector that matched nothing, in one round-trip.
+
+        Call this only once the selector has matched nothing for wait_ms.
+
+        Args:
+            page: Page to search
+            key: Selector name
+            selector: The selector that missed
+
+        Returns:
+            Unique selector of the most similar element, or None if nothing is similar enough
+
+        Raises:
+            AssertionError: In strict mode, if a similar element was found
+        """
+        target = self.index.get(key)
+        if target is None:
+            return None
+        candidates: List[Dict[str, Any]] = page.evaluate(CANDIDATES_SCRIPT, target)
+        scored = [(similarity(target, candidate["fingerprint"]), candidate["selector"]) for candidate in candidates]
+        score, healed_selector = max(scored, key=lambda item: item[0], default=(0.0, ""))
+        if score < self.threshold:
+            return None
+        known = self.healed.get(key)
+        if not known or known.healed_selector != healed_selector:
+            known = self.healed[key] = HealedSelector(key, selector, healed_selector, round(score, 3), page.url)
+            logger.warning(f"Healed selector '{key}': {selector!r} -> {healed_selector!r} (similarity {score:.2f})")
+        if self.scenario and self.scenario not in known.scenarios:
+            known.scenarios.append(self.scenario)
+        if self.strict:
+            raise AssertionError(f"Selector '{key}' matches nothing; the most similar element is "
+                                 f"{healed_selector!r} (similarity {score:.2f}). Update the selector.")
+        return healed_selector
+
+    def write_report(self, path: str) -> None:
+        """
+        Write the healed selectors of this run as JSON, for review.
+
+        Args:
+            path: Output file path
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as report_file:
+            json.dump({
+                "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "healed": [asdict(healed) for healed in self.healed.values()],
+            }, report_file, indent=2)
@@ -0,0 +1,168 @@
+"""
+Login latency instrumentation.
+
+Every login submitted through LoginPage is timed with time.perf_counter_ns()
+and broken down into phases:
+    fill    - typing the credentials
+    submit  - clicking Login until the authentication response arrives
+    server  - server processing time from the browser's Resource Timing data
+    render  - authentication response until the outcome is visible
+    total   - fill + submit + render
+Browser Navigation Timing for the resulting page is kept with each sample.
+The recorder aggregates samples across the run and writes p50/p95/p99 and a
+histogram per phase to a JSON report in after_all.
+"""
+
+import json
+import math
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+PHASES = ("fill_ms", "submit_ms", "server_ms", "render_ms", "total_ms")
+
+# Upper bounds (inclusive, in milliseconds) of the histogram buckets
+HISTOGRAM_BUCKETS_MS = (50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000)
+
+
+@dataclass
+class LoginTiming:
+    """Timing breakdown of one login attempt, in milliseconds."""
+
+    label: str
+    outcome: str
+    fill_ms: float
+    submit_ms: float
+    render_ms: float
+    total_ms: float
+    server_ms: Optional[float] = None
+    navigation: Dict[str, float] = field(default_factory=dict)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Compute a percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Sample values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Percentile value, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def histogram(values: Iterable[float]) -> Dict[str, int]:
+    """
+    Count values per latency bucket.
+
+    Args:
+        values: Sample values in milliseconds
+
+    Returns:
+        Mapping of bucket label ('<=100', ..., '>5000') to count
+    """
+    labels = [f"<={bound}" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}"]
+    counts = dict.fromkeys(labels, 0)
+    for value in values:
+        for bound, label in zip(HISTOGRAM_BUCKETS_MS, labels):
+            if value <= bound:
+                counts[label] += 1
+                break
+        else:
+            counts[labels[-1]] += 1
+    return counts
+
+
+class LatencyRecorder:
+    """
+    Collects login timings for the whole run and summarizes them.
+    """
+
+    def __init__(self, samples: Optional[List[LoginTiming]] = None):
+        """
+        Initialize the recorder.
+
+        Args:
+            samples: Previously recorded samples, e.g. from worker reports
+        """
+        self.samples: List[LoginTiming] = list(samples or [])
+
+    def record(self, timing: LoginTiming) -> None:
+        """
+        Add one login timing.
+
+        Args:
+            timing: Timing breakdown of a login attempt
+        """
+        self.samples.append(timing)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize every phase across all samples.
+
+        Returns:
+            Per phase: count, min, mean, p50, p95, p99, max and histogram
+        """
+        phases = {}
+        for phase in PHASES:
+            values = [getattr(sample, phase) for sample in self.samples if getattr(sample, phase) is not None]
+            phases[phase] = {
+                "count": len(values),
+                "min": min(values, default=0.0),
+                "mean": sum(values) / len(values) if values else 0.0,
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values, default=0.0),
+                "histogram": histogram(values),
+            }
+        return phases
+
+    def write_report(self, path: str) -> None:
+        """
+        Write the summary and raw samples as JSON.
+
+        Args:
+            path: Output file path
+        """
+        outcomes: Dict[str, int] = {}
+        for sample in self.samples:
+            outcomes[sample.outcome] = outcomes.get(sample.outcome, 0) + 1
+        report = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "sample_count": len(self.samples),
+            "outcomes": outcomes,
+            "phases": self.summary(),
+            "samples": [asdict(sample) for sample in self.samples],
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+
+    @classmethod
+    def from_reports(cls, paths: Iterable[str]) -> "LatencyRecorder":
+        """
+        Rebuild a recorder from the raw samples of several reports.
+
+        Args:
+            paths: Reports written by write_report(); missing files are skipped
+
+        Returns:
+            LatencyRecorder holding all samples
+        """
+        samples = []
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path) as report_file:
+                samples.extend(LoginTiming(**sample) for sample in json.load(report_file)["samples"])
+        return cls(samples)
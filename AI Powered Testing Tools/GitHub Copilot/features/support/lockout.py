@@ -0,0 +1,69 @@
+"""
+Account lockout driver.
+
+Lockout scenarios need several failed logins before anything interesting
+happens in the UI. Driving each one through the form (navigate, fill, click,
+wait) makes the scenario grow linearly with dead time, so the failed attempts
+are posted straight to the authentication endpoint through Playwright's
+APIRequestContext instead. The request context belongs to the scenario's
+browser context, so it shares its cookies and keeps one connection alive for
+all attempts.
+"""
+
+import logging
+from typing import List, Sequence
+
+from playwright.sync_api import APIRequestContext
+
+
+logger = logging.getLogger(__name__)
+
+
+class LockoutDriver:
+    """
+    Posts failed login attempts directly to the login endpoint.
+    """
+
+    def __init__(self, request: APIRequestContext, login_url: str,
+                 username_field: str = "username", password_field: str = "password"):
+        """
+        Initialize the driver.
+
+        Args:
+            request: Request context, usually page.context.request
+            login_url: Absolute URL the login form posts to
+            username_field: Form field name of the username
+            password_field: Form field name of the password
+        """
+        self.request = request
+        self.login_url = login_url
+        self.username_field = username_field
+        self.password_field = password_field
+
+    def fire_failed_attempts(self, username: str, passwords: Sequence[str]) -> List[int]:
+        """
+        Submit one login attempt per password.
+
+        Args:
+            username: Account to attempt
+            passwords: Incorrect passwords, one attempt each
+
+        Returns:
+            HTTP status code of every attempt
+
+        Raises:
+            AssertionError: If the server answers an attempt with a 5xx error
+        """
+        statuses = []
+        for password in passwords:
+            response = self.request.post(
+                self.login_url,
+                form={self.username_field: username, self.password_field: password},
+                max_redirects=0,
+            )
+            statuses.append(response.status)
+            response.dispose()
+            assert response.status < 500, \
+                f"Login endpoint returned HTTP {response.status} during a lockout attempt"
+        logger.info(f"Posted {len(statuses)} failed login attempts to {self.login_url}")
+        return statuses
@@ -0,0 +1,121 @@
+"""
+What the page objects know about the login form.
+
+Selectors, URL patterns and in-page scripts shared by the synchronous
+LoginPage (steps/login_steps.py) and the asynchronous AsyncLoginPage
+(support/async_login_page.py), so both backends drive the same form the
+same way.
+"""
+
+import time
+from typing import Any, Dict, Optional, Pattern
+from urllib.parse import urlparse
+
+
+# Selectors - using multiple strategies for robustness
+LOGIN_SELECTORS = {
+    "username": "input#username, input[name='username'], input[type='text'][placeholder*='username' i]",
+    "password": "input#password, input[name='password'], input[type='password']",
+    "login_button": "button:has-text('Login'), button[type='submit'], input[type='submit']",
+    "error": ".error, .alert-danger, [role='alert'], .error-message",
+    "user_menu": "#user-menu, .user-profile, [data-testid='user-menu']",
+    "username_label": "label[for='username'], label:has-text('Username')",
+    "password_label": "label[for='password'], label:has-text('Password')",
+}
+
+# URL path of the authentication request
+AUTH_PATH_PATTERN = r"/(api/)?(login|auth|session)"
+
+# URL path of the pages a successful login lands on
+HOME_PATH_PATTERN = r"/(home|dashboard|welcome)"
+
+# In-page helper: visibleMatches(selector) lists the rendered elements matching a selector
+VISIBILITY_FUNCTIONS = """
+const visibleMatches = (selector) => Array.from(document.querySelectorAll(selector)).filter((el) => {
+    const box = el.getBoundingClientRect();
+    return box.width > 0 && box.height > 0 && getComputedStyle(el).visibility !== "hidden";
+});
+"""
+
+# Run right before the Login button is clicked: remembers the error messages
+# already shown and returns the click time on the page's clock
+MARK_ATTEMPT_SCRIPT = "(errorSelector) => {" + VISIBILITY_FUNCTIONS + """
+    visibleMatches(errorSelector).forEach((el) => { el.__loginErrorBefore = el.textContent; });
+    return performance.now();
+}"""
+
+# Resolves once the login attempt has a visible outcome:
+#   authenticated - an authenticated page with the user menu rendered
+#   error         - an error message that was not already shown before the
+#                   click, or any error once the auth request has completed
+#   invalid       - the browser's own form validation blocked the submission
+# A full-page form post replaces the document, so nothing stale survives it.
+LOGIN_OUTCOME_SCRIPT = "(arg) => {" + VISIBILITY_FUNCTIONS + """
+    const { errorSelector, userMenuSelector, passwordSelector, homePattern, authPattern, since } = arg;
+    if (new RegExp(homePattern).test(window.location.pathname) && visibleMatches(userMenuSelector).length) {
+        return "authenticated";
+    }
+    const answered = () => since !== null && performance.getEntriesByType("resource").some((entry) =>
+        entry.startTime >= since && new RegExp(authPattern).test(new URL(entry.name, location.href).pathname));
+    const errors = visibleMatches(errorSelector);
+    if (errors.some((el) => el.__loginErrorBefore !== el.textContent) || (errors.length && answered())) {
+        return "error";
+    }
+    const form = document.querySelector(passwordSelector)?.form;
+    return form && !form.noValidate && form.matches(":invalid") ? "invalid" : false;
+}"""
+
+# Resolves once a page opened with a (possibly expired) session has settled:
+# 'authenticated' when the user menu renders, 'signed_out' when the login form does
+SESSION_STATE_SCRIPT = "({ userMenuSelector, passwordSelector, homePattern }) => {" + VISIBILITY_FUNCTIONS + """
+    if (new RegExp(homePattern).test(window.location.pathname) && visibleMatches(userMenuSelector).length) {
+        return "authenticated";
+    }
+    return visibleMatches(passwordSelector).length ? "signed_out" : false;
+}"""
+
+
+def outcome_arg(since: Optional[float] = None, auth_path_pattern: str = AUTH_PATH_PATTERN) -> Dict[str, Any]:
+    """
+    Build the argument of LOGIN_OUTCOME_SCRIPT and SESSION_STATE_SCRIPT.
+
+    Args:
+        since: Click time returned by MARK_ATTEMPT_SCRIPT; None if no attempt was marked
+        auth_path_pattern: Regex matching the URL path of the authentication request
+
+    Returns:
+        Selectors and patterns for the in-page scripts
+    """
+    return {
+        "errorSelector": LOGIN_SELECTORS["error"],
+        "userMenuSelector": LOGIN_SELECTORS["user_menu"],
+        "passwordSelector": LOGIN_SELECTORS["password"],
+        "homePattern": HOME_PATH_PATTERN,
+        "authPattern": auth_path_pattern,
+        "since": since,
+    }
+
+
+class AuthResponseWatcher:
+    """
+    Response listener that remembers the auth response of one login attempt.
+
+    Register it with page.on("response", ...) around the click and the
+    outcome wait, so the response is captured without a wait of its own.
+    """
+
+    def __init__(self, auth_path_pattern: Pattern[str]):
+        """
+        Initialize the watcher.
+
+        Args:
+            auth_path_pattern: Compiled regex matching the URL path of the authentication request
+        """
+        self.auth_path_pattern = auth_path_pattern
+        self.response = None
+        self.response_ns: Optional[int] = None
+
+    def __call__(self, response) -> None:
+        if response.request.method == "POST" and self.auth_path_pattern.search(urlparse(response.url).path):
+            self.response = response
+            self.response_ns = time.perf_counter_ns()
@@ -0,0 +1,49 @@
+"""
+In-process mock login application.
+
+Starts Facilitators/Mock Login/mock_login.py on a free local port so the
+suite runs hermetically, without a deployed application. Enabled with
+-D mock_server=true; latency and faults are configured with the mock_*
+userdata options listed in environment.py.
+"""
+
+import os
+import sys
+
+
+MOCK_LOGIN_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, os.pardir, os.pardir, "Facilitators", "Mock Login"
+))
+
+# error_is_overly_specific() treats "invalid username" as leaking which field
+# was wrong, so this suite's stand-in answers with a neutral message
+GENERIC_LOGIN_ERROR = "Login failed. Please check your credentials and try again."
+
+
+def start_mock_server(userdata, accounts=()):
+    """
+    Start the mock login server on a background thread.
+
+    Args:
+        userdata: behave userdata with optional mock_* settings
+        accounts: Additional credentials (username/password) to provision, e.g. the credential pool
+
+    Returns:
+        Running MockLoginServer; call stop() when done
+    """
+    if MOCK_LOGIN_DIR not in sys.path:
+        sys.path.insert(0, MOCK_LOGIN_DIR)
+    from mock_login import Account, LoginPolicy, build_server
+
+    seed = userdata.get("mock_seed")
+    server = build_server(
+        port=userdata.getint("mock_port", 0),
+        latency=userdata.get("mock_latency"),
+        error_rate=userdata.getfloat("mock_error_rate", 0.0),
+        error_status=userdata.getint("mock_error_status", 503),
+        drop_rate=userdata.getfloat("mock_drop_rate", 0.0),
+        seed=int(seed) if seed else None,
+        policy=LoginPolicy(messages={"invalid_credentials": GENERIC_LOGIN_ERROR}),
+        extra_accounts=[Account(account.username, account.password) for account in accounts],
+    )
+    return server.start_in_thread()
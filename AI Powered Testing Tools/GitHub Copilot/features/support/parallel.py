@@ -0,0 +1,544 @@
+"""
+Parallel scenario execution for the login feature suite.
+
+Shards scenarios - including every Scenario Outline Examples row - across N
+behave worker processes. Each worker is a regular behave run restricted to its
+shard by ``file:line`` locations, launches its own Playwright browser through
+``environment.py`` and writes a JSON report. The per-worker reports are merged
+back into a single behave-compatible JSON report.
+
+Scenarios pinned to a browser (the rows of the compatibility outline) form a
+browser matrix: each pinned browser gets one dedicated worker that launches
+it once and runs all of its rows, concurrently with the other browsers and
+the regular shards. Results are also summarized per browser.
+
+Scenarios the flake history quarantines (support/flakes.py) are left out of
+the main lane and run in a quarantine lane once the main lane has finished,
+so chronically flaky scenarios and their retries do not stretch the main
+lane's wall time.
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from behave.parser import parse_file
+
+from support.asset_cache import merge_summaries
+from support.browsers import pinned_browser, same_browser
+from support.flakes import FAILED_STATUSES, FlakeHistory, history_key
+from support.latency import LatencyRecorder
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Work collection and sharding
+# ============================================================================
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """A single runnable scenario (or expanded Scenario Outline row)."""
+
+    location: str
+    feature: str
+    name: str
+    tags: Tuple[str, ...] = ()
+    browser: Optional[str] = None  # Browser the scenario is pinned to, if any
+
+
+def find_feature_files(paths: Sequence[str]) -> List[str]:
+    """
+    Expand files and directories into a sorted list of .feature files.
+
+    Args:
+        paths: Feature files or directories containing them
+
+    Returns:
+        Sorted list of feature file paths
+    """
+    feature_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                feature_files.extend(
+                    os.path.join(dirpath, name) for name in filenames if name.endswith(".feature")
+                )
+        else:
+            feature_files.append(path)
+    return sorted(feature_files)
+
+
+def collect_work_units(paths: Sequence[str]) -> List[WorkUnit]:
+    """
+    Parse feature files and list every scenario as an individually runnable unit.
+
+    Scenario Outlines are expanded so that each Examples row becomes its own
+    unit, addressed by the line of that row. Units opening the login page in
+    a named browser are pinned to it.
+
+    Args:
+        paths: Feature files or directories containing them
+
+    Returns:
+        Work units in feature file order
+    """
+    units = []
+    for filename in find_feature_files(paths):
+        feature = parse_file(filename)
+        if feature is None:
+            continue
+        for scenario in feature.walk_scenarios():
+            units.append(WorkUnit(
+                location=f"{filename}:{scenario.line}",
+                feature=filename,
+                name=scenario.name,
+                tags=tuple(str(tag) for tag in scenario.effective_tags),
+                browser=pinned_browser(scenario),
+            ))
+    return units
+
+
+def shard_work_units(units: Sequence[WorkUnit], workers: int) -> List[List[WorkUnit]]:
+    """
+    Distribute work units round-robin over the workers.
+
+    Round-robin keeps the rows of one Scenario Outline spread across workers,
+    which is where most of the suite's runtime sits.
+
+    Args:
+        units: Work units to distribute
+        workers: Number of worker processes
+
+    Returns:
+        One list of work units per non-empty shard
+    """
+    shards: List[List[WorkUnit]] = [[] for _ in range(max(1, workers))]
+    for index, unit in enumerate(units):
+        shards[index % len(shards)].append(unit)
+    return [shard for shard in shards if shard]
+
+
+def schedule_matrix(units: Sequence[WorkUnit], workers: int) -> List[List[WorkUnit]]:
+    """
+    Give every pinned browser one dedicated worker and shard the remaining units.
+
+    Browser names launching the same engine and channel share a worker. The
+    unpinned units are distributed round-robin over the workers left after
+    the browser workers (at least one).
+
+    Args:
+        units: Work units to schedule
+        workers: Number of worker processes for unpinned units, browser workers included
+
+    Returns:
+        One list of work units per worker: browser workers first, then the regular shards
+    """
+    lanes: Dict[str, List[WorkUnit]] = {}
+    unpinned: List[WorkUnit] = []
+    for unit in units:
+        if unit.browser is None:
+            unpinned.append(unit)
+            continue
+        lane = next((name for name in lanes if same_browser(name, unit.browser)), unit.browser)
+        lanes.setdefault(lane, []).append(unit)
+    shards = shard_work_units(unpinned, max(1, workers - len(lanes))) if unpinned else []
+    return list(lanes.values()) + shards
+
+
+# ============================================================================
+# Worker processes
+# ============================================================================
+
+@dataclass
+class WorkerRun:
+    """Bookkeeping for one behave worker process."""
+
+    worker_id: int
+    units: List[WorkUnit]
+    report_path: str
+    log_path: str
+    latency_report_path: str
+    asset_report_path: str
+    worker_count: int = 1
+    browser: Optional[str] = None  # Launched instead of the configured browser (browser workers)
+    process: Optional[subprocess.Popen] = None
+    returncode: Optional[int] = None
+    elapsed: float = 0.0
+
+
+def build_worker_command(run: WorkerRun, behave_args: Sequence[str]) -> List[str]:
+    """
+    Build the behave command line for a worker.
+
+    Args:
+        run: Worker bookkeeping record
+        behave_args: Extra arguments forwarded to every behave worker
+
+    Returns:
+        Command as an argument list
+    """
+    return [
+        sys.executable, "-m", "behave",
+        "-D", f"worker_id={run.worker_id}",
+        "-D", f"worker_count={run.worker_count}",
+        "-D", "browser_matrix=true",
+        "-D", f"latency_report={run.latency_report_path}",
+        "-D", f"asset_report={run.asset_report_path}",
+        "-f", "json", "-o", run.report_path,
+        "-f", "progress",
+        *behave_args,
+        *(["-D", f"browser={run.browser}"] if run.browser else []),
+        *[unit.location for unit in run.units],
+    ]
+
+
+def split_lanes(units: Sequence[WorkUnit], history: FlakeHistory) -> Tuple[List[WorkUnit], List[WorkUnit]]:
+    """
+    Separate quarantined units from the main lane.
+
+    Args:
+        units: Work units to run
+        history: Recent outcomes per scenario
+
+    Returns:
+        Tuple of (main lane units, quarantine lane units), each in feature file order
+    """
+    main_lane: List[WorkUnit] = []
+    quarantine: List[WorkUnit] = []
+    for unit in units:
+        lane = quarantine if history.is_quarantined(history_key(unit.feature, unit.name)) else main_lane
+        lane.append(unit)
+    return main_lane, quarantine
+
+
+def run_workers(shards: Sequence[List[WorkUnit]], report_dir: str,
+                behave_args: Sequence[str] = ()) -> List[WorkerRun]:
+    """
+    Start one behave process per shard and wait for all of them.
+
+    A shard of pinned units runs in the browser they are pinned to. Reports
+    left in report_dir by an earlier run are removed before the workers start.
+
+    Args:
+        shards: Work units per worker
+        report_dir: Directory for per-worker JSON reports and logs
+        behave_args: Extra arguments forwarded to every behave worker
+
+    Returns:
+        Finished worker runs
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    runs = []
+    for worker_id, units in enumerate(shards):
+        run = WorkerRun(
+            worker_id=worker_id,
+            units=units,
+            report_path=os.path.join(report_dir, f"worker-{worker_id}.json"),
+            log_path=os.path.join(report_dir, f"worker-{worker_id}.log"),
+            latency_report_path=os.path.join(report_dir, f"login_latency-{worker_id}.json"),
+            asset_report_path=os.path.join(report_dir, f"asset_cache-{worker_id}.json"),
+            worker_count=len(shards),
+            browser=units[0].browser if units else None,
+        )
+        # Workers only write latency and asset reports when they have samples,
+        # so a previous run's files must not be left for merging
+        for path in (run.report_path, run.latency_report_path, run.asset_report_path):
+            if os.path.exists(path):
+                os.remove(path)
+        with open(run.log_path, "w") as log_file:
+            run.process = subprocess.Popen(
+                build_worker_command(run, behave_args),
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+        logger.info("Started worker %d with %d scenarios%s", worker_id, len(units),
+                    f" in {run.browser}" if run.browser else "")
+        runs.append(run)
+
+    # Poll rather than wait in order, so every worker's own wall time is known
+    start_time = time.perf_counter()
+    pending = list(runs)
+    while pending:
+        for run in list(pending):
+            if run.process.poll() is None:
+                continue
+            run.returncode = run.process.returncode
+            run.elapsed = time.perf_counter() - start_time
+            pending.remove(run)
+            logger.info("Worker %d finished with exit code %d after %.1fs", run.worker_id, run.returncode, run.elapsed)
+        if pending:
+            time.sleep(0.1)
+    return runs
+
+
+# ============================================================================
+# Report merging
+# ============================================================================
+
+def _location_key(location: str) -> Tuple[str, int]:
+    """Split 'path/to/file.feature:42' into a sortable (path, line) tuple."""
+    filename, _, line = location.rpartition(":")
+    return (filename, int(line)) if line.isdigit() else (location, 0)
+
+
+def merge_reports(runs: Sequence[WorkerRun]) -> List[Dict[str, Any]]:
+    """
+    Merge behave JSON reports from several workers into one report.
+
+    behave lists scenarios outside a worker's shard as skipped, so only the
+    scenarios each worker was assigned are kept. A retried scenario appears
+    once per attempt; only its last attempt is kept. Features are matched by
+    location and their scenarios re-ordered by line so the merged report
+    reads like a serial run.
+
+    Args:
+        runs: Finished worker runs
+
+    Returns:
+        Merged report in behave's JSON format
+    """
+    features: Dict[str, Dict[str, Any]] = {}
+    for run in runs:
+        if not os.path.exists(run.report_path) or os.path.getsize(run.report_path) == 0:
+            logger.warning("Worker %d report %s is missing or empty", run.worker_id, run.report_path)
+            continue
+        assigned = {_location_key(unit.location) for unit in run.units}
+        with open(run.report_path) as report_file:
+            for feature in json.load(report_file):
+                elements = [
+                    element for element in feature.get("elements", [])
+                    if _location_key(element["location"]) in assigned
+                ]
+                key = _location_key(feature["location"])[0]
+                merged = features.setdefault(key, {**feature, "elements": [], "status": "passed"})
+                for element in elements:
+                    previous = merged["elements"][-1] if merged["elements"] else None
+                    if previous and (previous["location"], previous["name"]) == (element["location"], element["name"]):
+                        merged["elements"][-1] = element  # In-process retry of the same scenario
+                    else:
+                        merged["elements"].append(element)
+
+    for feature in features.values():
+        feature["elements"].sort(key=lambda element: _location_key(element["location"]))
+        statuses = {element.get("status") for element in feature["elements"]}
+        if "failed" in statuses:
+            feature["status"] = "failed"
+        elif statuses and statuses <= {"skipped"}:
+            feature["status"] = "skipped"
+    return [features[key] for key in sorted(features)]
+
+
+def unreported_units(runs: Sequence[WorkerRun], report: Sequence[Dict[str, Any]]) -> List[WorkUnit]:
+    """
+    Find assigned work units that are missing from the merged report.
+
+    A worker that dies in before_all or while collecting scenarios writes no
+    (or an empty) report, so its units never show up as failed.
+
+    Args:
+        runs: Finished worker runs
+        report: Merged report in behave's JSON format
+
+    Returns:
+        Units no worker reported on, in run order
+    """
+    reported = {_location_key(element["location"]) for feature in report for element in feature.get("elements", [])}
+    return [unit for run in runs for unit in run.units if _location_key(unit.location) not in reported]
+
+
+def crashed_workers(runs: Sequence[WorkerRun], report: Sequence[Dict[str, Any]]) -> List[WorkerRun]:
+    """
+    Find workers that exited abnormally.
+
+    behave exits with 1 both for failed scenarios and for errors outside
+    them, so a non-zero exit code only counts as a crash when none of the
+    worker's scenarios failed.
+
+    Args:
+        runs: Finished worker runs
+        report: Merged report in behave's JSON format
+
+    Returns:
+        Crashed worker runs
+    """
+    status_of = {_location_key(element["location"]): element.get("status")
+                 for feature in report for element in feature.get("elements", [])}
+    crashed = []
+    for run in runs:
+        if run.returncode == 0:
+            continue
+        failed = any(status_of.get(_location_key(unit.location)) in FAILED_STATUSES for unit in run.units)
+        if run.returncode != 1 or not failed:
+            crashed.append(run)
+    return crashed
+
+
+def summarize(report: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Count scenario statuses in a behave JSON report.
+
+    Args:
+        report: Report in behave's JSON format
+
+    Returns:
+        Mapping of status name to number of scenarios
+    """
+    counts: Dict[str, int] = {}
+    for feature in report:
+        for element in feature.get("elements", []):
+            if element.get("type") != "scenario":
+                continue
+            status = element.get("status") or "untested"
+            counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+def summarize_by_browser(runs: Sequence[WorkerRun],
+                         report: Sequence[Dict[str, Any]]) -> Dict[str, Tuple[Dict[str, int], float]]:
+    """
+    Count scenario statuses per browser worker.
+
+    Args:
+        runs: Finished worker runs
+        report: Merged report in behave's JSON format
+
+    Returns:
+        Browser name ('default' for unpinned scenarios) -> (status counts, slowest worker's wall time)
+    """
+    browser_of = {_location_key(unit.location): run.browser or "default" for run in runs for unit in run.units}
+    matrix: Dict[str, Tuple[Dict[str, int], float]] = {}
+    for run in runs:
+        counts, elapsed = matrix.get(run.browser or "default", ({}, 0.0))
+        matrix[run.browser or "default"] = (counts, max(elapsed, run.elapsed))
+    for feature in report:
+        for element in feature.get("elements", []):
+            browser = browser_of.get(_location_key(element["location"]))
+            if element.get("type") != "scenario" or browser is None:
+                continue
+            counts = matrix[browser][0]
+            status = element.get("status") or "untested"
+            counts[status] = counts.get(status, 0) + 1
+    return matrix
+
+
+# ============================================================================
+# Command line entry point
+# ============================================================================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> Tuple[argparse.Namespace, List[str]]:
+    """
+    Parse runner arguments; everything after '--' is forwarded to behave.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Tuple of (parsed runner options, behave arguments)
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    behave_args: List[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, behave_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="Run behave scenarios across parallel workers.")
+    parser.add_argument("paths", nargs="*", default=["features"],
+                        help="Feature files or directories (default: features)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes; every browser pinned by a scenario takes one "
+                             "of them (default: CPU count)")
+    parser.add_argument("--report", default=os.path.join("reports", "behave.json"),
+                        help="Merged JSON report path (default: reports/behave.json)")
+    parser.add_argument("--latency-report", default=os.path.join("reports", "login_latency.json"),
+                        help="Merged login latency report path (default: reports/login_latency.json)")
+    parser.add_argument("--flake-history", default=os.path.join(".behave_cache", "flake_history.json"),
+                        help="Scenario outcome history deciding the quarantine lane "
+                             "(default: .behave_cache/flake_history.json)")
+    parser.add_argument("--flake-threshold", type=float, default=0.2,
+                        help="Flake rate at which a scenario is quarantined (default: 0.2)")
+    return parser.parse_args(argv), behave_args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the suite in parallel and write the merged report.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code: 0 when every scenario ran and none failed, 1 otherwise
+    """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    options, behave_args = parse_args(argv)
+
+    units = collect_work_units(options.paths)
+    if not units:
+        logger.error("No scenarios found in %s", ", ".join(options.paths))
+        return 1
+    history = FlakeHistory(options.flake_history, threshold=options.flake_threshold)
+    main_units, quarantined_units = split_lanes(units, history)
+    # Workers run exactly the units they are given; the lane split is done here
+    worker_args = [*behave_args, "-D", "lane=all", "-D", f"flake_history={options.flake_history}",
+                   "-D", f"flake_threshold={options.flake_threshold}"]
+
+    start_time = time.perf_counter()
+    report_dir = os.path.join(os.path.dirname(options.report) or ".", "workers")
+    runs = run_workers(schedule_matrix(main_units, options.workers), report_dir, worker_args) if main_units else []
+    main_elapsed = time.perf_counter() - start_time
+    quarantine_runs: List[WorkerRun] = []
+    if quarantined_units:
+        logger.info("Running %d quarantined scenario(s) after the main lane", len(quarantined_units))
+        quarantine_runs = run_workers(schedule_matrix(quarantined_units, options.workers),
+                                      os.path.join(report_dir, "quarantine"), worker_args)
+    elapsed = time.perf_counter() - start_time
+    runs = runs + quarantine_runs
+
+    report = merge_reports(runs)
+    with open(options.report, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+    counts = summarize(report)
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"{len(units)} scenarios on {len(runs)} workers in {elapsed:.1f}s: {summary}")
+    if quarantine_runs:
+        quarantine_counts = summarize(merge_reports(quarantine_runs))
+        quarantine_summary = ", ".join(f"{count} {status}" for status, count in sorted(quarantine_counts.items()))
+        print(f"  main lane: {len(main_units)} scenarios in {main_elapsed:.1f}s; "
+              f"quarantine lane: {len(quarantined_units)} scenarios in {elapsed - main_elapsed:.1f}s "
+              f"({quarantine_summary})")
+    print(f"Merged report written to {options.report}")
+    if any(run.browser for run in runs):
+        for browser, (browser_counts, browser_elapsed) in summarize_by_browser(runs, report).items():
+            browser_summary = ", ".join(f"{count} {status}" for status, count in sorted(browser_counts.items()))
+            print(f"  {browser}: {browser_summary} in {browser_elapsed:.1f}s")
+
+    latency = LatencyRecorder.from_reports(run.latency_report_path for run in runs)
+    if latency.samples:
+        latency.write_report(options.latency_report)
+        total = latency.summary()["total_ms"]
+        print(f"Login latency over {total['count']} logins: p50 {total['p50']:.0f}ms, "
+              f"p95 {total['p95']:.0f}ms, p99 {total['p99']:.0f}ms ({options.latency_report})")
+
+    assets = merge_summaries(run.asset_report_path for run in runs)
+    if assets:
+        print(f"Asset cache: {assets['cache_hits']}/{assets['asset_requests']} asset requests served from cache, "
+              f"{assets['bytes_saved'] / 1024:.0f} KiB saved, {assets['blocked']} analytics requests blocked")
+
+    crashed = crashed_workers(runs, report)
+    for run in crashed:
+        print(f"Worker {run.worker_id} exited with code {run.returncode} without a failed scenario; see {run.log_path}")
+    unreported = unreported_units(runs, report)
+    if unreported:
+        print(f"{len(unreported)} scenario(s) were not run by any worker:")
+        for unit in unreported:
+            print(f"  {unit.location} {unit.name}")
+    return 1 if counts.get("failed", 0) or crashed or unreported else 0
@@ -0,0 +1,201 @@
+"""
+Scenario-level result cache.
+
+A scenario that passed is skipped on later runs as long as nothing it
+depends on has changed. Its cache key hashes:
+    - the feature file, scenario name and tags
+    - every step (background included) with its doc string and table,
+      i.e. the resolved Examples row for outline scenarios
+    - the bytecode of the step function each step binds to
+    - the harness code: environment.py, the steps package (page objects and
+      their locators included) and the support package
+    - the run settings that decide what is tested, e.g. base_url and browser
+    - a build fingerprint of the application under test (-D build_fingerprint=...)
+
+Passing keys are stored in a JSON index with least-recently-used eviction.
+Parallel workers write the same index, so each save merges into the file
+currently on disk and replaces it atomically.
+
+This module is kept identical in the GitHub Copilot and Gemini suites;
+change both copies together.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+import types
+from typing import Dict, Mapping, Optional
+
+from behave.step_registry import registry as default_registry
+
+
+HARNESS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _hash_code(code: types.CodeType, digest) -> None:
+    """Feed a code object (and nested functions/comprehensions) into a digest."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+def harness_fingerprint(root: str = HARNESS_DIR) -> str:
+    """
+    Hash the sources of environment.py, features/steps/*.py and features/support/*.py.
+
+    Args:
+        root: The features directory
+
+    Returns:
+        Hex digest that changes whenever hooks, step modules or support code change
+    """
+    digest = hashlib.sha256()
+    paths = [os.path.join(root, "environment.py")]
+    for package in ("steps", "support"):
+        package_dir = os.path.join(root, package)
+        if os.path.isdir(package_dir):
+            paths += sorted(os.path.join(package_dir, name) for name in os.listdir(package_dir)
+                            if name.endswith(".py"))
+    for path in paths:
+        if os.path.exists(path):
+            digest.update(os.path.relpath(path, root).encode())
+            with open(path, "rb") as source:
+                digest.update(source.read())
+    return digest.hexdigest()
+
+
+def step_registry_of(context):
+    """The step registry the running behave runner matches steps against."""
+    runner = getattr(context, "_runner", None)
+    return getattr(runner, "step_registry", None) or default_registry
+
+
+def scenario_key(scenario, build: str = "", harness: str = "", step_registry=None,
+                 settings: Optional[Mapping[str, str]] = None) -> Optional[str]:
+    """
+    Compute the cache key of a scenario.
+
+    Args:
+        scenario: behave Scenario (outline rows are plain scenarios by now)
+        build: Fingerprint of the application build under test
+        harness: harness_fingerprint() of the step support code
+        step_registry: Registry to resolve step functions from (see step_registry_of)
+        settings: Run settings the result depends on, e.g. {"base_url": ..., "browser": ...}
+
+    Returns:
+        Hex digest, or None if a step is undefined (such scenarios are never cached)
+    """
+    step_registry = step_registry or default_registry
+    digest = hashlib.sha256()
+    digest.update(f"{scenario.feature.filename}\n{scenario.name}\n{sorted(scenario.effective_tags)}\n".encode())
+    digest.update(f"build={build}\nharness={harness}\n".encode())
+    digest.update(json.dumps(sorted((settings or {}).items())).encode())
+    row = getattr(scenario, "_row", None)
+    if row is not None:
+        digest.update(json.dumps([list(row.headings), list(row.cells)]).encode())
+    for step in scenario.all_steps:
+        digest.update(f"{step.keyword} {step.name}\n".encode())
+        if step.text:
+            digest.update(step.text.encode())
+        if step.table:
+            digest.update(json.dumps([list(step.table.headings)] + [list(r.cells) for r in step.table]).encode())
+        match = step_registry.find_match(step)
+        if match is None:
+            return None
+        # Decorated steps are hashed by the function they wrap
+        _hash_code(inspect.unwrap(match.func).__code__, digest)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk index of scenario keys that passed.
+    """
+
+    def __init__(self, path: str = os.path.join(".behave_cache", "results.json"), max_entries: int = 5000):
+        """
+        Initialize the cache.
+
+        Args:
+            path: JSON index file
+            max_entries: Entries kept; the least recently used are evicted beyond this
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: Dict[str, dict] = self._read()
+        self._updated: Dict[str, Optional[dict]] = {}
+        self.hits = 0
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+    def lookup(self, key: Optional[str]) -> Optional[dict]:
+        """
+        Return the cached pass for a key and mark it as recently used.
+
+        Args:
+            key: Scenario key from scenario_key()
+
+        Returns:
+            Cached entry (location, duration, passed_at), or None
+        """
+        entry = self.entries.get(key) if key else None
+        if entry is not None:
+            entry["last_used"] = time.time()
+            self._updated[key] = entry
+            self.hits += 1
+        return entry
+
+    def record(self, key: Optional[str], scenario) -> None:
+        """
+        Store or drop a scenario result after it ran.
+
+        Args:
+            key: Scenario key computed before the scenario ran
+            scenario: The finished behave Scenario
+        """
+        if not key:
+            return
+        if scenario.status == "passed":
+            now = time.time()
+            entry = {"location": str(scenario.location), "duration": scenario.duration,
+                     "passed_at": now, "last_used": now}
+            self.entries[key] = entry
+            self._updated[key] = entry
+        elif scenario.status in ("failed", "error", "hook_error", "cleanup_error"):
+            self.entries.pop(key, None)
+            self._updated[key] = None
+
+    def save(self) -> None:
+        """Merge this run's changes into the index on disk and apply LRU eviction."""
+        if not self._updated:
+            return
+        entries = self._read()
+        for key, entry in self._updated.items():
+            if entry is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = entry
+        if len(entries) > self.max_entries:
+            newest = sorted(entries.items(), key=lambda item: item[1]["last_used"], reverse=True)
+            entries = dict(newest[:self.max_entries])
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp_file:
+            json.dump(entries, tmp_file)
+        os.replace(tmp_path, self.path)
+        self.entries = entries
+        self._updated = {}
@@ -0,0 +1,326 @@
+"""
+Per-page-load resolution of multi-strategy selectors.
+
+The login selectors are comma-joined fallbacks such as
+"input#username, input[name='username'], ...". A locator built from the
+whole list makes the browser evaluate every alternative on every call, even
+though on a given page one alternative always wins. SelectorResolver works
+out, in one page.evaluate() per page load, which alternative matches the
+element `.first` would pick, and serves that concrete selector until the
+page navigates. Locators rather than element handles are cached, so a
+re-rendered element is still found.
+
+SelectorStats aggregates every resolution of the run; alternatives that
+never matched anything are reported as dead fallbacks. With a LocatorHealer
+(support/healing.py), each resolution also fingerprints the matched element,
+and a selector none of whose alternatives match within the healer's grace
+period is healed from that record.
+"""
+
+import json
+import os
+import time
+import weakref
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Mapping, Optional
+
+from playwright.sync_api import Frame, Locator, Page, TimeoutError as PlaywrightTimeoutError
+
+from support.fingerprints import FINGERPRINT_FUNCTIONS
+from support.healing import LocatorHealer
+
+
+# For every key: which alternatives match at all, and which one matches the
+# first element in document order (what the comma-joined selector's .first
+# would return), with the fingerprint of that element. :has-text() is
+# emulated as in support/dom_snapshot.py.
+RESOLVE_SCRIPT = "(alternativesByKey) => {" + FINGERPRINT_FUNCTIONS + """
+    const HAS_TEXT = /^(.*):has-text\\((['"])(.*)\\2\\)$/;
+
+    const firstMatch = (alternative) => {
+        const hasText = alternative.match(HAS_TEXT);
+        const css = hasText ? (hasText[1] || "*") : alternative;
+        let elements;
+        try {
+            elements = document.querySelectorAll(css);
+        } catch (e) {
+            return null;
+        }
+        for (const el of elements) {
+            const text = (el.innerText || el.value || "").toLowerCase();
+            if (!hasText || text.includes(hasText[3].toLowerCase())) return el;
+        }
+        return null;
+    };
+
+    const result = {};
+    for (const [key, alternatives] of Object.entries(alternativesByKey)) {
+        let winner = -1, winnerElement = null;
+        const matched = alternatives.map((alternative, index) => {
+            const el = firstMatch(alternative);
+            const earlier = el && el !== winnerElement
+                && (!winnerElement || (el.compareDocumentPosition(winnerElement) & Node.DOCUMENT_POSITION_FOLLOWING));
+            if (earlier) {
+                winner = index;
+                winnerElement = el;
+            }
+            return !!el;
+        });
+        result[key] = { winner, matched, fingerprint: winnerElement && fingerprintOf(winnerElement) };
+    }
+    return result;
+}"""
+
+
+def split_alternatives(selector: str) -> List[str]:
+    """
+    Split a comma-joined selector into its alternatives.
+
+    Commas inside quotes, brackets and parentheses are part of an alternative.
+
+    Args:
+        selector: Selector such as "input#username, input[name='username']"
+
+    Returns:
+        Alternatives in their original order
+    """
+    parts: List[str] = []
+    depth, quote, current = 0, None, ""
+    for char in selector:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+@dataclass
+class AlternativeStats:
+    """How often one alternative matched an element and was the one used."""
+
+    selector: str
+    matched: int = 0
+    won: int = 0
+
+
+@dataclass
+class SelectorStats:
+    """Resolution statistics of the whole run, shared by all resolvers."""
+
+    alternatives: Dict[str, List[AlternativeStats]] = field(default_factory=dict)
+    resolutions: int = 0
+    cache_hits: int = 0
+
+    def record(self, key: str, alternatives: List[str], matched: List[bool], winner: int) -> None:
+        """
+        Add one resolution of a key.
+
+        Args:
+            key: Selector name, e.g. 'username'
+            alternatives: The key's alternatives
+            matched: Per alternative, whether it matched any element
+            winner: Index of the alternative in use, -1 if none matched
+        """
+        entries = self.alternatives.setdefault(key, [AlternativeStats(alternative) for alternative in alternatives])
+        for entry, hit in zip(entries, matched):
+            entry.matched += int(hit)
+        if winner >= 0:
+            entries[winner].won += 1
+
+    def dead_fallbacks(self) -> Dict[str, List[str]]:
+        """
+        Alternatives that never matched, for keys that matched through another alternative.
+
+        Returns:
+            Key -> dead alternatives; keys without any dead alternative are left out
+        """
+        dead = {}
+        for key, entries in self.alternatives.items():
+            if any(entry.won for entry in entries):
+                unused = [entry.selector for entry in entries if not entry.matched]
+                if unused:
+                    dead[key] = unused
+        return dead
+
+    def write_report(self, path: str) -> None:
+        """
+        Write per-alternative counts and the dead fallbacks as JSON.
+
+        Args:
+            path: Output file path
+        """
+        report = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "resolutions": self.resolutions,
+            "cache_hits": self.cache_hits,
+            "dead_fallbacks": self.dead_fallbacks(),
+            "alternatives": {key: [asdict(entry) for entry in entries] for key, entries in self.alternatives.items()},
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+class SelectorResolver:
+    """
+    Resolves named multi-strategy selectors to the alternative that matches on the current page load.
+
+    Use attach() to get the page's resolver; a pooled page keeps one resolver
+    across scenarios, and its cache is cleared whenever the main frame navigates.
+    """
+
+    _resolvers: "weakref.WeakKeyDictionary[Page, SelectorResolver]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, page: Page, selectors: Mapping[str, str], stats: Optional[SelectorStats] = None,
+                 healer: Optional[LocatorHealer] = None):
+        """
+        Initialize the resolver and start watching navigations.
+
+        Args:
+            page: Playwright page the selectors are resolved in
+            selectors: Name -> comma-joined selector
+            stats: Run-wide statistics to record resolutions in
+            healer: Records fingerprints and heals selectors that match nothing
+        """
+        # Weak, so the registry below does not keep closed pages alive
+        self._page = weakref.ref(page)
+        self.selectors = dict(selectors)
+        self.alternatives = {key: split_alternatives(selector) for key, selector in self.selectors.items()}
+        self.stats = stats if stats is not None else SelectorStats()
+        self.healer = healer
+        self._resolved: Dict[str, str] = {}
+        # Healed selectors are only used while none of the key's own alternatives match
+        self._healed: Dict[str, str] = {}
+        # Keys without a match are not retried until the page changes (see forget_unmatched)
+        self._unmatched: set = set()
+        page.on("framenavigated", self._on_navigated)
+
+    @classmethod
+    def attach(cls, page: Page, selectors: Mapping[str, str], stats: Optional[SelectorStats] = None,
+               healer: Optional[LocatorHealer] = None) -> "SelectorResolver":
+        """
+        Get the page's resolver, creating it on first use.
+
+        Args:
+            page: Playwright page
+            selectors: Name -> comma-joined selector
+            stats: Run-wide statistics to record resolutions in
+            healer: Records fingerprints and heals selectors that match nothing
+
+        Returns:
+            SelectorResolver for the page
+        """
+        resolver = cls._resolvers.get(page)
+        if resolver is None or resolver.selectors != dict(selectors):
+            resolver = cls._resolvers[page] = cls(page, selectors, stats, healer)
+        return resolver
+
+    @property
+    def page(self) -> Page:
+        """The page the selectors are resolved in."""
+        return self._page()
+
+    def _on_navigated(self, frame: Frame) -> None:
+        if frame == self.page.main_frame:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget everything resolved on the current page load."""
+        self._resolved.clear()
+        self._healed.clear()
+        self._unmatched.clear()
+
+    def forget_unmatched(self) -> None:
+        """Retry keys that had no match; call after actions that may render new elements."""
+        self._unmatched.clear()
+
+    def resolve(self, key: str) -> str:
+        """
+        Get the selector to use for a key on the current page load.
+
+        All unresolved keys are resolved together in one round-trip. If no
+        alternative matches, the healer (if any) gives one a short grace period
+        to appear and then looks for the recorded element. A healed key is resolved
+        again on every call, so a real match takes over as soon as it exists.
+
+        Args:
+            key: Selector name
+
+        Returns:
+            The winning alternative, a healed selector, or the full comma-joined selector
+        """
+        if key in self._resolved:
+            self.stats.cache_hits += 1
+            return self._resolved[key]
+        if key in self._healed:
+            self._unmatched.discard(key)
+        if key not in self._unmatched:
+            self._resolve_all()
+        if key in self._resolved:
+            self._healed.pop(key, None)
+        elif key in self._healed:
+            return self._healed[key]
+        elif self.healer:
+            self._wait_or_heal(key)
+        return self._resolved.get(key, self._healed.get(key, self.selectors[key]))
+
+    def current(self, key: str) -> str:
+        """
+        Get the resolved selector if known, without any round-trip.
+
+        Args:
+            key: Selector name
+
+        Returns:
+            The winning alternative, or the full comma-joined selector
+        """
+        return self._resolved.get(key, self.selectors[key])
+
+    def locator(self, key: str) -> Locator:
+        """
+        Get a locator for the element the key's selector designates.
+
+        Args:
+            key: Selector name
+
+        Returns:
+            Locator of the first match
+        """
+        return self.page.locator(self.resolve(key)).first
+
+    def _wait_or_heal(self, key: str) -> None:
+        try:
+            self.page.locator(self.selectors[key]).first.wait_for(state="attached", timeout=self.healer.wait_ms)
+        except PlaywrightTimeoutError:
+            healed = self.healer.heal(self.page, key, self.selectors[key])
+            if healed:
+                self._healed[key] = healed
+            return
+        self._unmatched.discard(key)
+        self._resolve_all()
+
+    def _resolve_all(self) -> None:
+        pending = {key: alternatives for key, alternatives in self.alternatives.items()
+                   if key not in self._resolved and key not in self._unmatched}
+        results = self.page.evaluate(RESOLVE_SCRIPT, pending)
+        for key, result in results.items():
+            self.stats.resolutions += 1
+            self.stats.record(key, pending[key], result["matched"], result["winner"])
+            if result["winner"] >= 0:
+                self._resolved[key] = pending[key][result["winner"]]
+                if self.healer:
+                    self.healer.index.record(key, self._resolved[key], result["fingerprint"])
+            else:
+                self._unmatched.add(key)
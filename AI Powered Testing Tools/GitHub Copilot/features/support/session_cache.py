@@ -0,0 +1,108 @@
+"""
+On-disk cache of authenticated Playwright storage state.
+
+Scenarios that only need a logged-in user (rather than testing the login form
+itself) log in through the UI once per account; the resulting cookies and
+localStorage are saved here and injected into later scenarios directly.
+Entries expire after a fixed TTL or as soon as one of their cookies expires.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCache:
+    """
+    Stores one Playwright storage state file per (base URL, username).
+    """
+
+    def __init__(self, directory: str = os.path.join(".behave_cache", "sessions"), ttl_seconds: int = 1800):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the storage state files
+            ttl_seconds: Maximum age of a cached session in seconds
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, base_url: str, username: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached storage state for an account if it is still fresh.
+
+        Args:
+            base_url: Base URL of the application the session belongs to
+            username: Account the session was created for
+
+        Returns:
+            Playwright storage state dict, or None on a miss
+        """
+        path = self._path(base_url, username)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                self.invalidate(base_url, username)
+                self.misses += 1
+                return None
+            with open(path) as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if self._has_expired_cookie(state):
+            self.invalidate(base_url, username)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return state
+
+    def save(self, base_url: str, username: str, state: Dict[str, Any]) -> None:
+        """
+        Store the storage state for an account.
+
+        Args:
+            base_url: Base URL of the application the session belongs to
+            username: Account the session was created for
+            state: Playwright storage state (BrowserContext.storage_state())
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        # Write atomically so parallel workers never read a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as state_file:
+            json.dump(state, state_file)
+        os.replace(temp_path, self._path(base_url, username))
+
+    def invalidate(self, base_url: str, username: str) -> None:
+        """
+        Drop the cached session for an account.
+
+        Args:
+            base_url: Base URL of the application the session belongs to
+            username: Account the session was created for
+        """
+        try:
+            os.remove(self._path(base_url, username))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, base_url: str, username: str) -> str:
+        """Build the state file path; usernames are hashed to keep them off disk."""
+        digest = hashlib.sha256(f"{base_url}|{username}".encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    @staticmethod
+    def _has_expired_cookie(state: Dict[str, Any]) -> bool:
+        """Return True if any persistent cookie in the state has expired."""
+        now = time.time()
+        return any(0 < cookie.get("expires", -1) < now for cookie in state.get("cookies", []))
@@ -0,0 +1,20 @@
+"""
+Run the login feature suite across parallel behave workers.
+
+Usage:
+    python run_parallel.py [--workers N] [--report PATH] [features...] [-- behave args...]
+
+Example:
+    python run_parallel.py --workers 4 -- -D base_url=http://localhost:3000 --tags=~@wip
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "features"))
+
+from support.parallel import main  # noqa: E402
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,900 @@
+"""
+Mock login application for the behave login suites.
+
+A small asyncio HTTP/1.1 server (standard library only) that serves the login
+form the Copilot, Gemini and ChatGPT suites expect and implements the rules
+their scenarios describe: credential trimming, length and character rules,
+lockout after repeated failures, inactive/locked accounts, idle session expiry
+and remember-me. Latency distributions and fault injection make the
+performance scenarios meaningful without a real backend.
+
+Run standalone:
+    python mock_login.py --port 3000 --latency lognormal:80,0.4 --error-rate 0.01
+
+Or in-process from a behave environment.py:
+    server = MockLoginServer(port=0).start_in_thread()
+    context.base_url = server.url
+    ...
+    server.stop()
+
+Test-only endpoints (under /__test__/) let suites move the server clock,
+unlock accounts and reset all state between scenarios.
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import math
+import random
+import re
+import secrets
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from http import HTTPStatus
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+# --------------------------------------------------------------------------
+# Configuration
+# --------------------------------------------------------------------------
+
+@dataclass
+class LatencyProfile:
+    """
+    Artificial server-side delay added to matching requests.
+
+    Spec strings (milliseconds), as accepted by parse():
+        none | fixed:50 | uniform:20,200 | normal:100,20 | lognormal:80,0.4 | pareto:50,2.5
+    lognormal takes the median and sigma; pareto takes the minimum and shape.
+    """
+
+    distribution: str = "none"
+    params: Tuple[float, ...] = ()
+
+    DISTRIBUTIONS = ("none", "fixed", "uniform", "normal", "lognormal", "pareto")
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> "LatencyProfile":
+        if not spec:
+            return cls()
+        name, _, raw = spec.partition(":")
+        name = name.strip().lower()
+        if name not in cls.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{name}', expected one of {cls.DISTRIBUTIONS}")
+        params = tuple(float(value) for value in raw.split(",") if value.strip())
+        expected = {"none": 0, "fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "pareto": 2}[name]
+        if len(params) != expected:
+            raise ValueError(f"Latency '{name}' takes {expected} parameter(s), got '{spec}'")
+        return cls(name, params)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay in seconds."""
+        if self.distribution == "fixed":
+            ms = self.params[0]
+        elif self.distribution == "uniform":
+            ms = rng.uniform(*self.params)
+        elif self.distribution == "normal":
+            ms = rng.gauss(*self.params)
+        elif self.distribution == "lognormal":
+            median, sigma = self.params
+            ms = rng.lognormvariate(math.log(median), sigma)
+        elif self.distribution == "pareto":
+            minimum, shape = self.params
+            ms = minimum * rng.paretovariate(shape)
+        else:
+            ms = 0.0
+        return max(0.0, ms) / 1000
+
+
+@dataclass
+class FaultProfile:
+    """
+    Injected failures for matching requests.
+
+    error_rate requests get `error_status` (with a generic error page or JSON
+    body); drop_rate requests have their connection closed without a response.
+    """
+
+    error_rate: float = 0.0
+    error_status: int = 503
+    drop_rate: float = 0.0
+
+    def pick(self, rng: random.Random) -> Optional[str]:
+        roll = rng.random()
+        if roll < self.drop_rate:
+            return "drop"
+        if roll < self.drop_rate + self.error_rate:
+            return "error"
+        return None
+
+
+@dataclass
+class Account:
+    """A user the mock knows about; status is 'active', 'locked' or 'inactive'."""
+
+    username: str
+    password: str
+    status: str = "active"
+
+
+# Accounts referenced by the three suites' test data
+DEFAULT_ACCOUNTS = (
+    # GitHub Copilot
+    Account("testuser@example.com", "SecurePass123!"),
+    Account("user.with.dots@example.com", "ValidPa55!"),
+    Account("user+alias@example.com", "Valid_Pass-123"),
+    # Gemini
+    Account("testuser", "StrongPassword123"),
+    Account("ValidUser", "ValidPassword", status="locked"),
+    Account("inactive_user", "ValidPassword", status="inactive"),
+    # ChatGPT
+    Account("valid.user@example.com", "CorrectHorseBatteryStaple123!"),
+)
+
+
+MESSAGES = {
+    "en": {
+        "missing_credentials": "Please enter your username and password.",
+        "missing_password": "Please enter your password.",
+        "username_too_short": "Username must be at least {min} characters long.",
+        "username_too_long": "Username cannot exceed {max} characters.",
+        "username_invalid": "Username contains invalid characters.",
+        "password_too_short": "Password must be at least {min} characters long.",
+        "password_too_long": "Password cannot exceed {max} characters.",
+        "invalid_credentials": "Invalid username or password.",
+        "locked": "Your account is locked.",
+        "inactive": "Your account is inactive.",
+        "server_error": "Something went wrong. Please try again later.",
+    },
+    "es": {
+        "missing_credentials": "Introduzca su usuario y contraseña.",
+        "missing_password": "Introduzca su contraseña.",
+        "username_too_short": "El usuario debe tener al menos {min} caracteres.",
+        "username_too_long": "El usuario no puede superar los {max} caracteres.",
+        "username_invalid": "El usuario contiene caracteres no válidos.",
+        "password_too_short": "La contraseña debe tener al menos {min} caracteres.",
+        "password_too_long": "La contraseña no puede superar los {max} caracteres.",
+        "invalid_credentials": "Usuario o contraseña no válidos.",
+        "locked": "Su cuenta está bloqueada.",
+        "inactive": "Su cuenta está inactiva.",
+        "server_error": "Algo salió mal. Inténtelo de nuevo más tarde.",
+    },
+}
+
+
+@dataclass
+class LoginPolicy:
+    """
+    Validation, lockout and session rules.
+
+    invalid_username_chars is a deny-list rather than an allow-list so that
+    injection strings reach the credential check and get the standard
+    "invalid credentials" answer, which is what the suites assert.
+    """
+
+    username_min: int = 4
+    username_max: int = 50
+    password_min: int = 8
+    password_max: int = 128
+    invalid_username_chars: str = r"[$!#%^&*~`|\\{}]"
+    trim: bool = True
+    max_failed_attempts: int = 3
+    lockout_minutes: float = 15
+    session_minutes: float = 30
+    remember_me_days: float = 30
+    messages: Dict[str, str] = field(default_factory=dict)
+
+    def message(self, key: str, lang: str = "en") -> str:
+        """Localized message, with per-policy English overrides."""
+        if lang == "en" and key in self.messages:
+            text = self.messages[key]
+        else:
+            text = MESSAGES.get(lang, MESSAGES["en"]).get(key, MESSAGES["en"][key])
+        return text.format(min=self._bound(key, "min"), max=self._bound(key, "max"))
+
+    def _bound(self, key: str, which: str) -> int:
+        prefix = "username" if key.startswith("username") else "password"
+        return getattr(self, f"{prefix}_{which}")
+
+
+# --------------------------------------------------------------------------
+# Authentication state
+# --------------------------------------------------------------------------
+
+@dataclass
+class Session:
+    token: str
+    username: str
+    expires_at: float
+    idle_seconds: float
+    persistent: bool = False
+
+
+@dataclass
+class LoginOutcome:
+    """Result of one login attempt; `message_key` is None on success."""
+
+    username: str
+    message_key: Optional[str] = None
+    session: Optional[Session] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.message_key is None
+
+    @property
+    def status(self) -> int:
+        if self.succeeded:
+            return HTTPStatus.OK
+        if self.message_key in ("locked", "inactive"):
+            return HTTPStatus.FORBIDDEN
+        if self.message_key == "invalid_credentials":
+            return HTTPStatus.UNAUTHORIZED
+        return HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+# Input rules a password can break; see AuthService.login
+PASSWORD_FORMAT_PROBLEMS = ("password_too_short", "password_too_long")
+
+
+class AuthService:
+    """
+    Accounts, failed-attempt counters, lockouts and sessions on a movable clock.
+
+    Not thread-safe by itself; MockLoginServer only touches it from its event loop.
+    """
+
+    def __init__(self, accounts: Iterable[Account] = DEFAULT_ACCOUNTS, policy: Optional[LoginPolicy] = None):
+        self.policy = policy or LoginPolicy()
+        self._initial_accounts = [Account(a.username, a.password, a.status) for a in accounts]
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget sessions, failures and lockouts; restore the initial accounts."""
+        self.accounts = {a.username: Account(a.username, a.password, a.status) for a in self._initial_accounts}
+        self.failures: Dict[str, int] = {}
+        self.locked_until: Dict[str, float] = {}
+        self.sessions: Dict[str, Session] = {}
+        self.clock_offset = 0.0
+
+    # --- Clock ---
+
+    def now(self) -> float:
+        return time.time() + self.clock_offset
+
+    def advance_clock(self, seconds: float) -> None:
+        self.clock_offset += seconds
+
+    # --- Lockout ---
+
+    def is_locked_out(self, username: str) -> bool:
+        until = self.locked_until.get(username)
+        if until is None:
+            return False
+        if until <= self.now():
+            del self.locked_until[username]
+            self.failures.pop(username, None)
+            return False
+        return True
+
+    def unlock(self, usernames: Optional[Iterable[str]] = None) -> List[str]:
+        """Clear lockouts and failure counters; all accounts when `usernames` is None."""
+        names = list(self.locked_until) + list(self.failures) if usernames is None else list(usernames)
+        for name in names:
+            self.locked_until.pop(name, None)
+            self.failures.pop(name, None)
+        return sorted(set(names))
+
+    # --- Login ---
+
+    def validate(self, username: str, password: str) -> Optional[str]:
+        """Message key for the first input rule the credentials break, else None."""
+        policy = self.policy
+        if username:
+            if len(username) < policy.username_min:
+                return "username_too_short"
+            if len(username) > policy.username_max:
+                return "username_too_long"
+            if re.search(policy.invalid_username_chars, username):
+                return "username_invalid"
+        if password:
+            if len(password) < policy.password_min:
+                return "password_too_short"
+            if len(password) > policy.password_max:
+                return "password_too_long"
+        if not username:
+            return "missing_credentials"
+        if not password:
+            return "missing_password"
+        return None
+
+    def login(self, username: str, password: str, remember: bool = False) -> LoginOutcome:
+        if self.policy.trim:
+            username, password = username.strip(), password.strip()
+        problem = self.validate(username, password)
+        account = self.accounts.get(username)
+        # A password of the wrong format for an existing account is still a wrong password:
+        # it counts toward the lockout like any other
+        if problem and not (account is not None and problem in PASSWORD_FORMAT_PROBLEMS):
+            return LoginOutcome(username, problem)
+        if self.is_locked_out(username):
+            return LoginOutcome(username, "locked")
+
+        if account is None or problem or not secrets.compare_digest(account.password, password):
+            if account is not None:
+                self.failures[username] = self.failures.get(username, 0) + 1
+                if self.failures[username] >= self.policy.max_failed_attempts:
+                    self.locked_until[username] = self.now() + self.policy.lockout_minutes * 60
+                    return LoginOutcome(username, "locked")
+            return LoginOutcome(username, problem or "invalid_credentials")
+        if account.status != "active":
+            return LoginOutcome(username, account.status)
+
+        self.failures.pop(username, None)
+        return LoginOutcome(username, session=self.create_session(username, remember))
+
+    # --- Sessions ---
+
+    def create_session(self, username: str, remember: bool = False) -> Session:
+        idle = (self.policy.remember_me_days * 86400) if remember else (self.policy.session_minutes * 60)
+        session = Session(secrets.token_urlsafe(24), username, self.now() + idle, idle, persistent=remember)
+        self.sessions[session.token] = session
+        return session
+
+    def session_for(self, token: Optional[str]) -> Optional[Session]:
+        """Live session for a cookie token, sliding its idle expiry; None if expired."""
+        session = self.sessions.get(token or "")
+        if session is None:
+            return None
+        if session.expires_at <= self.now():
+            del self.sessions[session.token]
+            return None
+        session.expires_at = self.now() + session.idle_seconds
+        return session
+
+    def logout(self, token: Optional[str]) -> None:
+        self.sessions.pop(token or "", None)
+
+
+# --------------------------------------------------------------------------
+# HTML
+# --------------------------------------------------------------------------
+
+STYLE = """
+*{box-sizing:border-box}
+body{margin:0;font-family:system-ui,-apple-system,"Segoe UI",Roboto,sans-serif;color:#1b1b1b;background:#f4f5f7}
+main{max-width:24rem;margin:2rem auto;padding:1.5rem;background:#fff;border-radius:.5rem;box-shadow:0 1px 3px rgba(0,0,0,.15)}
+form{display:flex;flex-direction:column;gap:.5rem}
+label{font-weight:600}
+input[type=text],input[type=password]{width:100%;padding:.6rem;font-size:1rem;border:1px solid #6b6b6b;border-radius:.25rem}
+button{padding:.6rem;font-size:1rem;border-radius:.25rem;border:1px solid #0b4f9c;cursor:pointer}
+#login-btn,#logout-btn{background:#0b4f9c;color:#fff}
+#show-hide-password{order:2;align-self:flex-end;background:#fff;color:#0b4f9c}
+.password-row{order:1;display:flex;flex-direction:column;gap:.5rem}
+.remember{order:3;font-weight:400}
+#login-btn{order:4}
+#forgot-password{order:5;color:#0b4f9c}
+.language{order:6}
+.error-message{padding:.6rem;border:1px solid #a4000f;background:#fdecee;color:#7a0010;border-radius:.25rem}
+.error-message[hidden]{display:none}
+header{display:flex;justify-content:space-between;align-items:center;padding:1rem;background:#fff}
+"""
+
+LOGO_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="48" height="48" viewBox="0 0 48 48">'
+    '<rect width="48" height="48" rx="8" fill="#0b4f9c"/>'
+    '<path d="M16 22v-4a8 8 0 0 1 16 0v4h2v14H14V22zm4 0h8v-4a4 4 0 0 0-8 0z" fill="#fff"/></svg>'
+)
+
+# Client-side translations for the language selector
+I18N_SCRIPT = """
+const I18N = {
+  en: {title: "Sign in", username: "Username", password: "Password", login: "Login",
+       show: "Show", hide: "Hide", remember: "Remember me", forgot: "Forgot password?"},
+  es: {title: "Iniciar sesión", username: "Usuario", password: "Contraseña", login: "Iniciar Sesión",
+       show: "Mostrar", hide: "Ocultar", remember: "Recordarme", forgot: "¿Olvidó su contraseña?"},
+};
+const select = document.getElementById("language-select");
+const toggle = document.getElementById("show-hide-password");
+const password = document.getElementById("password");
+function translate(lang) {
+  document.documentElement.lang = lang;
+  document.querySelectorAll("[data-i18n]").forEach((el) => { el.textContent = I18N[lang][el.dataset.i18n]; });
+  toggle.textContent = I18N[lang][password.type === "password" ? "show" : "hide"];
+}
+select.addEventListener("change", () => translate(select.value));
+toggle.addEventListener("click", () => {
+  password.type = password.type === "password" ? "text" : "password";
+  toggle.setAttribute("aria-pressed", String(password.type === "text"));
+  translate(select.value);
+});
+"""
+
+
+def _page(title: str, body: str, lang: str = "en") -> str:
+    return (
+        f'<!doctype html><html lang="{lang}"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f"<title>{html.escape(title)}</title><style>{STYLE}</style></head><body>{body}</body></html>"
+    )
+
+
+def render_login_page(error: str = "", username: str = "", lang: str = "en") -> str:
+    lang = lang if lang in MESSAGES else "en"
+    selected = {code: " selected" if code == lang else "" for code in MESSAGES}
+    body = f"""
+<main>
+  <img id="app-logo" src="/static/logo.svg" alt="Application logo" width="48" height="48">
+  <h1 data-i18n="title">Sign in</h1>
+  <form id="login-form" method="post" action="/login" novalidate>
+    <div class="error-message" role="alert" aria-live="assertive"{"" if error else " hidden"}>{html.escape(error)}</div>
+    <label for="username" data-i18n="username">Username</label>
+    <input id="username" name="username" type="text" autocomplete="username" value="{html.escape(username)}">
+    <div class="password-row">
+      <label for="password" data-i18n="password">Password</label>
+      <input id="password" name="password" type="password" autocomplete="current-password">
+    </div>
+    <button id="login-btn" type="submit" data-i18n="login">Login</button>
+    <a id="forgot-password" href="/forgot-password" data-i18n="forgot">Forgot password?</a>
+    <button id="show-hide-password" type="button" aria-controls="password" aria-pressed="false" data-i18n="show">Show</button>
+    <label class="remember"><input id="remember-me" name="remember" type="checkbox" value="1"> <span data-i18n="remember">Remember me</span></label>
+    <label class="language">Language
+      <select id="language-select" name="lang">
+        <option value="en"{selected["en"]}>English</option>
+        <option value="es"{selected["es"]}>Español</option>
+      </select>
+    </label>
+  </form>
+</main>
+<script>{I18N_SCRIPT} translate(select.value);</script>"""
+    return _page("Sign in", body, lang)
+
+
+def render_dashboard(username: str) -> str:
+    name = html.escape(username)
+    body = f"""
+<header>
+  <img id="app-logo" src="/static/logo.svg" alt="Application logo" width="32" height="32">
+  <span id="user-menu" class="user-profile" data-testid="user-menu">{name}</span>
+  <form method="post" action="/logout"><button id="logout-btn" type="submit">Logout</button></form>
+</header>
+<main>
+  <h1>Dashboard</h1>
+  <p class="welcome-banner">Welcome, {name}!</p>
+</main>"""
+    return _page("Dashboard", body)
+
+
+def render_error_page(lang: str = "en") -> str:
+    message = html.escape(MESSAGES.get(lang, MESSAGES["en"])["server_error"])
+    return _page("Unavailable", f'<main><h1>Unavailable</h1><p class="error-message" role="alert">{message}</p></main>')
+
+
+# --------------------------------------------------------------------------
+# HTTP layer
+# --------------------------------------------------------------------------
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]
+    body: bytes
+    version: str
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        jar = {}
+        for part in self.headers.get("cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name:
+                jar[name] = value
+        return jar
+
+    @property
+    def wants_json(self) -> bool:
+        return (self.path.startswith("/api/")
+                or "application/json" in self.headers.get("content-type", "")
+                or "application/json" in self.headers.get("accept", ""))
+
+    def json_object(self) -> Dict:
+        """The body parsed as a JSON object; anything else is a ValueError (400)."""
+        data = json.loads(self.body or b"{}")
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object, got {type(data).__name__}")
+        return data
+
+    def form(self) -> Dict[str, str]:
+        """Body fields from a urlencoded form or a JSON object."""
+        if "application/json" in self.headers.get("content-type", ""):
+            return {key: "" if value is None else str(value) for key, value in self.json_object().items()}
+        return {key: values[-1] for key, values in parse_qs(self.body.decode(), keep_blank_values=True).items()}
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+@dataclass
+class Response:
+    status: int = HTTPStatus.OK
+    body: bytes = b""
+    content_type: str = "text/html; charset=utf-8"
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+
+    @classmethod
+    def html(cls, text: str, status: int = HTTPStatus.OK) -> "Response":
+        return cls(status, text.encode())
+
+    @classmethod
+    def json(cls, payload, status: int = HTTPStatus.OK) -> "Response":
+        return cls(status, json.dumps(payload).encode(), "application/json")
+
+    @classmethod
+    def redirect(cls, location: str) -> "Response":
+        return cls(HTTPStatus.SEE_OTHER, b"", headers=[("Location", location)])
+
+    def encode(self, keep_alive: bool) -> bytes:
+        reason = HTTPStatus(self.status).phrase
+        lines = [f"HTTP/1.1 {int(self.status)} {reason}",
+                 f"Date: {formatdate(usegmt=True)}",
+                 f"Content-Type: {self.content_type}",
+                 f"Content-Length: {len(self.body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if not any(name.lower() == "cache-control" for name, _ in self.headers):
+            lines.append("Cache-Control: no-store")
+        lines += [f"{name}: {value}" for name, value in self.headers]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + self.body
+
+
+class MockLoginServer:
+    """
+    asyncio HTTP server in front of an AuthService.
+
+    Routes:
+        GET  /, /login                 login form
+        POST /login, /api/login        form or JSON login (JSON answer when asked for)
+        GET  /home, /dashboard         authenticated page (303 to /login without a session)
+        GET  /api/session              current session as JSON
+        POST /logout, /api/logout      end the session
+        GET  /static/logo.svg          cacheable asset
+        POST /__test__/clock/advance   {"ms": n} or {"seconds": n}
+        POST /__test__/unlock          {"usernames": [...]} or {} for every account
+        POST /__test__/reset           forget all state
+    """
+
+    SESSION_COOKIE = "session"
+    PAGE_PATHS = ("/home", "/dashboard")
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 3000, auth: Optional[AuthService] = None,
+                 latency: Optional[LatencyProfile] = None, faults: Optional[FaultProfile] = None,
+                 fault_paths: Tuple[str, ...] = ("/login", "/api/login"), seed: Optional[int] = None,
+                 test_endpoints: bool = True):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind; 0 picks a free port (see `url` once started)
+            auth: Authentication state; a default AuthService when omitted
+            latency: Delay applied to requests on `fault_paths`
+            faults: Failures injected on `fault_paths`
+            fault_paths: Paths that latency and faults apply to
+            seed: Seed for latency and fault sampling
+            test_endpoints: Serve the /__test__/ control endpoints
+        """
+        self.host, self.port = host, port
+        self.auth = auth or AuthService()
+        self.latency = latency or LatencyProfile()
+        self.faults = faults or FaultProfile()
+        self.fault_paths = fault_paths
+        self.test_endpoints = test_endpoints
+        self.rng = random.Random(seed)
+        self.request_count = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # --- Lifecycle ---
+
+    async def start(self) -> "MockLoginServer":
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=2048)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> "MockLoginServer":
+        """Run the server on its own event loop in a daemon thread; returns once it is listening."""
+        ready = threading.Event()
+        errors: List[BaseException] = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as error:  # Surface bind errors to the caller
+                errors.append(error)
+                ready.set()
+                return
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-login-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self) -> None:
+        """Stop a server started with start_in_thread()."""
+        if self._loop is None or self._thread is None:
+            return
+
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+            asyncio.get_running_loop().stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def call(self, function, *args):
+        """Run `function(*args)` on the server loop (thread-safe) and return its result."""
+        if self._thread is None or threading.current_thread() is self._thread:
+            return function(*args)
+
+        async def invoke():
+            return function(*args)
+
+        return asyncio.run_coroutine_threadsafe(invoke(), self._loop).result(timeout=5)
+
+    def reset(self) -> None:
+        self.call(self.auth.reset)
+
+    def advance_clock(self, seconds: float) -> None:
+        self.call(self.auth.advance_clock, seconds)
+
+    def unlock(self, usernames: Optional[Iterable[str]] = None) -> List[str]:
+        return self.call(self.auth.unlock, usernames)
+
+    # --- Connection handling ---
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                self.request_count += 1
+                response = await self._respond(request)
+                if response is None:  # Injected connection drop
+                    break
+                keep_alive = request.keep_alive
+                writer.write(response.encode(keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        method, target, version = request_line.decode("latin-1").split()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0) or 0)
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return Request(method.upper(), url.path or "/", parse_qs(url.query), headers, body, version)
+
+    async def _respond(self, request: Request) -> Optional[Response]:
+        if request.path in self.fault_paths:
+            delay = self.latency.sample(self.rng)
+            if delay:
+                await asyncio.sleep(delay)
+            fault = self.faults.pick(self.rng)
+            if fault == "drop":
+                return None
+            if fault == "error":
+                if request.wants_json:
+                    return Response.json({"error": "server_error"}, self.faults.error_status)
+                return Response.html(render_error_page(), self.faults.error_status)
+        try:
+            return self._route(request)
+        except (ValueError, KeyError) as error:
+            return Response.json({"error": "bad_request", "detail": str(error)}, HTTPStatus.BAD_REQUEST)
+        except Exception:
+            # A bug in the mock answers 500 instead of dropping the connection
+            traceback.print_exc()
+            return Response.json({"error": "server_error"}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    # --- Routing ---
+
+    def _route(self, request: Request) -> Response:
+        path, method = request.path, request.method
+        if path.startswith("/__test__/") and self.test_endpoints and method == "POST":
+            return self._test_endpoint(request)
+        if path in ("/", "/login") and method in ("GET", "HEAD"):
+            lang = request.query.get("lang", ["en"])[-1]
+            return Response.html(render_login_page(lang=lang))
+        if path in ("/login", "/api/login") and method == "POST":
+            return self._login(request)
+        if path in self.PAGE_PATHS and method in ("GET", "HEAD"):
+            session = self.auth.session_for(request.cookies.get(self.SESSION_COOKIE))
+            if session is None:
+                return Response.redirect("/login")
+            return Response.html(render_dashboard(session.username))
+        if path == "/api/session" and method == "GET":
+            session = self.auth.session_for(request.cookies.get(self.SESSION_COOKIE))
+            if session is None:
+                return Response.json({"authenticated": False}, HTTPStatus.UNAUTHORIZED)
+            return Response.json({"authenticated": True, "username": session.username,
+                                  "expires_in": round(session.expires_at - self.auth.now())})
+        if path in ("/logout", "/api/logout") and method in ("GET", "POST"):
+            self.auth.logout(request.cookies.get(self.SESSION_COOKIE))
+            expired = f"{self.SESSION_COOKIE}=; Path=/; Max-Age=0; HttpOnly; SameSite=Lax"
+            if request.wants_json:
+                return Response(HTTPStatus.OK, b'{"authenticated": false}', "application/json",
+                                [("Set-Cookie", expired)])
+            return Response(HTTPStatus.SEE_OTHER, headers=[("Location", "/login"), ("Set-Cookie", expired)])
+        if path == "/static/logo.svg":
+            return Response(HTTPStatus.OK, LOGO_SVG.encode(), "image/svg+xml",
+                            [("Cache-Control", "public, max-age=86400")])
+        if path == "/favicon.ico":
+            return Response(HTTPStatus.NO_CONTENT)
+        if request.wants_json:
+            return Response.json({"error": "not_found"}, HTTPStatus.NOT_FOUND)
+        return Response.html(_page("Not found", "<main><h1>Not found</h1></main>"), HTTPStatus.NOT_FOUND)
+
+    def _login(self, request: Request) -> Response:
+        form = request.form()
+        lang = form.get("lang", "en")
+        remember = form.get("remember", "").lower() in ("1", "true", "on", "yes")
+        outcome = self.auth.login(form.get("username", ""), form.get("password", ""), remember)
+
+        if not outcome.succeeded:
+            message = self.auth.policy.message(outcome.message_key, lang)
+            if request.wants_json:
+                return Response.json({"error": outcome.message_key, "message": message}, outcome.status)
+            # Re-render the form with the error; the password is never echoed back
+            return Response.html(render_login_page(message, outcome.username, lang), outcome.status)
+
+        session = outcome.session
+        cookie = f"{self.SESSION_COOKIE}={session.token}; Path=/; HttpOnly; SameSite=Lax"
+        if session.persistent:
+            cookie += f"; Max-Age={int(session.idle_seconds)}"
+        if request.wants_json:
+            return Response(HTTPStatus.OK, json.dumps({"authenticated": True, "username": session.username,
+                                                       "redirect": "/dashboard"}).encode(),
+                            "application/json", [("Set-Cookie", cookie)])
+        return Response(HTTPStatus.SEE_OTHER, headers=[("Location", "/dashboard"), ("Set-Cookie", cookie)])
+
+    def _test_endpoint(self, request: Request) -> Response:
+        data = request.json_object()
+        if request.path == "/__test__/clock/advance":
+            seconds = float(data.get("seconds", 0)) + float(data.get("ms", 0)) / 1000
+            self.auth.advance_clock(seconds)
+            return Response.json({"clock_offset": self.auth.clock_offset})
+        if request.path == "/__test__/unlock":
+            return Response.json({"unlocked": self.auth.unlock(data.get("usernames"))})
+        if request.path == "/__test__/reset":
+            self.auth.reset()
+            return Response.json({"reset": True})
+        return Response.json({"error": "not_found"}, HTTPStatus.NOT_FOUND)
+
+
+# --------------------------------------------------------------------------
+# Command line
+# --------------------------------------------------------------------------
+
+def build_server(host="127.0.0.1", port=3000, latency=None, error_rate=0.0, error_status=503,
+                 drop_rate=0.0, seed=None, policy: Optional[LoginPolicy] = None,
+                 extra_accounts: Iterable[Account] = ()) -> MockLoginServer:
+    """Create a server from plain settings (CLI flags or behave userdata)."""
+    return MockLoginServer(
+        host=host,
+        port=port,
+        auth=AuthService(accounts=[*DEFAULT_ACCOUNTS, *extra_accounts], policy=policy),
+        latency=LatencyProfile.parse(latency),
+        faults=FaultProfile(error_rate=error_rate, error_status=error_status, drop_rate=drop_rate),
+        seed=seed,
+    )
+
+
+def self_check() -> List[str]:
+    """Check the login rules the suites rely on against a fresh AuthService; returns the failures."""
+    failures = []
+
+    def expect(description, outcome, message_key):
+        if outcome.message_key != message_key:
+            failures.append(f"{description}: expected {message_key or 'success'}, got {outcome.message_key or 'success'}")
+
+    auth = AuthService()
+    user, password = "testuser@example.com", "SecurePass123!"
+    expect("valid login", auth.login(user, password), None)
+    for attempt, wrong in enumerate(("wrongpass1", "wrongpass2", "wrongpass3"), 1):
+        expect(f"wrong password {attempt}", auth.login(user, wrong), "invalid_credentials" if attempt < 3 else "locked")
+    expect("correct password while locked", auth.login(user, password), "locked")
+
+    # Wrong passwords below the minimum length count toward the lockout too
+    auth.reset()
+    for attempt, wrong in enumerate(("wrong1", "wrong2", "wrong3"), 1):
+        expect(f"short wrong password {attempt}", auth.login(user, wrong),
+               "password_too_short" if attempt < 3 else "locked")
+    expect("correct password after short wrong passwords", auth.login(user, password), "locked")
+    auth.advance_clock(auth.policy.lockout_minutes * 60 + 1)
+    expect("correct password after the lockout expired", auth.login(user, password), None)
+
+    auth.reset()
+    expect("short password of an unknown user", auth.login("nobody@example.com", "short"), "password_too_short")
+    expect("unknown user", auth.login("nobody@example.com", "wrongpass1"), "invalid_credentials")
+    return failures
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Mock login application for the behave suites.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--latency", help="Latency on login requests, e.g. lognormal:80,0.4 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of login requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of login requests whose connection is dropped")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--self-check", action="store_true", help="Check the login rules and exit")
+    args = parser.parse_args(argv)
+
+    if args.self_check:
+        failures = self_check()
+        for failure in failures:
+            print(f"FAILED {failure}")
+        print("Self-check " + ("failed" if failures else "passed"))
+        raise SystemExit(1 if failures else 0)
+
+    server = build_server(args.host, args.port, args.latency, args.error_rate, args.error_status,
+                          args.drop_rate, args.seed)
+
+    async def run():
+        await server.start()
+        print(f"Mock login server listening on {server.url}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()